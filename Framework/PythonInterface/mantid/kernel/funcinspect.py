@@ -13,10 +13,12 @@
                    return
 """
 
+from collections import OrderedDict, namedtuple
 import opcode
 import inspect
 import sys
 import dis
+import threading
 
 
 def replace_signature(func, signature):
@@ -208,24 +210,35 @@ __operator_names = set(['CALL_FUNCTION', 'CALL_FUNCTION_VAR', 'CALL_FUNCTION_KW'
 #--------------------------------------------------------------------------------------
 
 
-def process_frame(frame):
-    """Returns the number of arguments on the left of assignment along
-    with the names of the variables for the given frame.
+# The decoded instructions of a code object
+#   code :: the code object, which keeps its id from being reused while it is cached
+#   instructions :: the instructions returned by decompile
+#   call_function_locs :: offsets of the function-like operators mapped to the (start, end)
+#                         indices of the instructions that belong to the call
+#   lhs :: the results of process_frame, by instruction offset
+_CallSites = namedtuple('_CallSites', 'code instructions call_function_locs lhs')
 
-    Call signature(s)::
+# Number of code objects whose decoded instructions are cached
+CALL_SITE_CACHE_SIZE = 256
 
-    Required arguments:
-    ===========================   ==========
-    frame                         The code frame to analyse
+# Code objects do not support weak references, so the cache is keyed by their id
+# and bounded to drop the code objects that are no longer used
+_call_site_cache = OrderedDict()
+_call_site_cache_lock = threading.Lock()
 
-    Outputs:
-    =========
-    Returns the a tuple with the number of arguments and their names
-    """
-    # Index of the last attempted instruction in byte code
-    last_i = frame.f_lasti
-    ins_stack = decompile(frame.f_code)
 
+def _get_call_sites(code_object):
+    """Returns the _CallSites of a code object, decoding its instructions
+    on the first call only.
+    """
+    key = id(code_object)
+    with _call_site_cache_lock:
+        call_sites = _call_site_cache.get(key)
+        if call_sites is not None and call_sites.code is code_object:
+            _call_site_cache.move_to_end(key)
+            return call_sites
+
+    ins_stack = decompile(code_object)
     call_function_locs = {}
     start_index = 0
     start_offset = 0
@@ -237,10 +250,48 @@ def process_frame(frame):
             start_index = index
             start_offset = offset
 
-    (offset, op, name, argument, argvalue) = ins_stack[-1]
     # Append the index of the last entry to form the last boundary
     call_function_locs[start_offset] = (start_index, len(ins_stack)-1)
 
+    call_sites = _CallSites(code_object, ins_stack, call_function_locs, {})
+    with _call_site_cache_lock:
+        _call_site_cache[key] = call_sites
+        if len(_call_site_cache) > CALL_SITE_CACHE_SIZE:
+            _call_site_cache.popitem(last=False)
+    return call_sites
+
+
+def process_frame(frame):
+    """Returns the number of arguments on the left of assignment along
+    with the names of the variables for the given frame.
+
+    Call signature(s)::
+
+    Required arguments:
+    ===========================   ==========
+    frame                         The code frame to analyse
+
+    Outputs:
+    =========
+    Returns the a tuple with the number of arguments and their names
+    """
+    # Index of the last attempted instruction in byte code
+    last_i = frame.f_lasti
+    call_sites = _get_call_sites(frame.f_code)
+    try:
+        return call_sites.lhs[last_i]
+    except KeyError:
+        pass
+    lhs = _process_call_site(call_sites.instructions, call_sites.call_function_locs, last_i)
+    call_sites.lhs[last_i] = lhs
+    return lhs
+
+
+def _process_call_site(ins_stack, call_function_locs, last_i):
+    """Returns the number of arguments on the left of assignment along
+    with the names of the variables for the call at the instruction offset last_i.
+    See process_frame.
+    """
     # last_i should be the offset of a call_function_locs instruction.
     # We use this to bracket the bit which we are interested in.
     # Bug:
@@ -12,6 +12,9 @@ algorithms, fit functions etc.
 """
 
 
+import ast as _ast
+from collections import namedtuple
+import json as _json
 import os as _os
 import sys as _sys
 from traceback import format_exc
@@ -34,9 +37,23 @@ except ImportError:
     #endclass
 
 from . import logger, Logger, config
+from mantid.utils import write_file_atomically as _write_file_atomically
 
 # String that separates paths (should be in the ConfigService)
 PATH_SEPARATOR=";"
+# The configuration key turning on the deferred import of the plugins declaring only algorithms
+DEFERRED_IMPORT_KEY = "python.plugins.deferred"
+# Name of the cache of the contents of the plugin files, in the user properties directory
+PLUGIN_CACHE_FILENAME = "python_plugins_cache.json"
+# Version of the layout of the cache file. Caches with a different version are discarded
+PLUGIN_CACHE_VERSION = 2
+
+# What is known about a plugin file without importing it
+#   mtime, size :: the modification time and size of the file when it was scanned
+#   contains_algorithm :: the result of contains_algorithm for the file
+#   algorithms :: names of the algorithms subscribed by the file, None if they cannot be found without importing it
+#   functions :: names of the fit functions subscribed by the file, None if they cannot be found without importing it
+PluginInfo = namedtuple("PluginInfo", "mtime size contains_algorithm algorithms functions")
 
 
 class PluginLoader(object):
@@ -110,16 +127,49 @@ def find_plugins(top_dir):
         raise ValueError("Cannot search given path for plugins, path is not a directory: '%s' " % str(top_dir))
     all_plugins = []
     algs = []
+    cache = get_plugin_cache()
     for root, dirs, files in _os.walk(top_dir):
         for f in files:
             if f.endswith(PluginLoader.extension):
                 filename = _os.path.join(root, f)
                 all_plugins.append(filename)
-                if contains_algorithm(filename):
+                info = cache.info(filename)
+                if info is not None and info.contains_algorithm:
                     algs.append(filename)
+    cache.save()
 
     return all_plugins, algs
 
+
+def find_deferrable(filenames):
+    """
+        Finds the plugins whose import can be deferred until one of their algorithms is first used,
+        i.e. the plugins subscribing algorithms, and no fit functions, whose names are known without
+        importing them. Plugins subscribing versions of the same algorithm are not deferrable.
+
+        @param filenames :: A list of paths to plugin files
+        @returns A dictionary of the names of the algorithms to the files subscribing them
+    """
+    files_by_name = {}
+    cache = get_plugin_cache()
+    for filename in filenames:
+        info = cache.info(filename)
+        if info is None or not info.algorithms or info.functions != []:
+            continue
+        for name in info.algorithms:
+            files_by_name.setdefault(name, []).append(filename)
+    cache.save()
+
+    shared = {filename for files in files_by_name.values() if len(files) > 1 for filename in files}
+    return {name: files[0] for name, files in files_by_name.items() if files[0] not in shared}
+
+
+def deferred_import_enabled():
+    """
+        @returns True if the import of the plugins declaring only algorithms should be deferred
+    """
+    return config[DEFERRED_IMPORT_KEY].strip().lower() in ("on", "1", "true")
+
 #======================================================================================================================
 
 
@@ -268,3 +318,141 @@ def contains_algorithm(filename):
         alg_found = False
 
     return alg_found
+
+#======================================================================================================================
+
+
+def declared_names(source):
+    """
+        Finds the names of the algorithms and fit functions subscribed by the source
+        code of a plugin without running it. The name of an algorithm is the name of
+        its class unless the class overrides name() to return a string literal.
+        Subscriptions which are not top-level statements, e.g. those guarded by a
+        try/except ImportError, may not happen so the names are unknown.
+
+        @param source :: The source code of a plugin
+        @returns A tuple of the lists of the algorithm and fit function names. Either
+        list is None if the names cannot be found from the source code alone
+    """
+    tree = _ast.parse(source)
+    classes = {node.name: node for node in tree.body if isinstance(node, _ast.ClassDef)}
+    top_level_calls = {id(node.value) for node in tree.body if isinstance(node, _ast.Expr)}
+    subscribed = {"AlgorithmFactory": [], "FunctionFactory": []}
+    for node in _ast.walk(tree):
+        if not (isinstance(node, _ast.Call) and isinstance(node.func, _ast.Attribute)
+                and node.func.attr == "subscribe"):
+            continue
+        factory = node.func.value
+        if isinstance(factory, _ast.Call):
+            # AlgorithmFactory.Instance().subscribe(...)
+            factory = factory.func.value if isinstance(factory.func, _ast.Attribute) else factory.func
+        factory_name = factory.id if isinstance(factory, _ast.Name) else None
+        if factory_name not in subscribed or subscribed[factory_name] is None:
+            continue
+        class_def = classes.get(node.args[0].id) if node.args and isinstance(node.args[0], _ast.Name) else None
+        name = _declared_name(class_def) if class_def is not None and id(node) in top_level_calls else None
+        if name is None:
+            subscribed[factory_name] = None
+        else:
+            subscribed[factory_name].append(name)
+
+    return subscribed["AlgorithmFactory"], subscribed["FunctionFactory"]
+
+
+def _declared_name(class_def):
+    """
+        @param class_def :: The ast.ClassDef node of an algorithm or fit function
+        @returns The name the class is registered with, or None if it is not a literal
+    """
+    for node in class_def.body:
+        if isinstance(node, _ast.FunctionDef) and node.name == "name":
+            body = node.body[1:] if _ast.get_docstring(node, clean=False) is not None else node.body
+            if len(body) == 1 and isinstance(body[0], _ast.Return) and body[0].value is not None:
+                try:
+                    name = _ast.literal_eval(body[0].value)
+                except ValueError:
+                    return None
+                return name if isinstance(name, str) else None
+            return None
+    return class_def.name
+
+#======================================================================================================================
+
+
+class PluginCache(object):
+    """
+        Persists what is known about the plugin files between sessions so that only the
+        files which have changed since the last session are read. A file is identified by
+        its path and is rescanned when its modification time or size change.
+    """
+
+    def __init__(self, path):
+        """
+            @param path :: The path to the cache file. It is read if it exists
+        """
+        self._path = path
+        self._entries = {}
+        self._changed = False
+        try:
+            with open(path) as cache_file:
+                content = _json.load(cache_file)
+            if content["version"] == PLUGIN_CACHE_VERSION:
+                self._entries = {filename: PluginInfo(**entry) for filename, entry in content["plugins"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def info(self, filename):
+        """
+            Returns what is known about a plugin file, reading the file only if it
+            has changed since it was cached.
+
+            @param filename :: The path to a plugin file
+            @returns A PluginInfo or None if the file cannot be read
+        """
+        try:
+            stat = _os.stat(filename)
+        except OSError:
+            return None
+        info = self._entries.get(filename)
+        if info is not None and info.mtime == stat.st_mtime and info.size == stat.st_size:
+            return info
+
+        try:
+            from io import open
+            with open(filename, 'r', encoding='UTF-8') as plugin_file:
+                algorithms, functions = declared_names(plugin_file.read())
+        except Exception as exc:
+            logger.debug("Unable to find the names declared in plugin '{0}': {1}".format(filename, str(exc)))
+            algorithms, functions = None, None
+        info = PluginInfo(mtime=stat.st_mtime, size=stat.st_size, contains_algorithm=contains_algorithm(filename),
+                          algorithms=algorithms, functions=functions)
+        self._entries[filename] = info
+        self._changed = True
+        return info
+
+    def save(self):
+        """
+            Writes the cache file if any entry has changed since it was read
+        """
+        if not self._changed:
+            return
+        content = {"version": PLUGIN_CACHE_VERSION,
+                   "plugins": {filename: info._asdict() for filename, info in self._entries.items()}}
+        try:
+            _write_file_atomically(self._path, _json.dumps(content))
+            self._changed = False
+        except OSError as exc:
+            logger.debug("Unable to save the plugin cache to '{0}': {1}".format(self._path, str(exc)))
+
+
+_plugin_cache = None
+
+
+def get_plugin_cache():
+    """
+        @returns The PluginCache of the session, read from the user properties directory on first use
+    """
+    global _plugin_cache
+    if _plugin_cache is None:
+        _plugin_cache = PluginCache(_os.path.join(config.getUserPropertiesDir(), PLUGIN_CACHE_FILENAME))
+    return _plugin_cache
@@ -16,7 +16,6 @@ from matplotlib.container import ErrorbarContainer
 from matplotlib.colors import LogNorm
 from matplotlib.ticker import LogLocator
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-from scipy.interpolate import interp1d
 
 import mantid.api
 import mantid.kernel
@@ -302,6 +301,33 @@ def get_md_data(workspace, normalization, indices=None, withError=False):
     return dim_arrays, data, err
 
 
+def get_spectrum_masks(workspace, spectrum_info=None, indices=None):
+    """
+    Flag the masked spectra and the monitors of a workspace.
+    Spectra without detectors are neither masked nor monitors.
+
+    :param workspace: a MatrixWorkspace
+    :param spectrum_info: the spectrum info of the workspace, if it is already available
+    :param indices: workspace indices to check, all spectra if None
+    :return: two boolean arrays (masked, monitors), one value for each index
+    """
+    if indices is None:
+        indices = range(workspace.getNumberHistograms())
+    masked = np.zeros(len(indices), dtype=bool)
+    monitors = np.zeros(len(indices), dtype=bool)
+    if spectrum_info is None:
+        try:
+            spectrum_info = workspace.spectrumInfo()
+        except:
+            return masked, monitors
+    for i, index in enumerate(indices):
+        index = int(index)
+        if spectrum_info.hasDetectors(index):
+            masked[i] = spectrum_info.isMasked(index)
+            monitors[i] = spectrum_info.isMonitor(index)
+    return masked, monitors
+
+
 def get_spectrum(workspace, wkspIndex, normalize_by_bin_width, withDy=False, withDx=False):
     """
     Extract a single spectrum and process the data into a frequency
@@ -469,7 +495,7 @@ def common_x(arr):
 
 
 def get_matrix_2d_ragged(workspace, normalize_by_bin_width, histogram2D=False, transpose=False,
-                         extent=None, xbins=100, ybins=100, spec_info=None, maxpooling=False):
+                         extent=None, xbins=100, ybins=100, spec_info=None, maxpooling=False, summed_spectra=None):
     if spec_info is None:
         try:
             spec_info = workspace.spectrumInfo()
@@ -517,7 +543,7 @@ def get_matrix_2d_ragged(workspace, normalize_by_bin_width, histogram2D=False, t
         y = np.linspace(y_low, y_high, int(ybins))
 
     counts = interpolate_y_data(workspace, x_centers, y, normalize_by_bin_width, spectrum_info=spec_info,
-                                maxpooling=maxpooling)
+                                maxpooling=maxpooling, summed_spectra=summed_spectra)
 
     if histogram2D and extent is not None:
         x = x_edges
@@ -538,6 +564,60 @@ def pairwise(iterable):
     return zip(a, b)
 
 
+def _axis_indices_from_edges(edges, values):
+    # equivalent to VectorHelper::indexOfValueFromEdges, -1 where the value is out of range
+    positions = np.searchsorted(edges, values, side='left')
+    indices = np.maximum(positions - 1, 0)
+    indices[(values < edges[0]) | (positions == len(edges))] = -1
+    return indices
+
+
+def _axis_indices_from_centers(centers, values):
+    # equivalent to VectorHelper::indexOfValueFromCenters, -1 where the value is out of range
+    n = len(centers)
+    low_edge = centers[0] - 0.5 * (centers[1] - centers[0])
+    high_edge = centers[n - 1] + 0.5 * (centers[n - 1] - centers[n - 2])
+    indices = np.minimum(np.searchsorted(centers, values, side='left'), n - 1)
+    below = indices - 1
+    step_down = (indices > 0) & (values < centers[below] + 0.5 * (centers[indices] - centers[below]))
+    indices[step_down] -= 1
+    indices[(values < low_edge) | (values > high_edge)] = -1
+    return indices
+
+
+def get_axis_indices(workspace, values):
+    """
+    Find the workspace indices corresponding to values on the vertical axis of a workspace.
+    This gives the same result as calling getAxis(1).indexOfValue for each value, but
+    uses a single search of the sorted axis values.
+
+    :param workspace: a MatrixWorkspace
+    :param values: array of values on the vertical axis
+    :return: an integer array of workspace indices, -1 where the value is outside the axis
+    """
+    values = np.asarray(values, dtype=np.float64)
+    axis = workspace.getAxis(1)
+    nhist = workspace.getNumberHistograms()
+    if axis.isText():
+        axis_values = np.arange(axis.length(), dtype=np.float64)
+    else:
+        axis_values = axis.extractValues().astype(np.float64)
+
+    if len(axis_values) < 2 or np.any(np.diff(axis_values) < 0):
+        # single values and unsorted axes are left to the axis itself
+        return np.array(_workspace_indices(values, workspace), dtype=int)
+    if axis.isSpectra():
+        # spectrum numbers are treated as centres, with the outer edges reflected about the end points
+        edges = np.empty(len(axis_values) + 1)
+        edges[1:-1] = 0.5 * (axis_values[:-1] + axis_values[1:])
+        edges[0] = axis_values[0] - (edges[1] - axis_values[0])
+        edges[-1] = axis_values[-1] + (axis_values[-1] - edges[-2])
+        return _axis_indices_from_edges(edges, values)
+    if len(axis_values) == nhist + 1:
+        return _axis_indices_from_edges(axis_values, values)
+    return _axis_indices_from_centers(axis_values, values)
+
+
 def _workspace_indices(y_bins, workspace):
     workspace_indices = []
     for y in y_bins:
@@ -549,18 +629,20 @@ def _workspace_indices(y_bins, workspace):
     return workspace_indices
 
 
-def _workspace_indices_maxpooling(y_bins, workspace):
-    summed_spectra_workspace = _integrate_workspace(workspace)
-    summed_spectra = summed_spectra_workspace.extractY()
-    workspace_indices = []
-    for y_range in pairwise(y_bins):
-        try:
-            workspace_range = range(workspace.getAxis(1).indexOfValue(np.math.floor(y_range[0])),
-                                    workspace.getAxis(1).indexOfValue(np.math.ceil(y_range[1])))
-            workspace_index = workspace_range[np.argmax(summed_spectra[workspace_range])]
-            workspace_indices.append(workspace_index)
-        except IndexError:
-            workspace_indices.append(-1)
+def _workspace_indices_maxpooling(y_bins, workspace, summed_spectra=None):
+    if summed_spectra is None:
+        summed_spectra = get_summed_spectra(workspace)
+    summed_spectra = summed_spectra.ravel()
+    lower_indices = get_axis_indices(workspace, np.floor(y_bins[:-1]))
+    upper_indices = get_axis_indices(workspace, np.ceil(y_bins[1:]))
+    workspace_indices = np.full(len(lower_indices), -1, dtype=int)
+    for row, (lower, upper) in enumerate(zip(lower_indices, upper_indices)):
+        if lower == -1 or upper == -1:
+            continue
+        if upper <= lower:
+            workspace_indices[row] = lower
+        else:
+            workspace_indices[row] = lower + np.argmax(summed_spectra[lower:upper])
     return workspace_indices
 
 
@@ -577,34 +659,73 @@ def _integrate_workspace(workspace):
     return integration.getProperty("OutputWorkspace").value
 
 
-def interpolate_y_data(workspace, x, y, normalize_by_bin_width, spectrum_info=None, maxpooling=False):
-    workspace_indices = _workspace_indices_maxpooling(y, workspace) \
-        if maxpooling else _workspace_indices(y, workspace)
+def get_summed_spectra(workspace):
+    """
+    Integrate each spectrum of a workspace. The result only depends on the workspace,
+    so callers that resample the same workspace repeatedly can compute it once and
+    pass it back in as summed_spectra.
+
+    :param workspace: a MatrixWorkspace
+    :return: array of shape (number of histograms, 1)
+    """
+    return _integrate_workspace(workspace).extractY()
+
+
+def _nearest_indices(centers, x):
+    # index of the nearest centre to each x, as interp1d(kind='nearest', fill_value="extrapolate")
+    order = np.argsort(centers, kind='mergesort')
+    sorted_centers = centers[order]
+    bounds = .5 * (sorted_centers[1:] + sorted_centers[:-1])
+    return order[np.searchsorted(bounds, x, side='left').clip(0, len(centers) - 1)]
+
+
+def _nearest_y_data(workspace, workspace_indices, x, normalize_by_bin_width, masked, xdata=None):
+    """
+    Sample the given spectra at x using the nearest bin, nan outside the x range of each spectrum
+
+    :param xdata: the x data shared by all spectra, if not given it is read for each spectrum
+    """
     counts = np.full([len(workspace_indices), x.size], np.nan, dtype=np.float64)
-    previous_index = -1
-    index = -1
-    for workspace_index in workspace_indices:
-        index += 1
-        # if workspace axis is beyond limits carry on
-        if workspace_index == -1:
-            continue
-        # avoid repeating calculations
-        if previous_index == workspace_index:
-            counts[index, :] = counts[index - 1]
-            continue
-        previous_index = workspace_index
-        if not (spectrum_info and spectrum_info.hasDetectors(workspace_index) and spectrum_info.isMonitor(
-                workspace_index)):
-            centers, ztmp, _, _ = get_spectrum(workspace, workspace_index,
-                                               normalize_by_bin_width=normalize_by_bin_width,
-                                               withDy=False, withDx=False)
-            interpolation_function = interp1d(centers, ztmp, kind='nearest', bounds_error=False,
-                                              fill_value="extrapolate")
+    normalize = workspace.isHistogramData() and normalize_by_bin_width and not workspace.isDistribution()
+    columns, in_range = None, None
+    for row, workspace_index in enumerate(workspace_indices):
+        spectrum_x = workspace.readX(int(workspace_index)) if xdata is None else xdata
+        if columns is None or xdata is None:
+            centers = points_from_boundaries(spectrum_x) if workspace.isHistogramData() else spectrum_x
+            columns = _nearest_indices(centers, x)
             # only set values in the range of workspace
-            x_range = np.where((x >= workspace.readX(workspace_index)[0]) &
-                               (x <= workspace.readX(workspace_index)[-1]))
-            # set values outside x data to nan
-            counts[index, x_range] = interpolation_function(x[x_range])
+            in_range = (x >= spectrum_x[0]) & (x <= spectrum_x[-1])
+        if masked[row]:
+            continue
+        spectrum_y = workspace.readY(int(workspace_index))
+        if normalize:
+            spectrum_y = spectrum_y / (spectrum_x[1:] - spectrum_x[0:-1])
+        counts[row, in_range] = spectrum_y[columns[in_range]]
+    return counts
+
+
+def interpolate_y_data(workspace, x, y, normalize_by_bin_width, spectrum_info=None, maxpooling=False,
+                       summed_spectra=None):
+    workspace_indices = np.asarray(_workspace_indices_maxpooling(y, workspace, summed_spectra)
+                                   if maxpooling else get_axis_indices(workspace, y), dtype=int)
+    counts = np.full([len(workspace_indices), x.size], np.nan, dtype=np.float64)
+
+    # resample each spectrum only once, even if it is shown in several rows
+    unique_indices, rows = np.unique(workspace_indices, return_inverse=True)
+    valid = unique_indices != -1
+    masked, monitors = get_spectrum_masks(workspace, spectrum_info, unique_indices[valid])
+    if spectrum_info is None:
+        # monitors are only skipped when the spectrum info is given
+        monitors[:] = False
+    valid[valid] = ~monitors
+
+    if np.any(valid):
+        valid_indices = unique_indices[valid]
+        xdata = workspace.readX(int(valid_indices[0])) if workspace.isCommonBins() else None
+        resampled = np.full([len(unique_indices), x.size], np.nan, dtype=np.float64)
+        resampled[valid] = _nearest_y_data(workspace, valid_indices, x, normalize_by_bin_width,
+                                           masked[~monitors], xdata)
+        counts[:] = resampled[rows.ravel()]
     counts = np.ma.masked_invalid(counts, copy=False)
     return counts
 
@@ -636,13 +757,8 @@ def get_matrix_2d_data(workspace, distribution, histogram2D=False, transpose=Fal
         y = workspace.getAxis(1).extractValues()
     z = workspace.extractY()
 
-    try:
-        specInfo = workspace.spectrumInfo()
-        for index in range(workspace.getNumberHistograms()):
-            if specInfo.isMasked(index) or specInfo.isMonitor(index):
-                z[index, :] = np.nan
-    except:
-        pass
+    masked, monitors = get_spectrum_masks(workspace)
+    z[masked | monitors, :] = np.nan
 
     if workspace.isHistogramData():
         if not distribution:
@@ -697,10 +813,7 @@ def get_uneven_data(workspace, distribution):
         yvals = np.arange(nhist)
     if len(yvals) == nhist:
         yvals = boundaries_from_points(yvals)
-    try:
-        specInfo = workspace.spectrumInfo()
-    except:
-        specInfo = None
+    masked, monitors = get_spectrum_masks(workspace)
     for index in range(nhist):
         xvals = workspace.readX(index)
         zvals = workspace.readY(index)
@@ -709,7 +822,7 @@ def get_uneven_data(workspace, distribution):
                 zvals = zvals / (xvals[1:] - xvals[0:-1])
         else:
             xvals = boundaries_from_points(xvals)
-        if specInfo and specInfo.hasDetectors(index) and (specInfo.isMasked(index) or specInfo.isMonitor(index)):
+        if masked[index] or monitors[index]:
             zvals = np.full_like(zvals, np.nan, dtype=np.double)
         zvals = np.ma.masked_invalid(zvals)
         z.append(zvals)
@@ -4,14 +4,17 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+from collections import OrderedDict
+
 import matplotlib.colors
 import numpy as np
 
-from mantid.plots.datafunctions import get_matrix_2d_ragged, get_normalize_by_bin_width
+from mantid.plots.datafunctions import get_matrix_2d_ragged, get_normalize_by_bin_width, get_summed_spectra
 from mantid.plots.mantidimage import MantidImage
 from mantid.api import MatrixWorkspace
 
-MAX_HISTOGRAMS = 5000
+# Number of resampled images kept so that returning to a previous view does not resample again
+MAX_CACHED_IMAGES = 10
 
 
 class SamplingImage(MantidImage):
@@ -53,6 +56,11 @@ class SamplingImage(MantidImage):
                            workspace.getDimension(1).getNBins())
         self._xbins, self._ybins = 100, 100
         self.origin = origin
+        # Replacing the workspace in the ADS creates a new image, but the workspace can still be modified
+        # in place, so what is computed from it is kept along with the marker of the state it was computed from
+        self._summed_spectra = None
+        self._summed_spectra_marker = None
+        self._image_cache = OrderedDict()
         self._update_maxpooling_option()
 
     def connect_events(self):
@@ -76,8 +84,29 @@ class SamplingImage(MantidImage):
 
     def remove(self):
         self.disconnect_events()
+        self.clear_cache()
         super().remove()
 
+    def clear_cache(self):
+        """
+        Discard the spectrum integrals and resampled images computed from the workspace.
+        This has to be called after writing to the data arrays of the workspace directly,
+        which does not change its history.
+        """
+        self._summed_spectra = None
+        self._summed_spectra_marker = None
+        self._image_cache.clear()
+
+    def _get_change_marker(self):
+        """
+        Get a marker of the state of the workspace. Algorithms modifying the workspace in place
+        add to its history, which changes the marker.
+        """
+        history = self.ws.getHistory()
+        size = history.size()
+        last_execution = str(history.lastAlgorithm().executionDate()) if size > 0 else ""
+        return size, last_execution, self.ws.getTitle(), self.ws.getNumberHistograms()
+
     def _xlim_changed(self, ax):
         if self._update_extent():
             self._resample_required = True
@@ -106,23 +135,39 @@ class SamplingImage(MantidImage):
             if xbins is None or ybins is None:
                 xbins, ybins = self._calculate_bins_from_extent()
 
-            x, y, data = get_matrix_2d_ragged(self.ws,
-                                              self.normalize_by_bin_width,
-                                              histogram2D=True,
-                                              transpose=self.transpose,
-                                              extent=extent,
-                                              xbins=xbins,
-                                              ybins=ybins,
-                                              spec_info=self.spectrum_info,
-                                              maxpooling=self._maxpooling)
-
-            # Data is an MxN matrix.
-            # If origin = upper extent is set as [xmin, xmax, ymax, ymin].
-            # Data[M,0] is the data at [xmin, ymin], which should be drawn at the top left corner,
-            # whereas Data[0,0] is the data at [xmin, ymax], which should be drawn at the bottom left corner.
-            # Origin upper starts drawing the data from top-left, which means we need to horizontally flip the matrix
-            if self.origin == "upper":
-                data = np.flip(data, 0)
+            marker = self._get_change_marker()
+            key = (tuple(extent), xbins, ybins, self._maxpooling, self.normalize_by_bin_width, self.transpose,
+                   self.origin, marker)
+            data = self._image_cache.get(key)
+            if data is None:
+                if self._maxpooling and (self._summed_spectra is None or self._summed_spectra_marker != marker):
+                    self._summed_spectra = get_summed_spectra(self.ws)
+                    self._summed_spectra_marker = marker
+
+                x, y, data = get_matrix_2d_ragged(self.ws,
+                                                  self.normalize_by_bin_width,
+                                                  histogram2D=True,
+                                                  transpose=self.transpose,
+                                                  extent=extent,
+                                                  xbins=xbins,
+                                                  ybins=ybins,
+                                                  spec_info=self.spectrum_info,
+                                                  maxpooling=self._maxpooling,
+                                                  summed_spectra=self._summed_spectra)
+
+                # Data is an MxN matrix.
+                # If origin = upper extent is set as [xmin, xmax, ymax, ymin].
+                # Data[M,0] is the data at [xmin, ymin], which should be drawn at the top left corner,
+                # whereas Data[0,0] is the data at [xmin, ymax], which should be drawn at the bottom left corner.
+                # Origin upper starts drawing the data from top-left, which means we need to horizontally flip the matrix
+                if self.origin == "upper":
+                    data = np.flip(data, 0)
+
+                self._image_cache[key] = data
+                if len(self._image_cache) > MAX_CACHED_IMAGES:
+                    self._image_cache.popitem(last=False)
+            else:
+                self._image_cache.move_to_end(key)
 
             self.set_data(data)
             self._xbins = xbins
@@ -146,11 +191,11 @@ class SamplingImage(MantidImage):
     def _update_maxpooling_option(self):
         """
         Updates the maxpooling option, used when the image is downsampled
-        If the workspace is large, or ragged, we skip this maxpooling step and set the option as False
+        If the workspace is ragged, we skip this maxpooling step and set the option as False.
+        The spectrum integrals it needs are computed once and cached, so large workspaces can use it.
         """
         axis = self.ws.getAxis(1)
-        self._maxpooling = (self.ws.getNumberHistograms() <= MAX_HISTOGRAMS and axis.isSpectra() and
-                            not self.ws.isRaggedWorkspace())
+        self._maxpooling = axis.isSpectra() and not self.ws.isRaggedWorkspace()
 
 
 def imshow_sampling(axes,
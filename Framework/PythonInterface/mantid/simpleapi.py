@@ -30,6 +30,7 @@ Importing this module starts the FrameworkManager instance.
 from collections import OrderedDict, namedtuple
 from contextlib import contextmanager
 import inspect
+import json
 import os
 import sys
 
@@ -37,6 +38,7 @@ import mantid
 # This is a simple API so give access to the aliases by default as well
 from mantid import __gui__, api as _api, kernel as _kernel, apiVersion
 from mantid.kernel import plugins as _plugin_helper
+from mantid.utils import write_file_atomically as _write_file_atomically
 from mantid.kernel.funcinspect import customise_func as _customise_func, lhs_info as _lhs_info, \
     replace_signature as _replace_signature, LazyFunctionSignature
 
@@ -63,6 +65,23 @@ __LOGGING_KEYWORD__ = "EnableLogging"
 __STORE_KEYWORD__ = "StoreInADS"
 # This is the default value for __STORE_KEYWORD__
 __STORE_ADS_DEFAULT__ = True
+# The configuration key turning on the creation of the algorithm functions on first use
+__LAZY_REGISTRATION_KEY__ = "python.simpleapi.lazy"
+# Name of the manifest of the algorithm functions, in the user properties directory
+__MANIFEST_FILENAME__ = "simpleapi_manifest.json"
+
+# What is needed to register the function of an algorithm without creating the algorithm
+_ManifestEntry = namedtuple("_ManifestEntry", "version aliases method_name method_input_property method_on")
+# Algorithm functions which are created on first access (lazy registration): name -> _ManifestEntry
+_lazy_functions = {}
+# Aliases of the algorithm functions which are created on first access: alias -> name
+_lazy_aliases = {}
+# Names of the plugin functions which are faked on first access until the plugins are loaded (lazy registration)
+_pending_plugin_functions = set()
+# Algorithms of the plugins which are imported on first access (deferred import): name -> plugin file
+_deferred_plugins = {}
+# Directories added to the system path when importing the plugins
+_plugin_dirs = set()
 
 
 def specialization_exists(name):
@@ -901,7 +920,6 @@ def _set_logging_option(algm_obj, kwargs):
         :param algm_obj: An initialised algorithm object
         :param **kwargs: A dictionary of the keyword arguments passed to the simple function call
     """
-    import inspect
     parent = _find_parent_pythonalgorithm(inspect.currentframe())
     logging_default = parent.isLogging() if parent is not None else True
     algm_obj.setLogging(kwargs.pop(__LOGGING_KEYWORD__, logging_default))
@@ -963,15 +981,40 @@ def set_properties(alg_object, *args, **kwargs):
         do_set_property(key, value)
 
 
-def _create_algorithm_function(name, version, algm_object):
+def _check_deprecated_properties(algm, kwargs):
+    """
+        Raises a ValueError suggesting the replacement of a deprecated property
+        given in kwargs, since a change in parameters should get a better error message
+        :param algm: the algorithm object
+        :param kwargs: the keyword arguments of the algorithm function
+    """
+    if algm.name() not in ['LoadEventNexus', 'LoadNexusMonitors']:
+        return
+    for propname in ['MonitorsAsEvents', 'LoadEventMonitors', 'LoadHistoMonitors']:
+        if propname in kwargs:
+            suggest = 'LoadOnly'
+            if algm.name() == 'LoadEventNexus':
+                suggest = 'MonitorsLoadOnly'
+            msg = 'Deprecated property "{}" in {}. Use "{}" instead'.format(propname, algm.name(), suggest)
+            raise ValueError(msg)
+
+
+def _create_algorithm_function(name, version, algm_object, aliases=None):
     """
         Create a function that will set up and execute an algorithm.
         The help that will be displayed is that of the most recent version.
         :param name: name of the algorithm
         :param version: The version of the algorithm
-        :param algm_object: the created algorithm object.
+        :param algm_object: the created algorithm object. If None, it is created when the help is first accessed.
+        :param aliases: the aliases of the algorithm. If None, they are taken from the algorithm object.
     """
 
+    def get_algm_object():
+        nonlocal algm_object
+        if algm_object is None:
+            algm_object = AlgorithmManager.createUnmanaged(name, version)
+        return algm_object
+
     def algorithm_wrapper():
         """
         Creates a wrapper object around the algorithm functions.
@@ -983,12 +1026,12 @@ def _create_algorithm_function(name, version, algm_object):
                 obj = object.__getattribute__(self, item)
                 if obj is None and item == "__doc__":  # Set doc if accessed directly
                     obj = object.__getattribute__(self, "__class__")
-                    algm_object.initialize()
-                    setattr(obj, "__doc__", algm_object.docString())
+                    get_algm_object().initialize()
+                    setattr(obj, "__doc__", get_algm_object().docString())
                     return obj.__doc__
                 if item == "__class__" and obj.__doc__ is None:  # Set doc if class is accessed.
-                    algm_object.initialize()
-                    setattr(obj, "__doc__", algm_object.docString())
+                    get_algm_object().initialize()
+                    setattr(obj, "__doc__", get_algm_object().docString())
                 return obj
 
             def __call__(self, *args, **kwargs):
@@ -999,18 +1042,8 @@ def _create_algorithm_function(name, version, algm_object):
                 If both startProgress and endProgress are supplied they will
                 be used.
                 """
-                _version = version
-                if "Version" in kwargs:
-                    _version = kwargs["Version"]
-                    del kwargs["Version"]
-
-                _startProgress, _endProgress = (None, None)
-                if 'startProgress' in kwargs:
-                    _startProgress = kwargs['startProgress']
-                    del kwargs['startProgress']
-                if 'endProgress' in kwargs:
-                    _endProgress = kwargs['endProgress']
-                    del kwargs['endProgress']
+                _version = kwargs.pop("Version", version)
+                _startProgress, _endProgress, kwargs = extract_progress_kwargs(kwargs)
 
                 algm = _create_algorithm_object(name, _version, _startProgress, _endProgress)
                 _set_logging_option(algm, kwargs)
@@ -1020,16 +1053,7 @@ def _create_algorithm_function(name, version, algm_object):
                 if "CoordinatesToUse" in kwargs and name in __MDCOORD_FUNCTIONS__:
                     del kwargs["CoordinatesToUse"]
 
-                # a change in parameters should get a better error message
-                if algm.name() in ['LoadEventNexus', 'LoadNexusMonitors']:
-                    for propname in ['MonitorsAsEvents', 'LoadEventMonitors', 'LoadHistoMonitors']:
-                        if propname in kwargs:
-                            suggest = 'LoadOnly'
-                            if algm.name() == 'LoadEventNexus':
-                                suggest = 'MonitorsLoadOnly'
-                            msg = 'Deprecated property "{}" in {}. Use "{}" instead'.format(propname,
-                                                                                            algm.name(), suggest)
-                            raise ValueError(msg)
+                _check_deprecated_properties(algm, kwargs)
 
                 frame = kwargs.pop("__LHS_FRAME_OBJECT__", None)
 
@@ -1059,7 +1083,9 @@ def _create_algorithm_function(name, version, algm_object):
 
     globals()[name] = algm_wrapper
     # Register aliases - split on whitespace
-    for alias in algm_object.alias().strip().split():
+    if aliases is None:
+        aliases = algm_object.alias().strip().split()
+    for alias in aliases:
         globals()[alias] = algm_wrapper
     # endfor
     return algm_wrapper
@@ -1077,7 +1103,6 @@ def _create_algorithm_object(name, version=-1, startProgress=None, endProgress=N
     :param name A string name giving the algorithm
     :param version A int version number
     """
-    import inspect
     parent = _find_parent_pythonalgorithm(inspect.currentframe())
     if parent is not None:
         kwargs = {'version': version}
@@ -1109,24 +1134,12 @@ def _find_parent_pythonalgorithm(frame):
     # We are looking for this method name
     fn_name = "PyExec"
 
-    # Return the 'self' object of a given frame
-    def get_self(frame_arg):
-        return frame_arg.f_locals['self']
-
-    # Look recursively for the PyExec method in the stack
-    if frame.f_code.co_name == fn_name:
-        return get_self(frame)
-    while True:
-        if frame.f_back:
-            if frame.f_back.f_code.co_name == fn_name:
-                return get_self(frame.f_back)
-            frame = frame.f_back
-        else:
-            break
-    if frame.f_code.co_name == fn_name:
-        return get_self(frame)
-    else:
-        return None
+    # Only the name of the code of each frame is compared, the locals are only read for the PyExec frame
+    while frame is not None:
+        if frame.f_code.co_name == fn_name:
+            return frame.f_locals['self']
+        frame = frame.f_back
+    return None
 
 # ----------------------------------------------------------------------------------------------------------------------
 
@@ -1159,7 +1172,8 @@ def _mockup(plugins):
         in the alphabet. The first algorithm stops with an import error as that function
         is not yet known. By having a pre-loading step all of the necessary functions
         on this module can be created and after the plugins are loaded the correct
-        function definitions can overwrite the "fake" ones.
+        function definitions can overwrite the "fake" ones. With lazy registration the
+        fake functions are only created when they are accessed.
         :param plugins: A list of  modules that have been loaded
     """
     module_attrs = globals()
@@ -1182,16 +1196,22 @@ def _mockup(plugins):
         fake_function.__name__ = func_name
         module_attrs[func_name] = fake_function
 
+    lazy = _lazy_registration()
     for plugin in plugins:
         name = os.path.basename(plugin)
         name = os.path.splitext(name)[0]
-        create_fake_function(name)
+        if lazy:
+            _pending_plugin_functions.add(name)
+        else:
+            create_fake_function(name)
 
 
-def _translate():
+def _translate(algorithm_names=None):
     """
         Loop through the algorithms and register a function call
-        for each of them
+        for each of them. With lazy registration the functions are only
+        created when they are first accessed, see __getattr__.
+        :param algorithm_names: If given, only the algorithms of these names are registered
         :returns: a list of the name of new function calls
     """
     from mantid.api import AlgorithmFactory, AlgorithmManager
@@ -1201,20 +1221,34 @@ def _translate():
     # on different algorithms, which is an error
     new_methods = {}
 
+    lazy = _lazy_registration()
+    manifest = _load_manifest() if lazy else {}
+    manifest_changed = False
+
     algs = AlgorithmFactory.getRegisteredAlgorithms(True)
     algorithm_mgr = AlgorithmManager
     for name, versions in algs.items():
-        if specialization_exists(name):
-            continue
-        try:
-            # Create the algorithm object
-            algm_object = algorithm_mgr.createUnmanaged(name, max(versions))
-        except Exception as exc:
-            logger.warning("Error initializing {0} on registration: '{1}'".format(name, str(exc)))
+        if specialization_exists(name) or (algorithm_names is not None and name not in algorithm_names):
             continue
-
-        algorithm_wrapper = _create_algorithm_function(name, max(versions), algm_object)
-        method_name = algm_object.workspaceMethodName()
+        version = max(versions)
+        entry = manifest.get(name)
+        algm_object = None
+        if entry is None or entry.version != version:
+            try:
+                # Create the algorithm object
+                algm_object = algorithm_mgr.createUnmanaged(name, version)
+            except Exception as exc:
+                logger.warning("Error initializing {0} on registration: '{1}'".format(name, str(exc)))
+                continue
+            entry = _manifest_entry(algm_object)
+            manifest[name] = entry
+            manifest_changed = True
+
+        if lazy:
+            algorithm_wrapper = _register_lazy_function(name, entry)
+        else:
+            algorithm_wrapper = _create_algorithm_function(name, version, algm_object)
+        method_name = entry.method_name
         if len(method_name) > 0:
             if method_name in new_methods:
                 other_alg = new_methods[method_name]
@@ -1222,33 +1256,186 @@ def _translate():
                                    "it has already been attached to point to the '%s' algorithm.\n"
                                    "Does one inherit from the other? "
                                    "Please check and update one of the algorithms accordingly."
-                                   % (method_name, algm_object.name(), other_alg))
-            _attach_algorithm_func_as_method(method_name, algorithm_wrapper, algm_object)
-            new_methods[method_name] = algm_object.name()
+                                   % (method_name, name, other_alg))
+            _attach_algorithm_func_as_method(method_name, algorithm_wrapper, name, entry)
+            new_methods[method_name] = name
         new_func_attrs.append(name)
 
+    if lazy and manifest_changed:
+        _save_manifest(manifest)
     return new_func_attrs
 
 
 # -------------------------------------------------------------------------------------------------------------
 
 
-def _attach_algorithm_func_as_method(method_name, algorithm_wrapper, algm_object):
+def _attach_algorithm_func_as_method(method_name, algorithm_wrapper, algm_name, entry):
     """
         Attachs the given algorithm free function to those types specified by the algorithm
         :param method_name: The name of the new method on the type
         :param algorithm_wrapper: Function object whose signature should be f(*args,**kwargs) and when
                                  called will run the selected algorithm
-        :param algm_object: An algorithm object that defines the extra properties of the new method
+        :param algm_name: The name of the algorithm
+        :param entry: The _ManifestEntry of the algorithm defining the extra properties of the new method
     """
-    input_prop = algm_object.workspaceMethodInputProperty()
+    input_prop = entry.method_input_property
     if input_prop == "":
         raise RuntimeError("simpleapi: '%s' has requested to be attached as a workspace method but "
                            "Algorithm::workspaceMethodInputProperty() has returned an empty string."
                            "This method is required to map the calling object to the correct property."
-                           % algm_object.name())
-    _api._workspaceops.attach_func_as_method(method_name, algorithm_wrapper, input_prop, algm_object.name(),
-                                             algm_object.workspaceMethodOn())
+                           % algm_name)
+    _api._workspaceops.attach_func_as_method(method_name, algorithm_wrapper, input_prop, algm_name,
+                                             entry.method_on)
+
+
+# -------------------------------------------------------------------------------------------------------------
+
+
+def _lazy_registration():
+    """
+        :returns: True if the algorithm functions are to be created on first use
+    """
+    return ConfigService.Instance()[__LAZY_REGISTRATION_KEY__].strip().lower() in ("on", "1", "true")
+
+
+def _manifest_entry(algm_object):
+    """
+        :param algm_object: An algorithm object
+        :returns: the _ManifestEntry describing the function of the algorithm
+    """
+    return _ManifestEntry(version=algm_object.version(),
+                          aliases=algm_object.alias().strip().split(),
+                          method_name=algm_object.workspaceMethodName(),
+                          method_input_property=algm_object.workspaceMethodInputProperty(),
+                          method_on=list(algm_object.workspaceMethodOn()))
+
+
+def _manifest_path():
+    return os.path.join(ConfigService.Instance().getUserPropertiesDir(), __MANIFEST_FILENAME__)
+
+
+def _load_manifest():
+    """
+        Reads the manifest of the algorithm functions saved by a previous session.
+        The manifest is discarded when it has been written by a different version of Mantid.
+        :returns: a dictionary of algorithm names to _ManifestEntry
+    """
+    try:
+        with open(_manifest_path()) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest["mantid_version"] != mantid.__version__:
+            return {}
+        return {name: _ManifestEntry(**entry) for name, entry in manifest["algorithms"].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def _save_manifest(manifest):
+    """
+        Writes the manifest of the algorithm functions for the next session.
+        :param manifest: a dictionary of algorithm names to _ManifestEntry
+    """
+    path = _manifest_path()
+    content = {"mantid_version": mantid.__version__,
+               "algorithms": {name: entry._asdict() for name, entry in manifest.items()}}
+    try:
+        _write_file_atomically(path, json.dumps(content))
+    except OSError as exc:
+        logger.debug("Unable to save the simpleapi manifest to '{0}': {1}".format(path, str(exc)))
+
+
+def _register_lazy_function(name, entry):
+    """
+        Registers the function of an algorithm to be created on first access.
+        :param name: The name of the algorithm
+        :param entry: The _ManifestEntry of the algorithm
+        :returns: a function calling the algorithm function, to be attached as a workspace method
+    """
+    # Remove any fake or outdated function so that the module __getattr__ is used
+    for func_name in [name] + entry.aliases:
+        globals().pop(func_name, None)
+        _lazy_aliases.pop(func_name, None)
+    _lazy_functions[name] = entry
+    for alias in entry.aliases:
+        _lazy_aliases[alias] = name
+    _pending_plugin_functions.discard(name)
+
+    def call_algorithm_function(*args, **kwargs):
+        return __getattr__(name)(*args, **kwargs)
+
+    call_algorithm_function.__name__ = name
+    return call_algorithm_function
+
+
+def __getattr__(name):
+    """
+        Creates the function of an algorithm registered with lazy registration on first access.
+        :param name: The name of the algorithm or one of its aliases
+    """
+    if name in globals():
+        return globals()[name]
+    algorithm_name = _lazy_aliases.get(name, name)
+    entry = _lazy_functions.get(algorithm_name)
+    if entry is not None:
+        return _create_algorithm_function(algorithm_name, entry.version, None, entry.aliases)
+    if name in _pending_plugin_functions:
+        _create_fake_function(name)
+        return globals()[name]
+    if name == "__all__" and _lazy_functions:
+        # Star imports include the functions which have not been created yet. Plugins importing the module while
+        # the plugins are loaded get the fake functions of the other plugins, which are replaced once they are loaded
+        return [attr for attr in __dir__() if not attr.startswith("_")]
+    raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_functions) | set(_lazy_aliases) | _pending_plugin_functions)
+
+
+def _create_deferred_function(name):
+    """
+        Creates a function which imports the deferred plugin of an algorithm when it is first
+        called, so that star imports of this module do not import the deferred plugins.
+        :param name: The name of the algorithm
+    """
+
+    def deferred_function(*args, **kwargs):
+        if name in _deferred_plugins:
+            _import_deferred_plugin(_deferred_plugins[name])
+        if globals().get(name) is deferred_function:
+            raise RuntimeError("The plugin declaring the algorithm '{0}' did not subscribe it".format(name))
+        kwargs.setdefault("__LHS_FRAME_OBJECT__", inspect.currentframe().f_back)
+        return getattr(sys.modules[__name__], name)(*args, **kwargs)
+
+    deferred_function.__name__ = name
+    globals()[name] = deferred_function
+
+
+def _import_deferred_plugin(plugin_file):
+    """
+        Imports a plugin whose import has been deferred and registers the functions of its algorithms.
+        :param plugin_file: The path to the plugin file
+    """
+    names = [name for name, path in _deferred_plugins.items() if path == plugin_file]
+    for name in names:
+        del _deferred_plugins[name]
+    with _update_sys_path(_plugin_dirs):
+        modules = _plugin_helper.load(plugin_file)
+    functions = _functions_used_by(_translate(names), modules)
+    _plugin_helper.sync_attrs(functions, list(functions), modules)
+
+
+def _functions_used_by(names, modules):
+    """
+        :param names: A list of function names
+        :param modules: A list of modules
+        :returns: a dictionary of the functions of this module, of the given names, used by any of the modules
+    """
+    return {name: getattr(sys.modules[__name__], name) for name in names
+            if any(hasattr(module, name) for module in modules)}
+
+
+# -------------------------------------------------------------------------------------------------------------
 
 
 @contextmanager
@@ -1300,7 +1487,6 @@ try:
     plugins_manifest_path = ConfigService.Instance()["python.plugins.manifest"]
     plugins_dir = os.path.dirname(plugins_manifest_path)
     _plugin_files = []
-    _plugin_dirs = set()
     if not plugins_manifest_path:
         logger.information("Path to plugins manifest is empty. The python plugins will not be loaded.")
     elif not os.path.exists(plugins_manifest_path):
@@ -1326,6 +1512,17 @@ try:
             logger.warning(f"Error occurred during plugin discovery: {str(e)}")
             continue
 
+    # Only import the plugins of the algorithms when they are first used, see _create_deferred_function
+    if _lazy_registration() and _plugin_helper.deferred_import_enabled():
+        _deferrable = _plugin_helper.find_deferrable(_plugin_files)
+        # Plugins adding versions of the C++ algorithms are imported now
+        _eager_files = {path for name, path in _deferrable.items()
+                        if name in _lazy_functions or specialization_exists(name)}
+        _deferred_plugins.update({name: path for name, path in _deferrable.items() if path not in _eager_files})
+        _deferred_files = set(_deferred_plugins.values())
+        _plugin_files = [path for path in _plugin_files if path not in _deferred_files]
+        for _name in _deferred_plugins:
+            _create_deferred_function(_name)
     # Mock out the expected functions
     _mockup(_plugin_files)
     # Load the plugins.
@@ -1334,7 +1531,8 @@ try:
     # Create the final proper algorithm definitions for the plugins
     _plugin_attrs = _translate()
     # Finally, overwrite the mocked function definitions in the loaded modules with the real ones
-    _plugin_helper.sync_attrs(globals(), _plugin_attrs, _plugin_modules)
+    _plugin_functions = _functions_used_by(_plugin_attrs, _plugin_modules)
+    _plugin_helper.sync_attrs(_plugin_functions, list(_plugin_functions), _plugin_modules)
 
     # Attach fit function wrappers
     from .fitfunctions import _wrappers
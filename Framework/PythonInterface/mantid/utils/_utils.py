@@ -6,8 +6,10 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 from contextlib import contextmanager
 from importlib import import_module
+import os
+import tempfile
 
-__all__ = ['is_required_version', 'import_mantid_cext']
+__all__ = ['is_required_version', 'import_mantid_cext', 'write_file_atomically']
 
 
 def is_required_version(required_version, version):
@@ -17,6 +19,28 @@ def is_required_version(required_version, version):
     return True
 
 
+def write_file_atomically(path, text):
+    """
+    Writes a file by replacing it in one step, so that other processes never read a partial file.
+    The temporary file written next to it is removed if the write or the replacement fails.
+
+    :param path: The path of the file to write
+    :param text: The text to write to the file
+    :raises OSError: If the file cannot be written
+    """
+    temp_file = tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), suffix=".tmp", delete=False)
+    try:
+        with temp_file:
+            temp_file.write(text)
+        os.replace(temp_file.name, path)
+    except BaseException:
+        try:
+            os.remove(temp_file.name)
+        except OSError:
+            pass
+        raise
+
+
 def import_mantid_cext(modulename, package="", caller_globals=None):
     """
     Import a Mantid module built from the PythonInterface.
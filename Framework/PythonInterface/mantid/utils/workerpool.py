@@ -0,0 +1,51 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Pools of worker processes which run with the settings of the ConfigService of the process creating them.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from mantid.kernel import config
+
+# Settings which are often changed at run time, e.g. by the GUI, and which the workers need to find the runs
+# and to save their output. The facility is set before the instrument, since setting it changes the instrument,
+# and the save directory before the data search directories, since setting it adds it to the search directories.
+WORKER_CONFIG_KEYS = ("default.facility", "default.instrument", "defaultsave.directory", "datasearch.directories",
+                      "datasearch.searcharchive")
+
+
+def get_worker_config():
+    """
+    Gets the settings of the ConfigService which have to be passed to the worker processes.
+
+    :return: a list of (key, value) pairs.
+    """
+    return [(key, config[key]) for key in WORKER_CONFIG_KEYS]
+
+
+def initialize_worker_process(config_values):
+    """
+    Applies the settings of the ConfigService of the parent process to a worker process, which starts with the
+    settings read from the properties files.
+
+    :param config_values: a list of (key, value) pairs as returned by get_worker_config.
+    """
+    for key, value in config_values:
+        config[key] = value
+
+
+def create_worker_pool(max_workers=None):
+    """
+    Creates a pool of worker processes which have the settings of the ConfigService of this process.
+
+    Worker processes are spawned rather than forked, so that each has a freshly started framework.
+    :param max_workers: the maximum number of worker processes. Defaults to the number of processors.
+    :return: a ProcessPoolExecutor.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=initialize_worker_process, initargs=(get_worker_config(),))
@@ -56,6 +56,8 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
     _density = None
     _radii = None
     _interpolate = False
+    # Number of detector angles evaluated together
+    _angle_block_size = 100
 
 #------------------------------------------------------------------------------
 
@@ -246,11 +248,13 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
         dataA3 = []
         dataA4 = []
 
-        data_prog = Progress(self, start=0.1, end=0.85, nreports=len(self._angles))
-        for angle in self._angles:
-            (A1, A2, A3, A4) = self._cyl_abs(angle)
-            logger.information('Angle : %f * successful' % angle)
-            data_prog.report('Appending data for angle %f' % angle)
+        angle_blocks = range(0, len(self._angles), self._angle_block_size)
+        data_prog = Progress(self, start=0.1, end=0.85, nreports=len(angle_blocks))
+        for start in angle_blocks:
+            angles = self._angles[start:start + self._angle_block_size]
+            (A1, A2, A3, A4) = self._cyl_abs(angles)
+            logger.information('Angles : %f to %f * successful' % (angles[0], angles[-1]))
+            data_prog.report('Appending data for angles %f to %f' % (angles[0], angles[-1]))
             dataA1 = np.append(dataA1, A1)
             dataA2 = np.append(dataA2, A2)
             dataA3 = np.append(dataA3, A3)
@@ -589,7 +593,7 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
 
 #------------------------------------------------------------------------------
 
-    def _cyl_abs(self, angle):
+    def _cyl_abs(self, angles):
         #  Parameters :
         #  self._step_size - step size
         #  self._beam - beam parameters
@@ -598,54 +602,46 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
         #  density - list of densities (for each annulus)
         #  sigs - list of scattering cross-sections (for each annulus)
         #  siga - list of absorption cross-sections (for each annulus)
-        #  angle - list of angles
+        #  angles - list of angles
         #  wavelas - elastic wavelength
         #  waves - list of wavelengths
         #  Output parameters :  A1 - Ass ; A2 - Assc ; A3 - Acsc ; A4 - Acc
+        #  each an array of shape (number of angles, number of wavelengths)
 
-        amu_scat = np.zeros(self._number_can)
         amu_scat = self._density*self._sig_s
-        sig_abs = np.zeros(self._number_can)
         sig_abs = self._density*self._sig_a
-        amu_tot_i = np.zeros(self._number_can)
-        amu_tot_s = np.zeros(self._number_can)
-
-        theta = angle*math.pi/180.
-        A1 = []
-        A2 = []
-        A3 = []
-        A4 = []
-        #loop over wavelengths
-        for wave in self._waves:
-            #loop over annuli
-            if self._emode == 'Elastic':
-                amu_tot_i = amu_scat + sig_abs*self._elastic/1.7979
-                amu_tot_s = amu_scat + sig_abs*self._elastic/1.7979
-            elif self._emode == 'Direct':
-                amu_tot_i = amu_scat + sig_abs*self._fixed/1.7979
-                amu_tot_s = amu_scat + sig_abs*wave/1.7979
-            elif self._emode == 'Indirect':
-                amu_tot_i = amu_scat + sig_abs*wave/1.7979
-                amu_tot_s = amu_scat + sig_abs*self._fixed/1.7979
-            elif self._emode == 'Efixed':
-                amu_tot_i = amu_scat + sig_abs*self._fixed/1.7979
-                amu_tot_s = amu_scat + sig_abs*self._fixed/1.7979
-            (Ass, Assc, Acsc, Acc) = self._acyl(theta, amu_scat, amu_tot_i, amu_tot_s)
-            A1.append(Ass)
-            A2.append(Assc)
-            A3.append(Acsc)
-            A4.append(Acc)
-        return A1, A2, A3, A4
+
+        # Wavelengths of the incident and scattered neutrons, one row per wavelength
+        waves = np.array(self._waves, dtype=float)[:, np.newaxis]
+        if self._emode == 'Elastic':
+            wave_i = np.full_like(waves, self._elastic)
+            wave_s = wave_i
+        elif self._emode == 'Direct':
+            wave_i = np.full_like(waves, self._fixed)
+            wave_s = waves
+        elif self._emode == 'Indirect':
+            wave_i = waves
+            wave_s = np.full_like(waves, self._fixed)
+        else:
+            wave_i = np.full_like(waves, self._fixed)
+            wave_s = wave_i
+        amu_tot_i = amu_scat + sig_abs*wave_i/1.7979
+        amu_tot_s = amu_scat + sig_abs*wave_s/1.7979
+
+        theta = np.array(angles, dtype=float)*math.pi/180.
+        return self._acyl(theta, amu_scat, amu_tot_i, amu_tot_s)
 
 #------------------------------------------------------------------------------
 
     def _acyl(self, theta, amu_scat, amu_tot_i, amu_tot_s):
+        # theta - array of angles ; amu_tot_i, amu_tot_s - arrays of shape (wavelengths, annuli)
         A = self._beam[1]
+        shape = (len(theta), amu_tot_i.shape[0])
         Area_s = 0.0
-        Ass = 0.0
-        Acc = 0.0
-        Acsc = 0.0
-        Assc = 0.0
+        Ass = np.zeros(shape)
+        Acc = np.zeros(shape)
+        Acsc = np.zeros(shape)
+        Assc = np.zeros(shape)
         nan = self._number_can
         if self._number_can < 2:
 #
@@ -696,87 +692,96 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
     def _sum_rom(self, n_scat, n_abs, a, r1, r2, ms, theta, amu_scat, amu_tot_i, amu_tot_s):
         #n_scat is region for scattering
         #n_abs is region for absorption
-        nan = self._number_can
+        #the sums are arrays of shape (angles, wavelengths)
+        shape = (len(theta), amu_tot_i.shape[0])
         omega_add = 0.
         if a < 0.:
             omega_add = math.pi
-        AAA = 0.
-        BBB = 0.
-        Area = 0.
         theta_deg = math.pi - theta
-        num = ms
         r_step = (r2 - r1)/ms
         r_add = -0.5*r_step + r1
 
-# start loop over M
-        for M in range(1, num+1):
-            r = M*r_step + r_add
-            number_omega = int(math.pi*r/r_step)
-            omega_ster = math.pi/number_omega
-            omega_deg = -0.5*omega_ster + omega_add
-            Area_y = r*r_step*omega_ster*amu_scat[n_scat]
-            sum_1 = 0.
-            sum_2 = 0.
-            I = 1
-            Area_sum = 0.
-            for _ in range(1, number_omega +1):
-                omega = I*omega_ster + omega_deg
-                distance = r*math.sin(omega)
-
-                skip = True
-                if abs(distance) <= a:
+# the sums are only kept for the last step M = ms of the loop over M
+        r = ms*r_step + r_add
+        number_omega = int(math.pi*r/r_step)
+        omega_ster = math.pi/number_omega
+        omega_deg = -0.5*omega_ster + omega_add
+        Area_y = r*r_step*omega_ster*amu_scat[n_scat]
+
+        omega, visits = self._beam_omegas(r, number_omega, omega_ster, omega_deg, a)
+        Area_sum = np.sum(visits)
+        if Area_sum == 0.:
+            return np.zeros(shape), np.zeros(shape), 0.
 #
-# CALCULATE DISTANCE INCIDENT NEUTRON PASSES THROUGH EACH ANNULUS
-                    LIS = []
-                    for j in range(0, nan):
-                        LIST = self._distance(r, self._radii[j], omega)
-                        LISN = self._distance(r, self._radii[j+1], omega)
-                        LIS.append(LISN - LIST)
+# CALCULATE DISTANCE INCIDENT NEUTRON PASSES THROUGH EACH ANNULUS, shape (omega, annuli)
+        LIS = self._annuli_distances(r, omega)
 #
-# CALCULATE DISTANCE SCATTERED NEUTRON PASSES THROUGH EACH ANNULUS
-                    O = omega + theta_deg
-                    LSS = []
-                    for j in range(0, nan):
-                        LSST = self._distance(r, self._radii[j], O)
-                        LSSN = self._distance(r, self._radii[j+1], O)
-                        LSS.append(LSSN - LSST)
+# CALCULATE DISTANCE SCATTERED NEUTRON PASSES THROUGH EACH ANNULUS, shape (angles, omega, annuli)
+        LSS = self._annuli_distances(r, omega + theta_deg[:, np.newaxis])
 #
-# CALCULATE ABSORPTION FOR PATH THROUGH ALL ANNULI,AND THROUGH INNER ANNULI
-                    path = np.zeros(3)
+# CALCULATE ABSORPTION FOR PATH THROUGH ALL ANNULI,AND THROUGH INNER ANNULI, shape (angles, wavelengths, omega)
 #	split into input (I) and scattered (S) paths
-                    path[0] += amu_tot_i[0]*LIS[0] + amu_tot_s[0]*LSS[0]
-                    if nan == 2:
-                        path[2] += amu_tot_i[1]*LIS[1] + amu_tot_s[1]*LSS[1]
-                        path[1] = path[0] + path[2]
-                    sum_1 += math.exp(-path[n_abs])
-                    sum_2 += math.exp(-path[n_abs +1])
-                    Area_sum += 1.0
-                    skip = False
-
-                if skip:
-                    I = number_omega -I +2
-                else:
-                    I += 1
-        AAA += sum_1*Area_y
-        BBB += sum_2*Area_y
-        Area += Area_sum*Area_y
+        path = [self._annulus_path(0, LIS, LSS, amu_tot_i, amu_tot_s), 0., 0.]
+        if self._number_can == 2:
+            path[2] = self._annulus_path(1, LIS, LSS, amu_tot_i, amu_tot_s)
+            path[1] = path[0] + path[2]
+        sum_1 = np.sum(visits*np.exp(-path[n_abs]), axis=-1)
+        sum_2 = np.sum(visits*np.exp(-path[n_abs +1]), axis=-1)
+
+        AAA = sum_1*Area_y*np.ones(shape)
+        BBB = sum_2*Area_y*np.ones(shape)
+        Area = Area_sum*Area_y
         return AAA, BBB, Area
 
+#------------------------------------------------------------------------------
+
+    @staticmethod
+    def _beam_omegas(r, number_omega, omega_ster, omega_deg, a):
+        # Steps around the ring that are inside the beam, with the number of times each is visited.
+        # Starting from I = 1, I moves on by one inside the beam and jumps to number_omega - I + 2 outside it,
+        # so I stays within [-number_omega, 2*number_omega + 1].
+        first = -number_omega
+        indices = np.arange(first, 2*number_omega + 2)
+        omegas = indices*omega_ster + omega_deg
+        inside = np.abs(r*np.sin(omegas)) <= a
+        visits = np.zeros(len(indices))
+        I = 1
+        for _ in range(number_omega):
+            if inside[I - first]:
+                visits[I - first] += 1.0
+                I += 1
+            else:
+                I = number_omega - I + 2
+        visited = visits > 0
+        return omegas[visited], visits[visited]
+
+#------------------------------------------------------------------------------
+
+    def _annuli_distances(self, r, omega):
+        # Distance travelled through each annulus, along the last axis
+        return np.stack([self._distance(r, self._radii[j+1], omega) - self._distance(r, self._radii[j], omega)
+                         for j in range(0, self._number_can)], axis=-1)
+
+#------------------------------------------------------------------------------
+
+    @staticmethod
+    def _annulus_path(j, LIS, LSS, amu_tot_i, amu_tot_s):
+        # Attenuation through annulus j for every angle, wavelength and omega
+        return amu_tot_i[:, j, np.newaxis]*LIS[:, j] + amu_tot_s[:, j, np.newaxis]*LSS[:, np.newaxis, :, j]
+
 #------------------------------------------------------------------------------
 
     def _distance(self, r1, radius, omega):
         r = r1
-        distance = 0.
-        b = r*math.sin(omega)
-        if abs(b) < radius:
-            t = r*math.cos(omega)
-            c = radius*radius -b*b
-            d = math.sqrt(c)
-            if r <= radius:
-                distance = t + d
-            else:
-                distance = d*(1.0 + math.copysign(1.0, t))
-        return distance
+        b = r*np.sin(omega)
+        t = r*np.cos(omega)
+        c = np.maximum(radius*radius -b*b, 0.)
+        d = np.sqrt(c)
+        if r <= radius:
+            distance = t + d
+        else:
+            distance = d*(1.0 + np.copysign(1.0, t))
+        return np.where(np.abs(b) < radius, distance, 0.)
 
 #------------------------------------------------------------------------------
 
@@ -5,15 +5,39 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 #pylint: disable=no-init,invalid-name
-from mantid.api import PythonAlgorithm, AlgorithmFactory
+from collections import OrderedDict
+import hashlib
+import numpy as np
+from mantid.api import PythonAlgorithm, AlgorithmFactory, WorkspaceFactory
 import mantid.simpleapi
 from mantid.kernel import StringListValidator, FloatArrayProperty, FloatArrayMandatoryValidator,\
     StringArrayProperty, StringArrayMandatoryValidator, Direction, logger, EnabledWhenProperty, PropertyCriterion
 
+# Interpolators of the most recent calls, keyed by the input workspaces, their data and the regression settings
+_INTERPOLATOR_CACHE_SIZE = 4
+_interpolator_cache = OrderedDict()
 
-class DSFinterp(PythonAlgorithm):
 
-    channelgroup = None
+def evaluate_targets(channelgroup, targetfvalues):
+    """
+    Evaluates the interpolators of all channels for all target parameter values at once.
+
+    :param channelgroup: a dsfinterp ChannelGroup with initialised interpolators
+    :param targetfvalues: the target parameter values, which must lie within the interpolation range
+    :return: the intensities and errors, as arrays of shape (number of targets,) + shape of the structure factors
+    """
+    targetfvalues = np.asarray(targetfvalues, dtype=float)
+    intensities = np.empty((channelgroup.nchannels, len(targetfvalues)))
+    errors = np.empty((channelgroup.nchannels, len(targetfvalues)))
+    for ichannel in range(channelgroup.nchannels):
+        interpolator = channelgroup[ichannel].interpolator
+        intensities[ichannel] = interpolator.y(targetfvalues)
+        errors[ichannel] = interpolator.e(targetfvalues)
+    shape = (len(targetfvalues),) + tuple(channelgroup.shape)
+    return intensities.T.reshape(shape), errors.T.reshape(shape)
+
+
+class DSFinterp(PythonAlgorithm):
 
     def category(self):
         return "Transforms\\Smoothing"
@@ -56,9 +80,11 @@ class DSFinterp(PythonAlgorithm):
         self.declareProperty(FloatArrayProperty('TargetParameters', values=[], ), doc="Parameters to interpolate the structure factor")
         self.declareProperty(StringArrayProperty('OutputWorkspaces', values=[], validator=arrvalidator),
                              doc='list of output workspaces to save the interpolated structure factors')
+        self.declareProperty('OutputGroup', '', direction=Direction.Input,
+                             doc='name of a WorkspaceGroup to collect the output workspaces, if given')
         self.setPropertyGroup('TargetParameters', lrg)
         self.setPropertyGroup('OutputWorkspaces', lrg)
-        self.channelgroup = None
+        self.setPropertyGroup('OutputGroup', lrg)
 
     def areWorkspacesCompatible(self, a, b):
         sizeA = a.blocksize() * a.getNumberHistograms()
@@ -78,30 +104,7 @@ class DSFinterp(PythonAlgorithm):
                 mesg = 'Workspace {0} incompatible with {1}'.format(workspace, workspaces[0])
                 logger.error(mesg)
                 raise ValueError(mesg)
-    # Load the workspaces into a group of dynamic structure factors
-        from dsfinterp.dsf import Dsf
-        from dsfinterp.dsfgroup import DsfGroup
-        from dsfinterp.channelgroup import ChannelGroup
-        dsfgroup = DsfGroup()
-        for idsf in range(len(workspaces)):
-            dsf = Dsf()
-            dsf.Load( mantid.mtd[workspaces[idsf]] )
-            if not self.getProperty('LoadErrors').value:
-                dsf.errors = None # do not incorporate error data
-            dsf.SetFvalue( fvalues[idsf] )
-            dsfgroup.InsertDsf(dsf)
-    # Create the intepolator if not instantiated before
-        if not self.channelgroup:
-            self.channelgroup = ChannelGroup()
-            self.channelgroup.InitFromDsfGroup(dsfgroup)
-            localregression = self.getProperty('LocalRegression').value
-            if localregression:
-                regressiontype = self.getProperty('RegressionType').value
-                windowlength = self.getProperty('RegressionWindow').value
-                self.channelgroup.InitializeInterpolator(running_regr_type=regressiontype, windowlength=windowlength)
-            else:
-                self.channelgroup.InitializeInterpolator(windowlength=0)
-    # Invoke the interpolator and generate the output workspaces
+    # Validate the target parameters before any interpolation
         targetfvalues = self.getProperty('TargetParameters').value
         for targetfvalue in targetfvalues:
             if targetfvalue < min(fvalues) or targetfvalue > max(fvalues):
@@ -113,10 +116,68 @@ class DSFinterp(PythonAlgorithm):
             mesg = 'Number of OutputWorkspaces and TargetParameters should be the same'
             logger.error(mesg)
             raise IndexError(mesg)
+    # Load the workspaces into dynamic structure factors
+        from dsfinterp.dsf import Dsf
+        loaderrors = self.getProperty('LoadErrors').value
+        dsfs = []
+        for idsf in range(len(workspaces)):
+            dsf = Dsf()
+            dsf.Load( mantid.mtd[workspaces[idsf]] )
+            if not loaderrors:
+                dsf.errors = None # do not incorporate error data
+            dsf.SetFvalue( fvalues[idsf] )
+            dsfs.append(dsf)
+    # Evaluate the interpolators for all targets at once
+        channelgroup = self._get_channelgroup(workspaces, dsfs)
+        intensities, errors = evaluate_targets(channelgroup, targetfvalues)
+    # Generate the output workspaces from the first input workspace, without copying its data
+        template = mantid.mtd[workspaces[0]]
         for i in range(len(targetfvalues)):
-            dsf = self.channelgroup( targetfvalues[i] )
-            outws = mantid.simpleapi.CloneWorkspace( mantid.mtd[workspaces[0]], OutputWorkspace=outworkspaces[i])
-            dsf.Save(outws) # overwrite dataY and dataE
+            outws = WorkspaceFactory.create(template)
+            for ihist in range(template.getNumberHistograms()):
+                outws.setX(ihist, template.readX(ihist))
+                outws.setY(ihist, intensities[i][ihist])
+                outws.setE(ihist, errors[i][ihist])
+            mantid.mtd.addOrReplace(outworkspaces[i], outws)
+        outgroup = self.getProperty('OutputGroup').value
+        if outgroup:
+            mantid.simpleapi.GroupWorkspaces(InputWorkspaces=outworkspaces, OutputWorkspace=outgroup)
+
+    def _get_channelgroup(self, workspaces, dsfs):
+        """
+        Returns the interpolators for the structure factors, reusing those of a previous call with the
+        same input workspaces, data and regression settings.
+        """
+        localregression = self.getProperty('LocalRegression').value
+        regressiontype = self.getProperty('RegressionType').value if localregression else None
+        windowlength = self.getProperty('RegressionWindow').value if localregression else 0
+        digest = hashlib.sha1()
+        for dsf in dsfs:
+            digest.update(np.ascontiguousarray(dsf.intensities).tobytes())
+            if dsf.errors is not None:
+                digest.update(np.ascontiguousarray(dsf.errors).tobytes())
+        key = (tuple(workspaces), tuple(dsf.fvalue for dsf in dsfs), tuple(dsf.errors is None for dsf in dsfs),
+               digest.hexdigest(), regressiontype, windowlength)
+        if key in _interpolator_cache:
+            _interpolator_cache.move_to_end(key)
+            return _interpolator_cache[key]
+
+        from dsfinterp.dsfgroup import DsfGroup
+        from dsfinterp.channelgroup import ChannelGroup
+        dsfgroup = DsfGroup()
+        for dsf in dsfs:
+            dsfgroup.InsertDsf(dsf)
+        channelgroup = ChannelGroup()
+        channelgroup.InitFromDsfGroup(dsfgroup)
+        if localregression:
+            channelgroup.InitializeInterpolator(running_regr_type=regressiontype, windowlength=windowlength)
+        else:
+            channelgroup.InitializeInterpolator(windowlength=0)
+
+        _interpolator_cache[key] = channelgroup
+        while len(_interpolator_cache) > _INTERPOLATOR_CACHE_SIZE:
+            _interpolator_cache.popitem(last=False)
+        return channelgroup
 
 
 #############################################################################################
@@ -10,7 +10,6 @@ import mantid.simpleapi as ms
 
 from LoadEmptyVesuvio import LoadEmptyVesuvio
 
-import copy
 import numpy as np
 import os
 import re
@@ -43,9 +42,8 @@ _LOGGING_ = False
 
 class LoadVesuvio(LoadEmptyVesuvio):
 
-    _ws_index = None
-    _spectrum_no = None
-    foil_map = None
+    _all_spectra = None
+    foil_maps = None
     _back_scattering = None
     _load_common_called = False
     _load_monitors = False
@@ -89,13 +87,11 @@ class LoadVesuvio(LoadEmptyVesuvio):
     _foil_out_norm_start = None
     _foil_out_norm_end = None
     sum1 = None
-    sum2 = None
-    sum3 = None
-    foil_thin = None
-    mon_out = None
-    mon_thin = None
-    foil_thick = None
-    mon_thick = None
+    _raw_y = None
+    _raw_mon_y = None
+    _foil_y = None
+    _foil_e = None
+    _mon_y = None
     foil_out = None
 
     def summary(self):
@@ -232,16 +228,15 @@ class LoadVesuvio(LoadEmptyVesuvio):
             self._setup_raw(all_spectra)
             self._create_foil_workspaces()
 
-            for ws_index, spectrum_no in enumerate(all_spectra):
-                self._ws_index, self._spectrum_no = ws_index, spectrum_no
-                self.foil_map = SpectraToFoilPeriodMap(self._nperiods)
-
-                self._integrate_periods()
-                self._sum_foil_periods()
-                self._normalise_by_monitor()
-                self._normalise_to_foil_out()
-                self._calculate_diffs()
-            # end of differencing loop
+            # Each stage operates on all spectra at once
+            self._all_spectra = np.array(all_spectra)
+            self._extract_raw_counts()
+            self._integrate_periods()
+            self._sum_foil_periods()
+            self._normalise_by_monitor()
+            self._normalise_to_foil_out()
+            self._calculate_diffs()
+            self._set_foil_out_data()
 
             ip_file = self.getPropertyValue(INST_PAR_PROP)
             if len(ip_file) > 0:
@@ -691,41 +686,43 @@ class LoadVesuvio(LoadEmptyVesuvio):
     def _is_fwd_scattering(self, spectrum_no):
         return self._forward_spectra_list[0] <= spectrum_no <= self._forward_spectra_list[-1]
 
+    def _extract_raw_counts(self):
+        """
+            Reads the counts of all periods of the raw data into arrays:
+            the data as spectra x periods x bins and the monitor, which is
+            shared by all spectra, as periods x bins
+        """
+        self._raw_y = np.stack([self._raw_grp[i].extractY() for i in range(self._nperiods)], axis=1)
+        self._raw_mon_y = np.array([self._raw_monitors[i].readY(self._mon_index) for i in range(self._nperiods)])
+
     def _integrate_periods(self):
         """
-            Calculates 2 arrays of sums, 1 per period, of the Y values from
+            Calculates 2 arrays of sums, 1 per spectrum and period, of the Y values from
             the raw data between:
                (a) period_sum1_start & period_sum1_end
                (b) period_sum2_start & period_sum2_end.
-            It also creates a 3rd blank array that will be filled by calculate_foil_counts_per_us.
-            Operates on the current workspace index
+            The foil map of each spectrum is ordered by its ratios of sum1 to sum2
         """
-        self.sum1 = np.zeros(self._nperiods)
-        self.sum2 = np.zeros(self._nperiods)
-        self.sum3 = np.zeros(3)
         #sumx_start/end values obtained from VESUVIO parameter file
         sum1_start,sum1_end = self._period_sum1_start, self._period_sum1_end
         sum2_start,sum2_end = self._period_sum2_start,self._period_sum2_end
         xvalues = self.pt_times # values of the raw_grp x axis
-        # Array of bin indexes corresponding to bins that lie within start/end range
-        sum1_indices = np.where((xvalues > sum1_start) & (xvalues < sum1_end))
-        sum2_indices = np.where((xvalues > sum2_start) & (xvalues < sum2_end))
-
-        wsindex = self._ws_index # The current spectra to examine
-        for i in range(self._nperiods):
-            # Gets the sum(1,2) of the yvalues at the bin indexs
-            yvalues = self._raw_grp[i].readY(wsindex)
-            self.sum1[i] = np.sum(yvalues[sum1_indices])
-            self.sum2[i] = np.sum(yvalues[sum2_indices])
-            if self.sum2[i] != 0.0:
-                self.sum1[i] /= self.sum2[i]
-
-        # Sort sum1 in increasing order and match the foil map
-        self.sum1 = self.foil_map.reorder(self.sum1)
+        # Bins that lie within start/end range
+        sum1_in_range = (xvalues > sum1_start) & (xvalues < sum1_end)
+        sum2_in_range = (xvalues > sum2_start) & (xvalues < sum2_end)
+
+        sum1 = np.sum(self._raw_y[:, :, sum1_in_range], axis=2)
+        sum2 = np.sum(self._raw_y[:, :, sum2_in_range], axis=2)
+        non_zero = sum2 != 0.0
+        sum1[non_zero] /= sum2[non_zero]
+
+        # Sort sum1 of each spectrum in increasing order and match its foil map
+        self.foil_maps = [SpectraToFoilPeriodMap(self._nperiods) for _ in self._all_spectra]
+        self.sum1 = np.array([foil_map.reorder(spectrum_sum1) for foil_map, spectrum_sum1 in zip(self.foil_maps, sum1)])
 
     def _create_foil_workspaces(self):
         """
-            Create the workspaces that will hold the foil out, thin & thick results
+            Create the workspace that will hold the result
             The output will be a point workspace
         """
         first_ws = self._raw_grp[0]
@@ -736,30 +733,26 @@ class LoadVesuvio(LoadEmptyVesuvio):
         # This will be used as the result workspace
         self.foil_out = WorkspaceFactory.create(first_ws, **data_kwargs)
         self.foil_out.setDistribution(True)
-        self.foil_thin = WorkspaceFactory.create(first_ws, **data_kwargs)
 
-        # Monitors will be a different size
-        first_monws = self._raw_monitors[0]
-        nmonitor_bins = first_monws.blocksize()
-        monitor_kwargs = copy.deepcopy(data_kwargs)
-        monitor_kwargs['XLength'] = nmonitor_bins
-        monitor_kwargs['YLength'] = nmonitor_bins
-
-        self.mon_out = WorkspaceFactory.create(first_monws, **monitor_kwargs)
-        self.mon_thin = WorkspaceFactory.create(first_monws, **monitor_kwargs)
+    def _foil_states(self):
+        """
+        Returns the indexes of the foil states that are measured: foil out, thin & thick foil
+        """
+        return [IOUT, ITHIN] if self._nperiods == 2 else [IOUT, ITHIN, ITHICK]
 
-        if self._nperiods == 2:
-            self.foil_thick = None
-            self.mon_thick = None
-        else:
-            self.foil_thick = WorkspaceFactory.create(first_ws, **data_kwargs)
-            self.mon_thick = WorkspaceFactory.create(first_monws, **monitor_kwargs)
+    def _get_group_indices(self, foil_periods):
+        """
+        Returns the indices in the raw data group of the given foil periods for every spectrum
+        @param foil_periods :: The period numbers of a foil state
+        @returns An array of shape spectra x periods
+        """
+        return np.array([foil_map.get_indices(spectrum_no, foil_periods)
+                         for foil_map, spectrum_no in zip(self.foil_maps, self._all_spectra)], dtype=int)
 
     def _sum_foil_periods(self):
         """
         Sums the counts in the different periods to get the total counts
-        for the foil out, thin foil & thick foil states for the back scattering detectors for the
-        current workspace index & spectrum number
+        for the foil out, thin foil & thick foil states for all spectra
         """
         foil_out_periods, foil_thin_periods, foil_thick_periods = self._get_foil_periods()
 
@@ -771,14 +764,19 @@ class LoadVesuvio(LoadEmptyVesuvio):
             # None indicates same as standard foil
             mon_out_periods, mon_thin_periods, mon_thick_periods = (None,None,None)
 
+        nspectra, ndata_bins = len(self._all_spectra), self._raw_y.shape[2]
+        # Counts and errors of the foil out, thin & thick foil states, stored as states x spectra x bins
+        self._foil_y = np.zeros((3, nspectra, ndata_bins))
+        self._foil_e = np.zeros((3, nspectra, ndata_bins))
+        self._mon_y = np.zeros((3, nspectra, self._raw_mon_y.shape[1]))
+
         # Foil out
-        self._sum_foils(self.foil_out, self.mon_out, IOUT, foil_out_periods, mon_out_periods)
+        self._sum_foils(IOUT, foil_out_periods, mon_out_periods)
         # Thin foil
-        self._sum_foils(self.foil_thin, self.mon_thin, ITHIN, foil_thin_periods, mon_thin_periods)
+        self._sum_foils(ITHIN, foil_thin_periods, mon_thin_periods)
         # Thick foil
         if foil_thick_periods is not None:
-            self._sum_foils(self.foil_thick, self.mon_thick, ITHICK,
-                            foil_thick_periods, mon_thick_periods)
+            self._sum_foils(ITHICK, foil_thick_periods, mon_thick_periods)
 
     def _get_foil_periods(self):
         """
@@ -807,170 +805,141 @@ class LoadVesuvio(LoadEmptyVesuvio):
 
         return foil_out_periods, foil_thin_periods, foil_thick_periods
 
-    def _sum_foils(self, foil_ws, mon_ws, sum_index, foil_periods, mon_periods=None):
+    def _sum_foils(self, sum_index, foil_periods, mon_periods=None):
         """
-        Sums the counts from the given foil periods in the raw data group
-        @param foil_ws :: The workspace that will receive the summed counts
-        @param mon_ws :: The monitor workspace that will receive the summed monitor counts
-        @param sum_index :: An index into the sum3 array where the integrated counts will be
-                            accumulated
+        Sums the counts from the given foil periods in the raw data for all spectra
+        @param sum_index :: The index of the foil state in the arrays that receive the summed counts
         @param foil_periods :: The period numbers that contribute to this sum
         @param mon_periods :: The period numbers of the monitors that contribute to this monitor sum
                               (if None then uses the foil_periods)
         """
-        # index that corresponds to workspace in group based on foil state
-        raw_grp_indices = self.foil_map.get_indices(self._spectrum_no, foil_periods)
-        wsindex = self._ws_index        # Spectra number - monitors(2) - 1
-        outY = foil_ws.dataY(wsindex)   # Initialise outY list to correct length with 0s
-        delta_t = self.delta_t          # Bin width
-        for grp_index in raw_grp_indices:
-            raw_ws = self._raw_grp[grp_index]
-            outY += raw_ws.readY(wsindex)
-            self.sum3[sum_index] += self.sum2[grp_index]
+        # indices that correspond to workspaces in group based on foil state, for each spectrum
+        raw_grp_indices = self._get_group_indices(foil_periods)
+        spectra = np.arange(len(self._all_spectra))[:, np.newaxis]
+        counts = np.sum(self._raw_y[spectra, raw_grp_indices], axis=1)
 
         # Errors are calculated from counts
-        eout = np.sqrt(outY)/delta_t
-        foil_ws.setE(wsindex,eout)
-        outY /= delta_t
+        delta_t = self.delta_t          # Bin width
+        self._foil_e[sum_index] = np.sqrt(counts)/delta_t
+        self._foil_y[sum_index] = counts/delta_t
 
         # monitors
         if mon_periods is None:
             mon_periods = foil_periods
-        raw_grp_indices = self.foil_map.get_indices(self._spectrum_no, mon_periods)
-        outY = mon_ws.dataY(wsindex)
-        for grp_index in raw_grp_indices:
-            raw_ws = self._raw_monitors[grp_index]
-            outY += raw_ws.readY(self._mon_index)
-
-        outY /= self.delta_tmon
+        raw_grp_indices = self._get_group_indices(mon_periods)
+        self._mon_y[sum_index] = np.sum(self._raw_mon_y[raw_grp_indices], axis=1)/self.delta_tmon
 
     def _normalise_by_monitor(self):
         """
             Normalises by the monitor counts between mon_norm_start & mon_norm_end
-            instrument parameters for the current workspace index
-        """
-        indices_in_range = np.where((self.mon_pt_times >= self._mon_norm_start) & (self.mon_pt_times < self._mon_norm_end))
-
-        wsindex = self._ws_index
-        # inner function to apply normalization
-
-        def monitor_normalization(foil_ws, mon_ws):
-            """
-            Applies monitor normalization to the given foil spectrum from the given
-            monitor spectrum.
-            """
-            mon_values = mon_ws.readY(wsindex)
-            mon_values_sum = np.sum(mon_values[indices_in_range])
-            foil_state = foil_ws.dataY(wsindex)
-            foil_state *= (self._mon_scale/mon_values_sum)
-            err = foil_ws.dataE(wsindex)
-            err *= (self._mon_scale/mon_values_sum)
-
-        monitor_normalization(self.foil_out, self.mon_out)
-        monitor_normalization(self.foil_thin, self.mon_thin)
-        if self._nperiods != 2:
-            monitor_normalization(self.foil_thick, self.mon_thick)
+            instrument parameters for all spectra
+        """
+        in_range = (self.mon_pt_times >= self._mon_norm_start) & (self.mon_pt_times < self._mon_norm_end)
+
+        states = self._foil_states()
+        mon_values_sum = np.sum(self._mon_y[states, :, :][:, :, in_range], axis=2)
+        norm_factors = (self._mon_scale/mon_values_sum)[:, :, np.newaxis]
+        self._foil_y[states, :, :] *= norm_factors
+        self._foil_e[states, :, :] *= norm_factors
 
     def _normalise_to_foil_out(self):
         """
             Normalises the thin/thick foil counts to the
             foil out counts between (foil_out_norm_start,foil_out_norm_end)
-            for the current workspace index
-        """
-        # Indices where the given condition is true
-        range_indices = np.where((self.pt_times >= self._foil_out_norm_start) & (self.pt_times < self._foil_out_norm_end))
-        wsindex = self._ws_index
-        cout = self.foil_out.readY(wsindex)
-        sum_out = np.sum(cout[range_indices])
-
-        def normalise_to_out(foil_ws, foil_type):
-            values = foil_ws.dataY(wsindex)
-            sum_values = np.sum(values[range_indices])
-            if sum_values == 0.0:
-                self.getLogger().warning("No counts in %s foil spectrum %d." % (foil_type,self._spectrum_no))
-                sum_values = 1.0
-            norm_factor = (sum_out/sum_values)
-            values *= norm_factor
-            errors = foil_ws.dataE(wsindex)
-            errors *= norm_factor
-
-        normalise_to_out(self.foil_thin, "thin")
+            for all spectra
+        """
+        in_range = (self.pt_times >= self._foil_out_norm_start) & (self.pt_times < self._foil_out_norm_end)
+        sum_out = np.sum(self._foil_y[IOUT][:, in_range], axis=1)
+
+        def normalise_to_out(sum_index, foil_type):
+            sum_values = np.sum(self._foil_y[sum_index][:, in_range], axis=1)
+            no_counts = sum_values == 0.0
+            for spectrum_no in self._all_spectra[no_counts]:
+                self.getLogger().warning("No counts in %s foil spectrum %d." % (foil_type, spectrum_no))
+            sum_values[no_counts] = 1.0
+            norm_factors = (sum_out/sum_values)[:, np.newaxis]
+            self._foil_y[sum_index] *= norm_factors
+            self._foil_e[sum_index] *= norm_factors
+
+        normalise_to_out(ITHIN, "thin")
         if self._nperiods != 2:
-            normalise_to_out(self.foil_thick, "thick")
+            normalise_to_out(ITHICK, "thick")
 
     def _calculate_diffs(self):
         """
             Based on the DifferenceType property, calculate the final output
-            spectra for the current workspace index
+            spectra, which are stored as the foil out counts
         """
-        wsindex = self._ws_index
         if self._diff_opt == "SingleDifference":
-            self._calculate_thin_difference(wsindex)
+            self._calculate_thin_difference()
         elif self._diff_opt == "DoubleDifference":
-            self._calculate_double_difference(wsindex)
+            self._calculate_double_difference()
         elif self._diff_opt == "ThickDifference":
-            self._calculate_thick_difference(wsindex)
+            self._calculate_thick_difference()
         else:
             raise RuntimeError("Unknown difference type requested: %d" % self._diff_opt)
 
-        self.foil_out.setX(wsindex, self.pt_times)
-
-    def _calculate_thin_difference(self, ws_index):
+    def _calculate_thin_difference(self):
         """
            Calculate difference between the foil out & thin foil
-           states for the given index. The foil out workspace
-           will become the output workspace
-            @param ws_index :: The current workspace index
+           states. The foil out counts will become the output
         """
         # Counts
-        cout = self.foil_out.dataY(ws_index)
+        cout = self._foil_y[IOUT]
         if self._spectra_type == BACKWARD:
-            cout -= self.foil_thin.readY(ws_index)
+            cout -= self._foil_y[ITHIN]
         else:
             cout *= -1.0
-            cout += self.foil_thin.readY(ws_index)
+            cout += self._foil_y[ITHIN]
 
         # Errors
-        eout = self.foil_out.dataE(ws_index)
-        ethin = self.foil_thin.readE(ws_index)
+        eout = self._foil_e[IOUT]
+        ethin = self._foil_e[ITHIN]
         np.sqrt((eout**2 + ethin**2), eout) # The second argument makes it happen in place
 
-    def _calculate_double_difference(self, ws_index):
+    def _calculate_double_difference(self):
         """
             Calculates the difference between the foil out, thin & thick foils
             using the mixing parameter beta. The final counts are:
                 y = c_out(i)*(1-\beta) -c_thin(i) + \beta*c_thick(i).
             The output will be stored in cout
-            @param ws_index :: The current index being processed
         """
-        cout = self.foil_out.dataY(ws_index)
+        cout = self._foil_y[IOUT]
         one_min_beta = (1. - self._beta)
         cout *= one_min_beta
-        cout -= self.foil_thin.readY(ws_index)
-        cout += self._beta*self.foil_thick.readY(ws_index)
+        cout -= self._foil_y[ITHIN]
+        cout += self._beta*self._foil_y[ITHICK]
 
         # Errors
-        eout = self.foil_out.dataE(ws_index)
-        ethin = self.foil_thin.readE(ws_index)
-        ethick = self.foil_thick.readE(ws_index)
+        eout = self._foil_e[IOUT]
+        ethin = self._foil_e[ITHIN]
+        ethick = self._foil_e[ITHICK]
         # The second argument makes it happen in place
         np.sqrt((one_min_beta*eout)**2 + ethin**2 + (self._beta**2)*ethick**2, eout)
 
-    def _calculate_thick_difference(self, ws_index):
+    def _calculate_thick_difference(self):
         """
             Calculates the difference between the foil out & thick foils
             The output will be stored in cout
-            @param ws_index :: The current index being processed
         """
         # Counts
-        cout = self.foil_out.dataY(ws_index)
-        cout -= self.foil_thick.readY(ws_index)
+        cout = self._foil_y[IOUT]
+        cout -= self._foil_y[ITHICK]
 
         # Errors
-        eout = self.foil_out.dataE(ws_index)
-        ethick = self.foil_thick.readE(ws_index)
+        eout = self._foil_e[IOUT]
+        ethick = self._foil_e[ITHICK]
         np.sqrt((eout**2 + ethick**2), eout) # The second argument makes it happen in place
 
+    def _set_foil_out_data(self):
+        """
+            Writes the final counts & errors of all spectra to the output workspace
+        """
+        for ws_index in range(len(self._all_spectra)):
+            self.foil_out.setX(ws_index, self.pt_times)
+            self.foil_out.setY(ws_index, self._foil_y[IOUT, ws_index])
+            self.foil_out.setE(ws_index, self._foil_e[IOUT, ws_index])
+
     def _sum_all_spectra(self):
         """
             Sum requested sets of spectra together
@@ -139,6 +139,13 @@ class MuonMaxent(PythonAlgorithm):
                 direction=Direction.Output,
                 optional=PropertyMode.Optional),
             doc="Convergence of phases (optional)")
+        self.declareProperty(
+            ITableWorkspaceProperty(
+                "ConvergenceTable",
+                "",
+                direction=Direction.Output,
+                optional=PropertyMode.Optional),
+            doc="Test statistic, entropy, chi-squared and time taken for each iteration (optional)")
 
     def validateInputs(self):
         issues = dict()
@@ -446,6 +453,7 @@ class MuonMaxent(PythonAlgorithm):
             deadDetectors,
             OuterIter,
             filePHASE)
+        convergence = None if self.getProperty("ConvergenceTable").isDefault else []
         # do the work! Lots to pass in and out
         (MISSCHANNELS_mm, RUNDATA_fnorm, RUNDATA_hists, MAXPAGE_f, FAC_factor, FAC_facfake, FAC_ratio,
          DETECT_a, DETECT_b, DETECT_c, DETECT_d, DETECT_e, PULSESHAPE_convol, SENSE_taud, FASE_phase, SAVETIME_ngo,
@@ -454,7 +462,7 @@ class MuonMaxent(PythonAlgorithm):
             CHANNELS_itotal, RUNDATA_res, RUNDATA_frames, GROUPING_group, DATALL_rdata,
             FAC_factor, SENSE_taud, MAXPAGE_n, filePHASE, PULSES_def, PULSES_npulse,
             FLAGS_fitdead, FLAGS_fixphase, SAVETIME_i2,
-            OuterIter, InnerIter, mylog, prog, phaseconvWS, TZERO_fine, deadDetectors)
+            OuterIter, InnerIter, mylog, prog, phaseconvWS, TZERO_fine, deadDetectors, convergence)
         #
         fperchan = 1. / (RUNDATA_res * float(POINTS_npts) * 2.)
         fchan = np.linspace(0.0, MAXPAGE_n * fperchan / 135.5e-4, MAXPAGE_n, endpoint=False)
@@ -527,6 +535,16 @@ class MuonMaxent(PythonAlgorithm):
             self.setProperty("ReconstructedSpectra", recSpec)
         if phaseconvWS:
             self.setProperty("PhaseConvergenceTable", phaseconvWS)
+        # per iteration convergence report
+        if convergence is not None:
+            convTable = WorkspaceFactory.createTable()
+            convTable.addColumn("int", "Cycle", 1)
+            convTable.addColumn("int", "Iteration", 1)
+            for name in ["Test", "Entropy", "ChiSquaredTarget", "ChiSquared", "SpectrumSum", "Time"]:
+                convTable.addColumn("double", name, 2)
+            for row in convergence:
+                convTable.addRow([int(row[0]), int(row[1])] + [float(value) for value in row[2:]])
+            self.setProperty("ConvergenceTable", convTable)
         # final converged Factor
         self.setProperty("Factor", FAC_factor)
         # final chisquared?
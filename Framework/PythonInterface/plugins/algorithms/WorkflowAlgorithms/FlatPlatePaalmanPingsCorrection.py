@@ -240,15 +240,9 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
                                                    self._can_density,
                                                    self._can_number_density_unit)
 
-        # Holders for the corrected data
-        data_ass = []
-        data_assc = []
-        data_acsc = []
-        data_acc = []
-
         self._get_angles()
         num_angles = len(self._angles)
-        workflow_prog = Progress(self, start=0.2, end=0.8, nreports=num_angles * 2)
+        workflow_prog = Progress(self, start=0.2, end=0.8, nreports=2)
 
         # Check sample input
         sam_material = mtd[self._sample_ws_name].sample().getMaterial()
@@ -278,17 +272,16 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
                     "A can workspace was given but the can back thickness was not given. Continuing but no absorption for can back"
                     " will be computed.")
 
-        for angle_idx in range(num_angles):
-            workflow_prog.report('Running flat correction for angle %s' % angle_idx)
-            angle = self._angles[angle_idx]
-            (ass, assc, acsc, acc) = self._flat_abs(angle)
+        # All the angles are corrected at once
+        workflow_prog.report('Running flat correction for %d angles' % num_angles)
+        (ass, assc, acsc, acc) = self._flat_abs(self._angles)
 
-            logger.information('Angle %d: %f successful' % (angle_idx + 1, self._angles[angle_idx]))
-            workflow_prog.report('Appending data for angle %s' % angle_idx)
-            data_ass = np.append(data_ass, ass)
-            data_assc = np.append(data_assc, assc)
-            data_acsc = np.append(data_acsc, acsc)
-            data_acc = np.append(data_acc, acc)
+        logger.information('Angles 1 to %d successful' % num_angles)
+        workflow_prog.report('Appending data for all angles')
+        data_ass = ass.ravel()
+        data_assc = assc.ravel()
+        data_acsc = acsc.ravel()
+        data_acc = acc.ravel()
 
         log_prog = Progress(self, start=0.8, end=1.0, nreports=8)
 
@@ -554,7 +547,7 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
 
     # ------------------------------------------------------------------------------
 
-    def _flat_abs(self, angle):
+    def _flat_abs(self, angles):
         """
         FlatAbs - calculate flat plate absorption factors
 
@@ -567,36 +560,32 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
             Open-Source Implementation libabsco, and Why it Should be Used with Caution',
             http://apps.jcns.fz-juelich.de/doku/sc/_media/abs00.pdf
 
-        @return: A tuple containing the attenuations;
+        @param angles: the detector angles in degrees
+        @return: A tuple containing the attenuations, each of shape (number of angles, number of wavelengths);
             1) scattering and absorption in sample,
             2) scattering in sample and absorption in sample and container
             3) scattering in container and absorption in sample and container,
             4) scattering and absorption in container.
         """
 
+        # Detectors at the same angle have the same attenuations, so each angle is only calculated once
+        unique_angles, angle_index = np.unique(np.asarray(angles, dtype=float), return_inverse=True)
+
         # self._sample_angle is the normal to the sample surface, i.e.
         # self._sample_angle = 0 means that the sample is perpendicular
         # to the incident beam
         alpha = (90.0 + self._sample_angle) * self.PICONV
-        theta = angle * self.PICONV
+        theta = unique_angles[:, np.newaxis] * self.PICONV
         salpha = np.sin(alpha)
-        if theta > (alpha + np.pi):
-            stha = np.sin(abs(theta-alpha-np.pi))
-        else:
-            stha = np.sin(abs(theta-alpha))
+        stha = np.where(theta > (alpha + np.pi), np.sin(np.abs(theta-alpha-np.pi)), np.sin(np.abs(theta-alpha)))
+        transmission = (theta < alpha) | (theta > (alpha + np.pi))
 
-        nlam = len(self._wavelengths)
+        shape = (len(unique_angles), len(self._wavelengths))
 
-        ass = np.ones(nlam)
-        assc = np.ones(nlam)
-        acsc = np.ones(nlam)
-        acc = np.ones(nlam)
-
-        # Scattering in direction of slab --> calculation is not reliable
-        # Default to 1 for everything
-        # Tolerance is 0.001 rad ~ 0.06 deg
-        if abs(theta-alpha) < 0.001:
-            return ass, assc, acsc, acc
+        ass = np.ones(shape)
+        assc = np.ones(shape)
+        acsc = np.ones(shape)
+        acc = np.ones(shape)
 
         sample = mtd[self._sample_ws_name].sample()
         sam_material = sample.getMaterial()
@@ -604,22 +593,31 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
         # List of wavelengths
         waveslengths = np.array(self._wavelengths)
 
-        sst = np.vectorize(self._self_shielding_transmission)
-        ssr = np.vectorize(self._self_shielding_reflection)
+        # Angles in the plane of the slab divide by zero here, they are reset below
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            ki_s, kf_s = 0, 0
+            if self._has_sample_in:
+                ki_s, kf_s, ass = self._sample_cross_section_calc(sam_material, waveslengths, stha, salpha, transmission)
 
-        ki_s, kf_s = 0, 0
-        if self._has_sample_in:
-            ki_s, kf_s, ass = self._sample_cross_section_calc(sam_material, waveslengths, theta, alpha, stha, salpha, sst, ssr)
+            # Container --> Acc, Assc, Acsc
+            if self._use_can:
+                ass, assc, acsc, acc = self._can_cross_section_calc(waveslengths, stha, salpha, transmission, ki_s, kf_s,
+                                                                    ass, acc)
 
-        # Container --> Acc, Assc, Acsc
-        if self._use_can:
-            ass, assc, acsc, acc = self._can_cross_section_calc(waveslengths, theta, alpha, stha, salpha, ki_s, kf_s, ass, acc, sst, ssr)
+        factors = [np.array(np.broadcast_to(factor, shape)) for factor in (ass, assc, acsc, acc)]
 
-        return ass, assc, acsc, acc
+        # Scattering in direction of slab --> calculation is not reliable
+        # Default to 1 for everything
+        # Tolerance is 0.001 rad ~ 0.06 deg
+        in_slab = np.abs(theta[:, 0]-alpha) < 0.001
+        for factor in factors:
+            factor[in_slab] = 1.0
+
+        return tuple(factor[angle_index] for factor in factors)
 
     # ------------------------------------------------------------------------------
 
-    def _sample_cross_section_calc(self, sam_material, waves, theta, alpha, stha, salpha, sst, ssr):
+    def _sample_cross_section_calc(self, sam_material, waves, stha, salpha, transmission):
         # Sample cross section (value for each of the wavelengths and for E = Efixed)
         sample_x_section = (sam_material.totalScatterXSection()
                             + sam_material.absorbXSection() * waves / self.TABULATED_WAVELENGTH) * self._sample_density
@@ -638,18 +636,13 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
             ki_s, kf_s = self._calc_ki_kf(waves, self._sample_thickness, salpha, stha,
                                           sample_x_section, sample_x_section_efixed)
 
-        if theta < alpha or theta > (alpha + np.pi):
-            # transmission case
-            ass = sst(ki_s, kf_s)
-        else:
-            # reflection case
-            ass = ssr(ki_s, kf_s)
+        ass = self._self_shielding(ki_s, kf_s, transmission)
 
         return ki_s, kf_s, ass
 
     # ------------------------------------------------------------------------------
 
-    def _can_cross_section_calc(self, wavelengths, theta, alpha, stha, salpha, ki_s, kf_s, ass, acc, sst, ssr):
+    def _can_cross_section_calc(self, wavelengths, stha, salpha, transmission, ki_s, kf_s, ass, acc):
         can_sample = mtd[self._can_ws_name].sample()
         can_material = can_sample.getMaterial()
 
@@ -669,35 +662,31 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
         if self._has_can_front_in:
             # Front container --> Acc1
             ki_c1, kf_c1, acc1 = self._can_thickness_calc(can_x_section, can_x_section_efixed, self._can_front_thickness, wavelengths,
-                                                          theta, alpha, stha, salpha, ssr, sst)
+                                                          stha, salpha, transmission)
         if self._has_can_back_in:
             # Back container --> Acc2
             ki_c2, kf_c2, acc2 = self._can_thickness_calc(can_x_section, can_x_section_efixed, self._can_back_thickness, wavelengths,
-                                                          theta, alpha, stha, salpha, ssr, sst)
+                                                          stha, salpha, transmission)
 
         # Attenuation due to passage by other layers (sample or container)
-        if theta < alpha or theta > (alpha + np.pi):  # transmission case
-            assc, acsc, acc = self._container_transmission_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c2, ass)
-        else:  # reflection case
-            assc, acsc, acc = self._container_reflection_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c1, ass)
+        assc_t, acsc_t, acc_t = self._container_transmission_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c2, ass)
+        assc_r, acsc_r, acc_r = self._container_reflection_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c1, ass)
+        assc = np.where(transmission, assc_t, assc_r)
+        acsc = np.where(transmission, acsc_t, acsc_r)
+        acc = np.where(transmission, acc_t, acc_r)
 
         return ass, assc, acsc, acc
 
     # ------------------------------------------------------------------------------
 
-    def _can_thickness_calc(self, can_x_section, can_x_section_efixed, can_thickness, wavelengths, theta, alpha, stha, salpha, ssr, sst):
+    def _can_thickness_calc(self, can_x_section, can_x_section_efixed, can_thickness, wavelengths, stha, salpha, transmission):
         if self._emode == 'Efixed':
             ki = can_x_section_efixed * can_thickness / salpha
             kf = can_x_section_efixed * can_thickness / stha
         else:
             ki, kf = self._calc_ki_kf(wavelengths, can_thickness, salpha, stha, can_x_section, can_x_section_efixed)
 
-        if theta < alpha or theta > (alpha + np.pi):
-            # transmission case
-            acc = sst(ki, kf)
-        else:
-            # reflection case
-            acc = ssr(ki, kf)
+        acc = self._self_shielding(ki, kf, transmission)
 
         return ki, kf, acc
 
@@ -774,11 +763,17 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
 
     # ------------------------------------------------------------------------------
 
+    def _self_shielding(self, ki, kf, transmission):
+        # transmission case where transmission is True, reflection case elsewhere
+        return np.where(transmission, self._self_shielding_transmission(ki, kf), self._self_shielding_reflection(ki, kf))
+
+    # ------------------------------------------------------------------------------
+
     def _self_shielding_transmission(self, ki, kf):
-        if abs(ki-kf) < 1.0e-3:
-            return np.exp(-ki) * ( 1.0 - 0.5*(kf-ki) + (kf-ki)**2/12.0 )
-        else:
-            return (np.exp(-kf)-np.exp(-ki)) / (ki-kf)
+        small_difference = np.abs(ki-kf) < 1.0e-3
+        with np.errstate(divide='ignore', invalid='ignore'):
+            difference = (np.exp(-kf)-np.exp(-ki)) / (ki-kf)
+        return np.where(small_difference, np.exp(-ki) * ( 1.0 - 0.5*(kf-ki) + (kf-ki)**2/12.0 ), difference)
 
     # ------------------------------------------------------------------------------
 
@@ -799,8 +794,9 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
         elif self._emode == 'Indirect':
             ki = np.copy(x_section)
             kf *= x_section_efixed
-        ki *= (thickness / sinangle1)
-        kf *= (thickness / sinangle2)
+        # sinangle2 may be an array of one value per angle, giving kf for every angle and wavelength
+        ki = ki * (thickness / sinangle1)
+        kf = kf * (thickness / sinangle2)
         return ki, kf
 
     # ------------------------------------------------------------------------------
@@ -0,0 +1,306 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import re
+import numpy as np
+
+'''
+This file contains the trajectory analysis shared by VelocityAutoCorrelations,
+VelocityCrossCorrelations, AngularAutoCorrelationsSingleAxis and
+AngularAutoCorrelationsTwoAxes.
+
+Trajectories are nMoldyn/MMTK netCDF files. The ``configuration`` variable
+(time steps x particles x dimensions) is read in blocks of particles, each
+block being streamed in chunks of time steps, so that the whole trajectory
+is never held in memory. Correlations are evaluated with FFTs
+(Wiener-Khinchin theorem) for all particles of a block at once and are
+identical to numpy.correlate(u, v, "same") divided by the number of
+overlapping time steps.
+'''
+
+# Number of time steps read from the trajectory file at once
+TIME_CHUNK_SIZE = 1000
+
+# Approximate memory (bytes) used for the Fourier transforms of one block of particles
+BLOCK_MEMORY = 256 * 1024**2
+
+# Particle descriptions have the form A('h12',345): species and index of the particle
+_PARTICLE_PATTERN = re.compile(r"A\('([a-z]+)\d+',(\d+)")
+
+
+def get_description(trajectory):
+    '''
+    Returns the description of the trajectory as a single string.
+    '''
+    return np.asarray(trajectory.variables["description"][:]).tobytes().decode('UTF-8')
+
+
+def parse_particles(description):
+    '''
+    Finds the atomic species of every particle in the trajectory description.
+
+    :param description: description string returned by get_description
+    :returns: list of species in order of first appearance and an array with
+              the index (in that list) of the species of each particle, ordered by particle id
+    '''
+    matches = _PARTICLE_PATTERN.findall(description)
+
+    elements = list(dict.fromkeys(element for element, _ in matches))
+    element_index = {element: index for index, element in enumerate(elements)}
+
+    species = np.empty(len(matches), dtype=int)
+    species[[int(particle_id) for _, particle_id in matches]] = [element_index[element] for element, _ in matches]
+
+    return elements, species
+
+
+def parse_molecules(description):
+    '''
+    Finds the particles belonging to each molecule in the trajectory description.
+
+    :param description: description string returned by get_description
+    :returns: list with an array of particle ids for each molecule
+    '''
+    # The first item contains the initialisation of the description, not a molecule
+    return [np.array([int(particle_id) for _, particle_id in _PARTICLE_PATTERN.findall(molecule)], dtype=int)
+            for molecule in description.split("AC")[1:]]
+
+
+def get_box_tensors(trajectory, scale=1.0):
+    '''
+    Returns the simulation box at each time step as 3x3 tensors.
+
+    :param trajectory: netCDF trajectory
+    :param scale: factor applied to the box vectors (e.g. for nm to Angstrom)
+    :returns: array of shape (time steps, 3, 3)
+    '''
+    n_timesteps = trajectory.variables["configuration"].shape[0]
+    box_size = np.asarray(trajectory.variables["box_size"][:n_timesteps], dtype=float)
+
+    return scale * box_size.reshape((n_timesteps, 3, 3))
+
+
+def read_configuration(configuration, particles, time_chunk_size=TIME_CHUNK_SIZE):
+    '''
+    Reads the coordinates of a subset of particles for all time steps, streaming
+    the configuration variable in chunks of time steps.
+
+    :param configuration: netCDF configuration variable, shape (time steps, particles, dimensions)
+    :param particles: slice or array of particle ids
+    :param time_chunk_size: number of time steps read at once
+    :returns: array of shape (particles, time steps, dimensions)
+    '''
+    n_timesteps, _, n_dimensions = configuration.shape
+    n_particles = len(np.arange(configuration.shape[1])[particles])
+
+    coordinates = np.empty((n_particles, n_timesteps, n_dimensions))
+    for start in range(0, n_timesteps, time_chunk_size):
+        stop = min(start + time_chunk_size, n_timesteps)
+        coordinates[:, start:stop] = np.swapaxes(configuration[start:stop][:, particles], 0, 1)
+
+    return coordinates
+
+
+def minimum_image(vectors, box_tensors):
+    '''
+    Wraps vectors into the simulation box (minimum image convention, assumes an orthorhombic box).
+
+    :param vectors: array of shape (..., time steps, 3)
+    :param box_tensors: array of shape (time steps, 3, 3)
+    '''
+    box_diagonal = np.diagonal(box_tensors, axis1=1, axis2=2)
+    scaled = vectors / box_diagonal
+
+    return (scaled - np.round(scaled)) * box_diagonal
+
+
+def unwrapped_velocities(coordinates, box_tensors):
+    '''
+    Evaluates velocities by central finite differences of the unwrapped coordinates.
+
+    The velocity at the last time step is set to zero.
+
+    :param coordinates: array of shape (particles, time steps, 3)
+    :param box_tensors: array of shape (time steps, 3, 3)
+    :returns: array of shape (particles, time steps - 1, 3) in Cartesian coordinates
+    '''
+    # Scaled coordinates (assumes orthorhombic simulation box)
+    scaled_coords = coordinates / np.diagonal(box_tensors, axis1=1, axis2=2)
+
+    # Unwrap the displacements between consecutive time steps
+    steps = np.diff(scaled_coords, axis=1)
+    steps -= np.round(steps)
+
+    velocities = np.zeros(steps.shape)
+    velocities[:, :-1] = (steps[:, :-1] + steps[:, 1:]) / 2.0
+
+    # Transform velocities back to Cartesian coordinates at each time step
+    return np.einsum('tij,ptj->pti', box_tensors[1:], velocities)
+
+
+def normalise(vectors):
+    '''
+    Returns vectors divided by their length.
+    '''
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _fft_length(n):
+    # Zero-padding to at least 2n - 1 points avoids circular wrap-around of the correlation
+    return 1 << (2 * n - 2).bit_length()
+
+
+def _particle_blocks(n_particles, fft_length):
+    # Each particle needs fft_length / 2 + 1 complex values for each of 3 dimensions
+    block_size = max(1, int(BLOCK_MEMORY // ((fft_length // 2 + 1) * 3 * 16)))
+    return [slice(start, min(start + block_size, n_particles)) for start in range(0, n_particles, block_size)]
+
+
+def _same_correlation(spectra, n, fft_length):
+    '''
+    Converts cross-spectra to correlations equivalent to numpy.correlate(u, v, "same")
+    divided by the number of overlapping time steps at each lag.
+
+    :param spectra: array of shape (..., fft_length // 2 + 1)
+    :param n: length of the correlated time series
+    '''
+    circular = np.fft.irfft(spectra, n=fft_length, axis=-1)
+    lags = np.arange(-(n // 2), n - n // 2)
+
+    return circular[..., lags % fft_length] / (n - np.abs(lags))
+
+
+def auto_correlation_sum(vectors):
+    '''
+    Sum of the auto-correlations of a set of time-dependent 3-vectors.
+
+    :param vectors: array of shape (items, time steps, 3)
+    :returns: array of shape (time steps,)
+    '''
+    n = vectors.shape[1]
+    fft_length = _fft_length(n)
+
+    spectrum = np.zeros(fft_length // 2 + 1)
+    for block in _particle_blocks(vectors.shape[0], fft_length):
+        transforms = np.fft.rfft(vectors[block], n=fft_length, axis=1)
+        spectrum += np.sum(transforms.real**2 + transforms.imag**2, axis=(0, 2))
+
+    return _same_correlation(spectrum, n, fft_length)
+
+
+def velocity_auto_correlations(trajectory, species, n_species, box_tensors):
+    '''
+    Sums the velocity auto-correlations of the particles of each species.
+
+    :param trajectory: netCDF trajectory
+    :param species: species index of each particle (see parse_particles)
+    :param n_species: number of species
+    :param box_tensors: array of shape (time steps, 3, 3) (see get_box_tensors)
+    :returns: array of shape (species, time steps - 1)
+    '''
+    configuration = trajectory.variables["configuration"]
+    n = configuration.shape[0] - 1
+    fft_length = _fft_length(n)
+
+    spectra = np.zeros((n_species, fft_length // 2 + 1))
+    for block in _particle_blocks(len(species), fft_length):
+        velocities = unwrapped_velocities(read_configuration(configuration, block), box_tensors)
+        transforms = np.fft.rfft(velocities, n=fft_length, axis=1)
+        np.add.at(spectra, species[block], np.sum(transforms.real**2 + transforms.imag**2, axis=2))
+
+    return _same_correlation(spectra, n, fft_length)
+
+
+def velocity_cross_correlations(trajectory, species, n_species, box_tensors):
+    '''
+    Sums the velocity cross-correlations of pairs of different particles by pair of species.
+
+    For species k < l the correlation of every particle of species k with every particle of
+    species l is summed. For k == l the correlation of particle i with particle j is summed
+    over all pairs i < j. Sums over particles are taken in Fourier space, so the cost scales
+    with the number of particles rather than the number of pairs.
+
+    :param trajectory: netCDF trajectory
+    :param species: species index of each particle (see parse_particles)
+    :param n_species: number of species
+    :param box_tensors: array of shape (time steps, 3, 3) (see get_box_tensors)
+    :returns: array of shape (species, species, time steps - 1); only the upper triangle is filled
+    '''
+    configuration = trajectory.variables["configuration"]
+    n = configuration.shape[0] - 1
+    fft_length = _fft_length(n)
+    n_frequencies = fft_length // 2 + 1
+
+    # Sum of the transformed velocities of the particles already processed, by species
+    later_transforms = np.zeros((n_species, n_frequencies, 3), dtype=complex)
+    spectra = np.zeros((n_species, n_species, n_frequencies), dtype=complex)
+
+    # Blocks are processed from the last particle to the first so that the transforms of all
+    # particles with a larger id are known for the same-species pairs
+    for block in reversed(_particle_blocks(len(species), fft_length)):
+        velocities = unwrapped_velocities(read_configuration(configuration, block), box_tensors)
+        transforms = np.fft.rfft(velocities, n=fft_length, axis=1)
+        block_species = species[block]
+
+        for k in np.unique(block_species):
+            species_transforms = transforms[block_species == k]
+
+            # For each particle, the sum of transforms of same-species particles with larger ids
+            suffix_sums = np.cumsum(species_transforms[::-1], axis=0)[::-1]
+            larger_ids = np.empty_like(species_transforms)
+            larger_ids[:-1] = suffix_sums[1:]
+            larger_ids[-1] = 0.0
+            larger_ids += later_transforms[k]
+
+            spectra[k, k] += np.sum(species_transforms * np.conj(larger_ids), axis=(0, 2))
+            later_transforms[k] += suffix_sums[0]
+
+    for k in range(n_species):
+        for l in range(k + 1, n_species):
+            spectra[k, l] = np.sum(later_transforms[k] * np.conj(later_transforms[l]), axis=1)
+
+    return _same_correlation(spectra, n, fft_length)
+
+
+def molecule_positions(configuration, box_tensors, molecules, species, species_index, first_only=False):
+    '''
+    Cartesian positions of the atoms of one species within each molecule.
+
+    :param configuration: netCDF configuration variable
+    :param box_tensors: array of shape (time steps, 3, 3)
+    :param molecules: list of particle id arrays (see parse_molecules)
+    :param species: species index of each particle (see parse_particles)
+    :param species_index: index of the species to select
+    :param first_only: if True use only the first atom of the species in each molecule,
+                       otherwise average over all atoms of the species
+    :returns: array of shape (molecules, time steps, 3)
+    '''
+    members = [atoms[species[atoms] == species_index] for atoms in molecules]
+    if first_only:
+        if any(atoms.size == 0 for atoms in members):
+            raise RuntimeError("Species not found in every molecule of the trajectory file.")
+        members = [atoms[:1] for atoms in members]
+
+    atoms = np.concatenate(members)
+    atom_molecules = np.repeat(np.arange(len(members)), [len(atoms) for atoms in members])
+
+    # Transform particle trajectories to Cartesian coordinates at each time step
+    cartesian_positions = np.einsum('tij,ptj->pti', box_tensors, read_configuration(configuration, atoms))
+
+    positions = np.zeros((len(members),) + cartesian_positions.shape[1:])
+    np.add.at(positions, atom_molecules, cartesian_positions)
+
+    return positions / np.array([len(atoms) for atoms in members], dtype=float)[:, np.newaxis, np.newaxis]
+
+
+def fold_correlation(omega):
+    '''
+    Folds an array with symmetrical values into half by averaging values around the centre.
+    '''
+    right_half = omega[..., omega.shape[-1] // 2:]
+    left_half = omega[..., :int(np.ceil(omega.shape[-1] / 2.0))][..., ::-1]
+
+    return (left_half + right_half) / 2.0
@@ -5,6 +5,9 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import inspect
+import os
+import shutil
+import tempfile
 import unittest
 
 from mantid.api import (AlgorithmFactory, IAlgorithm, IEventWorkspace, ITableWorkspace, PythonAlgorithm, MatrixWorkspace, mtd)
@@ -324,6 +327,97 @@ class SimpleAPITest(unittest.TestCase):
         # Tidy up simple api function
         del simpleapi.OptionalWorkspace
 
+    def test_lazy_function_is_created_on_first_access(self):
+        from mantid.api import AlgorithmManager, PythonAlgorithm
+
+        class LazyRegistrationTest(PythonAlgorithm):
+            def category(self):
+                return "Examples"
+
+            def alias(self):
+                return "LazyRegistrationTestAlias"
+
+            def PyInit(self):
+                self.declareProperty("Value", 1)
+
+            def PyExec(self):
+                pass
+
+        AlgorithmFactory.subscribe(LazyRegistrationTest)
+        name = "LazyRegistrationTest"
+        entry = simpleapi._manifest_entry(AlgorithmManager.createUnmanaged(name, 1))
+        self.assertEqual(["LazyRegistrationTestAlias"], entry.aliases)
+
+        simpleapi._register_lazy_function(name, entry)
+        self.assertFalse(name in vars(simpleapi))
+        self.assertTrue(name in dir(simpleapi))
+        self.assertTrue(name in simpleapi.__all__)
+
+        # Accessing the alias creates the function
+        func = simpleapi.LazyRegistrationTestAlias
+        self.assertTrue(func is simpleapi.LazyRegistrationTest)
+        self.assertTrue(name in vars(simpleapi))
+        self.assertTrue("Value" in func.__doc__)
+        func(Value=2)
+
+        # Tidy up simple api function
+        del simpleapi._lazy_functions[name]
+        del simpleapi._lazy_aliases["LazyRegistrationTestAlias"]
+        del simpleapi.LazyRegistrationTest
+        del simpleapi.LazyRegistrationTestAlias
+
+    def test_pending_plugin_functions_are_star_imported(self):
+        name = "PendingPluginFunctionTest"
+        lazy_name = "LazyPendingPluginFunctionTest"
+        simpleapi._pending_plugin_functions.add(name)
+        simpleapi._lazy_functions[lazy_name] = simpleapi._ManifestEntry(1, [], "", "", [])
+        try:
+            # Plugins star importing the module while the plugins are loaded get a fake function
+            self.assertTrue(name in dir(simpleapi))
+            self.assertTrue(name in simpleapi.__all__)
+            fake_function = simpleapi.PendingPluginFunctionTest
+            self.assertEqual(name, fake_function.__name__)
+            self.assertRaises(RuntimeError, fake_function)
+        finally:
+            # Tidy up simple api function
+            simpleapi._pending_plugin_functions.discard(name)
+            del simpleapi._lazy_functions[lazy_name]
+            vars(simpleapi).pop(name, None)
+
+    def test_deferred_plugin_is_imported_when_its_function_is_first_called(self):
+        name = "DeferredPluginTest"
+        plugin_dir = tempfile.mkdtemp()
+        plugin_file = os.path.join(plugin_dir, name + ".py")
+        with open(plugin_file, "w") as plugin:
+            plugin.write("from mantid.api import AlgorithmFactory, PythonAlgorithm\n"
+                         "class DeferredPluginTest(PythonAlgorithm):\n"
+                         "    def PyInit(self):\n"
+                         "        self.declareProperty('Value', 1)\n"
+                         "    def PyExec(self):\n"
+                         "        pass\n"
+                         "AlgorithmFactory.subscribe(DeferredPluginTest)\n")
+        simpleapi._deferred_plugins[name] = plugin_file
+        simpleapi._create_deferred_function(name)
+        try:
+            # Star imports do not import the deferred plugins
+            namespace = {}
+            exec("from mantid.simpleapi import *", namespace)
+            self.assertTrue(name in simpleapi._deferred_plugins)
+            self.assertFalse(AlgorithmFactory.exists(name))
+
+            namespace[name](Value=2)
+            self.assertFalse(name in simpleapi._deferred_plugins)
+            self.assertTrue(AlgorithmFactory.exists(name))
+            self.assertFalse(simpleapi.DeferredPluginTest is namespace[name])
+        finally:
+            # Tidy up simple api function
+            simpleapi._deferred_plugins.pop(name, None)
+            simpleapi._lazy_functions.pop(name, None)
+            vars(simpleapi).pop(name, None)
+            if AlgorithmFactory.exists(name):
+                AlgorithmFactory.unsubscribe(name, 1)
+            shutil.rmtree(plugin_dir)
+
     def test_create_algorithm_object_produces_initialized_non_child_alorithm_outside_PyExec(self):
         alg = simpleapi._create_algorithm_object("Rebin")
         self._is_initialized_test(alg, 1, expected_class=IAlgorithm, expected_child=False)
@@ -0,0 +1,54 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+
+from mantid.kernel import funcinspect
+
+
+def _assignment_info():
+    return funcinspect.lhs_info()
+
+
+class FuncInspectTest(unittest.TestCase):
+
+    def test_lhs_info_finds_the_assigned_names_of_each_call(self):
+        results = []
+        for _ in range(3):
+            single = _assignment_info()
+            first, second = _assignment_info()
+            results.append((single, (first, second)))
+
+        for single, pair in results:
+            self.assertEqual((1, ('single',)), single)
+            self.assertEqual((2, ('first', 'second')), pair)
+
+    def test_call_sites_are_decoded_once_per_code_object(self):
+        def assign():
+            value = _assignment_info()
+            return value
+
+        self.assertEqual((1, ('value',)), assign())
+        call_sites = funcinspect._get_call_sites(assign.__code__)
+        self.assertTrue(call_sites is funcinspect._get_call_sites(assign.__code__))
+        self.assertEqual(1, len(call_sites.lhs))
+        self.assertEqual((1, ('value',)), assign())
+        self.assertEqual(1, len(call_sites.lhs))
+
+    def test_call_site_cache_is_bounded(self):
+        functions = []
+        for index in range(funcinspect.CALL_SITE_CACHE_SIZE + 10):
+            namespace = {}
+            exec("def assign_{0}(f):\n    value_{0} = f()\n    return value_{0}".format(index), namespace)
+            functions.append(namespace["assign_{}".format(index)])
+
+        for index, function in enumerate(functions):
+            self.assertEqual((1, ('value_{}'.format(index),)), function(_assignment_info))
+        self.assertTrue(len(funcinspect._call_site_cache) <= funcinspect.CALL_SITE_CACHE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -65,6 +65,60 @@ class PythonPluginsTest(unittest.TestCase):
         except RuntimeError as exc:
             self.fail("Failed to create plugin algorithm from the manager: '%s' " %s)
 
+    def test_declared_names_are_found_without_importing_the_plugin(self):
+        algorithms, functions = plugins.declared_names(__TESTALG__)
+
+        self.assertEqual(['TestPyAlg'], algorithms)
+        self.assertEqual([], functions)
+
+    def test_conditionally_subscribed_algorithms_are_not_declared(self):
+        source = """
+from mantid.api import AlgorithmFactory, PythonAlgorithm
+class OptionalAlg(PythonAlgorithm):
+    pass
+try:
+    import an_optional_dependency
+    AlgorithmFactory.subscribe(OptionalAlg)
+except ImportError:
+    pass
+"""
+        algorithms, functions = plugins.declared_names(source)
+
+        self.assertEqual(None, algorithms)
+        self.assertEqual([], functions)
+
+    def test_declared_name_skips_only_the_docstring(self):
+        source = """
+from mantid.api import AlgorithmFactory, PythonAlgorithm
+class NamedAlg(PythonAlgorithm):
+    def name(self):
+        \"\"\"The name of the algorithm\"\"\"
+        return "AlgName"
+class ComputedNameAlg(PythonAlgorithm):
+    def name(self):
+        print("name")
+        return "AlgName"
+AlgorithmFactory.subscribe(NamedAlg)
+"""
+        self.assertEqual(['AlgName'], plugins.declared_names(source)[0])
+        self.assertEqual(None, plugins.declared_names(source.replace("subscribe(NamedAlg)",
+                                                                     "subscribe(ComputedNameAlg)"))[0])
+
+    def test_plugin_cache_rescans_only_changed_files(self):
+        filename = os.path.join(self._testdir, 'TestPyAlg.py')
+        cache_path = os.path.join(self._testdir, plugins.PLUGIN_CACHE_FILENAME)
+        cache = plugins.PluginCache(cache_path)
+        info = cache.info(filename)
+        cache.save()
+
+        self.assertTrue(info.contains_algorithm)
+        self.assertEqual(['TestPyAlg'], info.algorithms)
+        self.assertEqual(info, plugins.PluginCache(cache_path).info(filename))
+
+        with open(filename, 'a') as plugin:
+            plugin.write("AlgorithmFactory.subscribe(TestPyAlg2)\n")
+        self.assertEqual(None, plugins.PluginCache(cache_path).info(filename).algorithms)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,6 +6,7 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import matplotlib
 import unittest
+from unittest import mock
 
 matplotlib.use('AGG')  # noqa
 
@@ -14,10 +15,12 @@ import numpy as np
 
 import mantid.api
 import mantid.plots.axesfunctions as funcs
+from mantid.plots.datafunctions import get_summed_spectra
 from mantid.plots.utility import MantidAxType
 from mantid.kernel import config
 from mantid.simpleapi import (CreateWorkspace, CreateEmptyTableWorkspace, DeleteWorkspace,
-                              CreateMDHistoWorkspace, ConjoinWorkspaces, AddTimeSeriesLog, CloneWorkspace)
+                              CreateMDHistoWorkspace, ConjoinWorkspaces, AddTimeSeriesLog, CloneWorkspace,
+                              AddSampleLog)
 
 
 class PlotFunctionsTest(unittest.TestCase):
@@ -164,6 +167,34 @@ class PlotFunctionsTest(unittest.TestCase):
         fig, ax = plt.subplots()
         funcs.imshow(ax, self.ws2d_point_uneven)
 
+    def test_imshow_of_large_workspace_integrates_the_spectra_once(self):
+        nhist = 6000
+        ws = CreateWorkspace(DataX=[0, 1], DataY=np.arange(nhist), NSpec=nhist, OutputWorkspace='ws_large')
+        fig, ax = plt.subplots()
+        with mock.patch('mantid.plots.resampling_image.samplingimage.get_summed_spectra',
+                        wraps=get_summed_spectra) as mock_summed_spectra:
+            image = funcs.imshow(ax, ws)
+            image._resample_required = True
+            image._resample_image(50, 50)
+
+        self.assertTrue(image._maxpooling)
+        mock_summed_spectra.assert_called_once_with(ws)
+        DeleteWorkspace(ws)
+
+    def test_imshow_resamples_again_after_the_workspace_is_modified_in_place(self):
+        ws = CreateWorkspace(DataX=[0, 1, 0, 1], DataY=[1, 2], NSpec=2, OutputWorkspace='ws_modified')
+        fig, ax = plt.subplots()
+        image = funcs.imshow(ax, ws)
+        self.assertEqual(2, image.get_array().max())
+
+        ws.dataY(1)[:] = 10
+        AddSampleLog(Workspace=ws, LogName='modified', LogText='yes')
+        image._resample_required = True
+        image._resample_image(100, 100)
+
+        self.assertEqual(10, image.get_array().max())
+        DeleteWorkspace(ws)
+
     def _do_update_colorplot_datalimits(self, color_func):
         fig, ax = plt.subplots()
         mesh = color_func(ax, self.ws2d_histo)
@@ -16,6 +16,7 @@ import numpy as np
 
 import mantid.api
 import mantid.plots.datafunctions as funcs
+from unittest import mock
 from unittest.mock import Mock
 from mantid.kernel import config, ConfigService
 from mantid.plots.utility import MantidAxType
@@ -496,6 +497,18 @@ class DataFunctionsTest(unittest.TestCase):
         # 12th spectra is high counting and will be the first entry in the data when we are using maxpooling
         np.testing.assert_allclose(z[0], self.ws2d_high_counting_detector.readY(12))
 
+    def test_get_matrix2d_ragged_with_maxpooling_and_precomputed_summed_spectra(self):
+        summed_spectra = funcs.get_summed_spectra(self.ws2d_high_counting_detector)
+        self.assertEqual(summed_spectra.shape, (1000, 1))
+
+        with mock.patch('mantid.plots.datafunctions._integrate_workspace') as mock_integrate:
+            x, y, z = funcs.get_matrix_2d_ragged(self.ws2d_high_counting_detector, False, histogram2D=True,
+                                                 extent=[1, 4, 1, 1000], xbins=4, ybins=20, maxpooling=True,
+                                                 summed_spectra=summed_spectra)
+            mock_integrate.assert_not_called()
+
+        np.testing.assert_allclose(z[0], self.ws2d_high_counting_detector.readY(12))
+
     def test_get_matrix2d_ragged_without_maxpooling(self):
         x, y, z = funcs.get_matrix_2d_ragged(self.ws2d_high_counting_detector, False, histogram2D=True,
                                              extent=[1, 4, 1, 1000], xbins=4, ybins=20, maxpooling=False)
@@ -503,6 +516,30 @@ class DataFunctionsTest(unittest.TestCase):
         # 12th spectra is high counting but will skipped if we don't use maxpooling
         np.testing.assert_allclose(z[0], self.ws2d_high_counting_detector.readY(0))
 
+    def test_get_axis_indices_matches_index_of_value(self):
+        for ws in [self.ws2d_histo, self.ws2d_histo_rag, self.ws2d_high_counting_detector]:
+            axis = ws.getAxis(1)
+            values = np.linspace(axis.extractValues().min() - 2, axis.extractValues().max() + 2, 37)
+            expected = []
+            for value in values:
+                try:
+                    expected.append(axis.indexOfValue(value))
+                except IndexError:
+                    expected.append(-1)
+
+            np.testing.assert_array_equal(funcs.get_axis_indices(ws, values), expected)
+
+    def test_get_spectrum_masks(self):
+        ws = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=2, NumMonitors=1, StoreInADS=False)
+        ws.spectrumInfo().setMasked(2, True)
+
+        masked, monitors = funcs.get_spectrum_masks(ws)
+
+        np.testing.assert_array_equal(masked, [False, False, True, False, False])
+        np.testing.assert_array_equal(monitors, [True, False, False, False, False])
+        masked, monitors = funcs.get_spectrum_masks(ws, indices=[2, 3])
+        np.testing.assert_array_equal(masked, [True, False])
+
     def test_get_uneven_data(self):
         # even points
         x, y, z = funcs.get_uneven_data(self.ws2d_point_rag, True)
@@ -0,0 +1,54 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mantid.utils import write_file_atomically
+
+
+class WriteFileAtomicallyTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "content.json")
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_file_is_written(self):
+        write_file_atomically(self._path, "first")
+        write_file_atomically(self._path, "second")
+
+        with open(self._path) as written_file:
+            self.assertEqual("second", written_file.read())
+        self.assertEqual(["content.json"], os.listdir(self._directory))
+
+    def test_temporary_file_is_removed_when_the_replacement_fails(self):
+        with open(self._path, "w") as old_file:
+            old_file.write("old")
+
+        with mock.patch("mantid.utils._utils.os.replace", side_effect=OSError("replace failed")):
+            self.assertRaises(OSError, write_file_atomically, self._path, "new")
+
+        self.assertEqual(["content.json"], os.listdir(self._directory))
+        with open(self._path) as old_file:
+            self.assertEqual("old", old_file.read())
+
+    def test_temporary_file_is_removed_when_the_write_fails(self):
+        self.assertRaises(TypeError, write_file_atomically, self._path, None)
+
+        self.assertEqual([], os.listdir(self._directory))
+
+    def test_missing_directory_raises(self):
+        self.assertRaises(OSError, write_file_atomically, os.path.join(self._directory, "missing", "content.json"),
+                          "text")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+
+from mantid.kernel import config
+from mantid.utils.workerpool import create_worker_pool, get_worker_config
+
+
+class WorkerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self._old_config = get_worker_config()
+
+    def tearDown(self):
+        for key, value in self._old_config:
+            config[key] = value
+
+    def _get_config_of_worker_process(self):
+        with create_worker_pool(max_workers=1) as executor:
+            return executor.submit(get_worker_config).result()
+
+    def test_worker_processes_have_the_config_of_the_parent_process(self):
+        config["datasearch.directories"] = "/worker/pool/data/"
+        config["defaultsave.directory"] = "/worker/pool/output/"
+
+        self.assertEqual(get_worker_config(), self._get_config_of_worker_process())
+
+    def test_worker_search_directories_are_not_extended_by_the_save_directory(self):
+        config["defaultsave.directory"] = "/worker/pool/output/"
+        config["datasearch.directories"] = "/worker/pool/data/"
+
+        worker_config = dict(self._get_config_of_worker_process())
+
+        self.assertEqual("/worker/pool/data/", worker_config["datasearch.directories"])
+        self.assertEqual("/worker/pool/output/", worker_config["defaultsave.directory"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -76,5 +76,30 @@ class DSFinterpTest(unittest.TestCase):
       assert False, "Didn't raise any exception"
     self.cleanup(nf)
 
+  def test_output_group_and_repeated_calls(self):
+    # Run the test only if dsfinterp package is present
+    try:
+      import dsfinterp
+    except:
+      logger.debug('Python package dsfinterp is missing (https://pypi.python.org/pypi/dsfinterp)')
+      return
+    nf = 9
+    fvalues, workspaces = self.generateWorkspaces(nf)
+    targets = [1.5, 2.5, 7.25]
+    outworkspaces = ['outws{0}'.format(i) for i in range(len(targets))]
+    mantid.simpleapi.DSFinterp(Workspaces=workspaces, ParameterValues=fvalues, TargetParameters=targets,
+                               OutputWorkspaces=outworkspaces, OutputGroup='outgroup')
+    group = mantid.mtd['outgroup']
+    self.assertEqual(group.getNames(), outworkspaces)
+    first = [mantid.mtd[name].extractY() for name in outworkspaces]
+    # The second call reuses the interpolators of the first one
+    mantid.simpleapi.DSFinterp(Workspaces=workspaces, ParameterValues=fvalues, TargetParameters=targets[::-1],
+                               OutputWorkspaces=outworkspaces[::-1])
+    for name, expected in zip(outworkspaces, first):
+      numpy.testing.assert_array_equal(mantid.mtd[name].extractY(), expected)
+      numpy.testing.assert_array_equal(mantid.mtd[name].readX(0), mantid.mtd[workspaces[0]].readX(0))
+    mantid.api.AnalysisDataService.remove('outgroup')
+    self.cleanup(nf)
+
 if __name__=="__main__":
     unittest.main()
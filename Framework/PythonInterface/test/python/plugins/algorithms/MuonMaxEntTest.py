@@ -162,6 +162,30 @@ class MuonMaxEntTest(unittest.TestCase):
         self.assertEqual(phase.rowCount(), 2)
         self.cleanUp()
 
+    def test_convergenceTable(self):
+        inputData = self.genData2()
+        MuonMaxent(
+            InputWorkspace=inputData,
+            Npts=32768,
+            FitDeaDTime=False,
+            FixPhases=True,
+            OuterIterations=2,
+            InnerIterations=3,
+            OutputWorkspace='freq',
+            ReconstructedSpectra='time',
+            OutputPhaseTable="phase",
+            ConvergenceTable="conv")
+        conv = AnalysisDataService.retrieve("conv")
+        self.assertEqual(conv.columnCount(), 8)
+        self.assertGreater(conv.rowCount(), 0)
+        self.assertEqual(conv.cell(0, 0), 0)
+        self.assertEqual(conv.cell(conv.rowCount() - 1, 0), 1)
+        for row in range(conv.rowCount()):
+            self.assertLessEqual(conv.cell(row, 1), 3)
+            self.assertGreaterEqual(conv.cell(row, 7), 0.0)
+        DeleteWorkspace("conv")
+        self.cleanUp()
+
     def test_badRange(self):
         inputData = self.genData2()
         try:
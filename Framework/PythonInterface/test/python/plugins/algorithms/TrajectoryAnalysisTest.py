@@ -0,0 +1,118 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+import numpy as np
+import numpy.testing as npt
+import testhelpers  # noqa: F401
+
+import trajectory_analysis
+
+
+class _Trajectory(object):
+    # Minimal stand-in for a netCDF trajectory
+    def __init__(self, description, configuration, box_size):
+        self.variables = {"description": np.frombuffer(description.encode('UTF-8'), dtype='S1'),
+                          "configuration": configuration,
+                          "box_size": box_size}
+
+
+def _reference_correlation(u, v):
+    # Correlation of two time-dependent 3-vectors normalised by the number of overlapping time steps
+    n = u.shape[0]
+    lags = np.arange(-(n // 2), n - n // 2)
+    return sum(np.correlate(u[:, i], v[:, i], "same") for i in range(3)) / (n - np.abs(lags))
+
+
+class TrajectoryAnalysisTest(unittest.TestCase):
+
+    def setUp(self):
+        self._rng = np.random.RandomState(42)
+        self._species = ['h', 'c', 'h', 'o', 'c', 'h']
+        description = "description=" + "".join(("AC('m{0}',[" if i % 3 == 0 else "") + "A('{1}{0}',{0})".format(i, element)
+                                                for i, element in enumerate(self._species))
+        self._n_timesteps = 25
+        box = np.array([2.0, 2.5, 3.0])
+        configuration = np.cumsum(self._rng.normal(scale=0.3, size=(self._n_timesteps, len(self._species), 3)), axis=0) % box
+        box_size = np.tile(np.diag(box).ravel(), (self._n_timesteps, 1))
+        self._trajectory = _Trajectory(description, configuration, box_size)
+
+    def test_parse_description(self):
+        description = trajectory_analysis.get_description(self._trajectory)
+        elements, species = trajectory_analysis.parse_particles(description)
+        molecules = trajectory_analysis.parse_molecules(description)
+
+        self.assertEqual(elements, ['h', 'c', 'o'])
+        npt.assert_array_equal(species, [0, 1, 0, 2, 1, 0])
+        self.assertEqual(len(molecules), 2)
+        npt.assert_array_equal(molecules[1], [3, 4, 5])
+
+    def test_read_configuration_in_chunks(self):
+        configuration = self._trajectory.variables["configuration"]
+        coordinates = trajectory_analysis.read_configuration(configuration, slice(1, 4), time_chunk_size=4)
+
+        npt.assert_array_equal(coordinates, np.swapaxes(configuration[:, 1:4], 0, 1))
+
+    def test_auto_correlation_sum_matches_direct_correlation(self):
+        for n_timesteps in [16, 17]:
+            vectors = self._rng.normal(size=(5, n_timesteps, 3))
+            expected = sum(_reference_correlation(vector, vector) for vector in vectors)
+
+            npt.assert_allclose(trajectory_analysis.auto_correlation_sum(vectors), expected, atol=1e-12)
+
+    def test_velocity_correlations_match_direct_correlation(self):
+        description = trajectory_analysis.get_description(self._trajectory)
+        elements, species = trajectory_analysis.parse_particles(description)
+        box_tensors = trajectory_analysis.get_box_tensors(self._trajectory)
+        configuration = self._trajectory.variables["configuration"]
+        velocities = trajectory_analysis.unwrapped_velocities(
+            trajectory_analysis.read_configuration(configuration, slice(None)), box_tensors)
+
+        n_species = len(elements)
+        expected_auto = np.zeros((n_species, self._n_timesteps - 1))
+        expected_cross = np.zeros((n_species, n_species, self._n_timesteps - 1))
+        for i in range(len(species)):
+            expected_auto[species[i]] += _reference_correlation(velocities[i], velocities[i])
+            for j in range(i + 1, len(species)):
+                if species[i] <= species[j]:
+                    expected_cross[species[i], species[j]] += _reference_correlation(velocities[i], velocities[j])
+                else:
+                    expected_cross[species[j], species[i]] += _reference_correlation(velocities[j], velocities[i])
+
+        auto = trajectory_analysis.velocity_auto_correlations(self._trajectory, species, n_species, box_tensors)
+        cross = trajectory_analysis.velocity_cross_correlations(self._trajectory, species, n_species, box_tensors)
+
+        npt.assert_allclose(auto, expected_auto, atol=1e-12)
+        upper = np.triu_indices(n_species)
+        npt.assert_allclose(cross[upper], expected_cross[upper], atol=1e-12)
+
+    def test_molecule_positions(self):
+        description = trajectory_analysis.get_description(self._trajectory)
+        elements, species = trajectory_analysis.parse_particles(description)
+        molecules = trajectory_analysis.parse_molecules(description)
+        box_tensors = trajectory_analysis.get_box_tensors(self._trajectory, scale=10.0)
+        cartesian = 10.0 * np.swapaxes(self._trajectory.variables["configuration"], 0, 1) * np.array([2.0, 2.5, 3.0])
+
+        configuration = self._trajectory.variables["configuration"]
+        positions = trajectory_analysis.molecule_positions(configuration, box_tensors, molecules, species, elements.index('h'))
+        first = trajectory_analysis.molecule_positions(configuration, box_tensors, molecules, species, elements.index('h'),
+                                                       first_only=True)
+
+        npt.assert_allclose(positions[0], (cartesian[0] + cartesian[2]) / 2.0)
+        npt.assert_allclose(first[0], cartesian[0])
+        npt.assert_allclose(positions[1], cartesian[5])
+        with self.assertRaises(RuntimeError):
+            trajectory_analysis.molecule_positions(configuration, box_tensors, molecules, species, elements.index('o'),
+                                                   first_only=True)
+
+    def test_fold_correlation(self):
+        npt.assert_array_equal(trajectory_analysis.fold_correlation(np.array([1.0, 2.0, 3.0, 4.0])), [2.5, 2.5])
+        npt.assert_array_equal(trajectory_analysis.fold_correlation(np.array([[1.0, 2.0, 5.0], [0.0, 1.0, 2.0]])),
+                               [[2.0, 3.0], [1.0, 1.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+""" Module to detect changes in the performance history of a test.
+
+A history (runtimes or peak memory, one value per revision) is split into
+segments of constant level. Values are compared on a log scale, so that a
+change is a relative change, and in units of the noise of the test. The
+noise is estimated from the spread of the differences between consecutive
+revisions, which is not affected by the changes of level themselves.
+
+The segmentation minimises the sum of the absolute deviations of the values
+from the medians of their segments plus a penalty for every change
+(optimal partitioning). Absolute deviations and medians make the
+segmentation robust to single outliers, which are common in timings.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Scale factor from the median absolute deviation to the standard deviation of a normal distribution
+MAD_TO_SIGMA = 1.4826
+
+# A change of level in a history
+#   index :: index of the first value after the change
+#   before :: median of the segment before the change
+#   after :: median of the segment after the change
+#   score :: size of the change in units of the noise of the difference of the medians
+ChangePoint = namedtuple('ChangePoint', 'index before after score')
+
+
+def estimate_noise(log_values, noise_floor=0.0):
+    """Return a robust estimate of the standard deviation of the noise
+    of a history given on a log scale.
+
+    Parameters
+    ----------
+        log_values :: array of the logarithm of the values
+        noise_floor :: smallest noise to return, e.g. the resolution of the timer
+    """
+    if len(log_values) < 3:
+        return noise_floor
+    diffs = np.diff(log_values)
+    mad = np.median(np.abs(diffs - np.median(diffs)))
+    # The difference of two values has twice the variance of a single value
+    return max(MAD_TO_SIGMA * mad / np.sqrt(2.0), noise_floor)
+
+
+def _segment_cost(values):
+    """Return the sum of the absolute deviations of values from their median"""
+    return np.sum(np.abs(values - np.median(values)))
+
+
+def find_change_points(values, penalty=10.0, min_size=2, noise_floor=0.01):
+    """Find the changes of level in a history.
+
+    Parameters
+    ----------
+        values :: positive values, ordered by revision
+        penalty :: cost of a change, in units of the noise. A change of d times the
+                   noise which lasts m revisions is found if d * m exceeds it, roughly.
+        min_size :: smallest number of values in a segment
+        noise_floor :: smallest relative noise assumed for the history
+
+    Returns
+    -------
+        change_points :: list of ChangePoint, ordered by index
+        noise :: the estimated relative noise of the history
+    """
+    log_values = np.log(np.asarray(values, dtype=float))
+    noise = estimate_noise(log_values, noise_floor)
+    if noise <= 0.0:
+        # A history without any noise: any change is significant
+        noise = np.finfo(float).eps
+    scaled = log_values / noise
+    nvalues = len(scaled)
+
+    # total_cost[end] :: the lowest cost of a segmentation of scaled[:end]
+    # last_start[end] :: the start of the last segment of that segmentation
+    total_cost = np.full(nvalues + 1, np.inf)
+    total_cost[0] = -penalty
+    last_start = np.zeros(nvalues + 1, dtype=int)
+    # Starts of the last segment which can still be optimal (pruned as in PELT)
+    candidates = []
+    for end in range(min_size, nvalues + 1):
+        if not np.isinf(total_cost[end - min_size]):
+            candidates.append(end - min_size)
+        costs = [total_cost[start] + _segment_cost(scaled[start:end]) for start in candidates]
+        best = int(np.argmin(costs))
+        total_cost[end], last_start[end] = costs[best] + penalty, candidates[best]
+        # A start which costs more than the best segmentation can not start the last segment of a longer one
+        candidates = [start for start, cost in zip(candidates, costs) if cost <= total_cost[end]]
+
+    indices = []
+    end = nvalues
+    while end > 0 and not np.isinf(total_cost[end]):
+        end = last_start[end]
+        if end > 0:
+            indices.insert(0, end)
+
+    bounds = [0] + indices + [nvalues]
+    change_points = []
+    for i, index in enumerate(indices):
+        before = log_values[bounds[i]:index]
+        after = log_values[index:bounds[i + 2]]
+        score = abs(np.median(after) - np.median(before)) / (noise * np.sqrt(1.0 / len(before) + 1.0 / len(after)))
+        change_points.append(ChangePoint(index, np.exp(np.median(before)), np.exp(np.median(after)), score))
+    return change_points, noise
+
+
+def detect_recent_change(values, recent=None, penalty=10.0, min_size=2, noise_floor=0.01):
+    """Return the change of level of a history which occurred within its
+    last revisions, or None if there is no such change.
+
+    Parameters
+    ----------
+        values :: positive values, ordered by revision, the latest last
+        recent :: the change has to be within this many of the latest values.
+                  Defaults to min_size, so that a change is reported once it is
+                  confirmed by min_size revisions.
+        penalty, min_size, noise_floor :: see find_change_points
+    """
+    if recent is None:
+        recent = min_size
+    change_points, _ = find_change_points(values, penalty, min_size, noise_floor)
+    if change_points and change_points[-1].index >= len(values) - recent:
+        return change_points[-1]
+    return None
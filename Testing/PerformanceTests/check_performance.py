@@ -9,108 +9,94 @@
 to determine whether performance in a particular test has dropped.
 If so, it prints out an error message and exits with a return
 code, causing the build to fail.
+
+The runtime and peak memory history of each test is segmented by
+change-point detection (see changepoint.py), using an estimate of the
+noise of each test. A test is reported if its latest level differs
+from the previous one by more than the tolerance and the change
+occurred within the last few revisions.
 """
 
 import argparse
 import sys
 import os
 import sqlresults
-from testresult import TestResult, envAsString
-from xml.dom.minidom import parse, parseString
-import re
-import time
-import datetime
-import platform
-import subprocess
-import tempfile
-import sqlresults
 import numpy as np
-try:
-    import analysis
-except ImportError:
-    import analysis_mpl as analysis
+import changepoint
 import secureemail
 
 
+def check_history(values, args, noise_floor):
+    """ Return the percentage change of the latest level of a history,
+    or None if there is no recent change beyond the tolerance """
+    change = changepoint.detect_recent_change(values, penalty=args.penalty, min_size=args.min_size,
+                                              noise_floor=noise_floor)
+    if change is None:
+        return None
+    pct = ((change.after / change.before) - 1) * 100
+    if abs(pct) < args.tol:
+        return None
+    return pct
+
+
 #====================================================================================
 def run(args):
     """ Execute the program """
-    print
-    print "=============== Checking For Performance Loss ====================="
+    print()
+    print("=============== Checking For Performance Loss =====================")
     dbfile = args.db[0]
 
     if not os.path.exists(dbfile):
-        print "Database file %s not found."
+        print("Database file %s not found." % dbfile)
         sys.exit(1)
 
     # Set the database to the one given
-    sqlresults.set_database_filename(dbfile);
+    sqlresults.set_database_filename(dbfile)
+    sqlresults.upgrade_database()
 
-    # Convert the arguments. Will throw if the user is stupid.
-    avg = int(args.avg)
-    tol = float(args.tol)
     rev = sqlresults.get_latest_revison()
 
-    print "Comparing the average of the %d revisions before rev. %d. Tolerance of %g %%." % (avg, rev, tol)
-    if args.verbose: print
-
-    # For limiting the results
-    limit = 50*avg;
+    print("Looking for changes in the last %d of %d revisions up to rev. %d. Tolerance of %g %%."
+          % (args.min_size, args.window, rev, args.tol))
+    if args.verbose: print()
 
     names = sqlresults.get_all_test_names("revision = %d" % rev)
     if len(names) == 0:
-        print "Error! No tests found at revision number %d.\n" % rev
+        print("Error! No tests found at revision number %d.\n" % rev)
         sys.exit(1)
 
-    bad_results = ""
-    good_results = ""
-    num_same = 0
-    num_good = 0
-    num_bad = 0
-    num_notenoughstats=0
     # The timing resolution is different across platforms and the faster tests
-    # can cause more false positives on the lower-resolution clocks. We'll
-    # up the tolerance for those taking less time than 10ms.
-    timer_resolution_hi = 0.01
-    timer_resolution_lo = 0.0011
+    # can cause more false positives on the lower-resolution clocks. The noise
+    # of a test is assumed to be at least the timer resolution.
+    timer_resolution = 0.0011
+    # Smallest relative noise assumed for the peak memory
+    memory_noise_floor = 0.01
 
     regression_names = []
     speedup_names = []
 
-    for name in names:
-        (r, t) = analysis.get_runtime_data(name, x_field='revision')
-        r = np.array(r)
-        t = np.array(t)
-
-        # this is the timing of the current revision
-        current_time = t[r == rev]
-        tolerance = tol
-        if current_time < timer_resolution_hi:
-            # Increase the tolerance to avoid false positives
-            if current_time < timer_resolution_lo:
-                # Very fast tests are twitchy
-                tolerance = 100.0
-            else:
-                tolerance = 70.0
-
-        # Cut out any times after or = to the current rev
-        t = t[r < rev]
-
-        # Keep the latest "avg" #
-        t = t[len(t)-avg:]
+    for name in sorted(names):
+        revisions, runtimes, peak_memories = sqlresults.get_history(name, last_num=args.window)
+        if len(revisions) <= args.min_size or revisions[-1] != rev or np.any(runtimes <= 0):
+            continue
 
-        if (len(t) == avg):
-            # This is the average
-            baseline_time = np.mean(t)
-
-            # % speed change
-            pct = ((baseline_time / current_time) - 1) * 100
-
-            # Did we fail (slow down too much)
-            if pct < -tolerance:
+        noise_floor = max(np.log1p(timer_resolution / np.median(runtimes)), args.noise_floor)
+        pct = check_history(runtimes, args, noise_floor)
+        if pct is not None:
+            if pct > 0:
                 regression_names.append(name)
-            elif pct > tolerance:
+            else:
                 speedup_names.append(name)
+            if args.verbose: print("%s: runtime changed by %+.1f %%" % (name, pct))
+
+        if np.all(peak_memories > 0):
+            pct = check_history(peak_memories, args, memory_noise_floor)
+            if pct is not None and pct > 0:
+                if name not in regression_names:
+                    regression_names.append(name)
+                if args.verbose: print("%s: peak memory changed by %+.1f %%" % (name, pct))
+
+    print("%d possible regressions, %d possible speedups." % (len(regression_names), len(speedup_names)))
 
     regLinks = ["http://builds.mantidproject.org/job/master_performancetests2/Master_branch_performance_tests/{}.htm".format(name) for name in regression_names]
     speedLinks = ["http://builds.mantidproject.org/job/master_performancetests2/Master_branch_performance_tests/{}.htm".format(name) for name in speedup_names]
@@ -132,12 +118,22 @@ if __name__ == "__main__":
     parser.add_argument('pwd', type=str, help='password for gmail address')
     parser.add_argument('recipient', type=str, help='recipient email address')
 
-    parser.add_argument('--avg', dest='avg', type=int, default="5",
-                        help='Average over this many previous revisions to find a baseline. Default 5.')
+    parser.add_argument('--window', dest='window', type=int, default="30",
+                        help='Look for changes in this many of the latest revisions. Default 30.')
 
     parser.add_argument('--tol', dest='tol', type=float, default="20",
                         help='Percentage tolerance; speed loss beyond this %% will give a warning. Default 20%%.')
 
+    parser.add_argument('--min-size', dest='min_size', type=int, default="2",
+                        help='Number of revisions that have to confirm a change before it is reported. Default 2.')
+
+    parser.add_argument('--penalty', dest='penalty', type=float, default="10",
+                        help='Penalty of a change point in units of the noise of a test; larger values '
+                             'report fewer changes. Default 10.')
+
+    parser.add_argument('--noise-floor', dest='noise_floor', type=float, default="0.01",
+                        help='Smallest relative noise assumed for the runtime of a test. Default 0.01.')
+
     parser.add_argument('--verbose', dest='verbose', action='store_const',
                         const=True, default=False,
                         help='For full reporting of each timing.')
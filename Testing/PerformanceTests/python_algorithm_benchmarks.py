@@ -0,0 +1,471 @@
+#!/usr/bin/env python
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+""" Benchmarks of the heavier Python algorithms.
+
+Every benchmark runs an algorithm on synthetic input of increasing size, so that
+the scaling of the runtime and memory with the input size is recorded as well as
+their absolute values. The results are written to a JSON file which xunit_to_sql.py
+adds to the performance history database, e.g.
+
+    mantidpython python_algorithm_benchmarks.py results.json
+    python xunit_to_sql.py --db MantidSystemTests.db --commit <sha> results.json
+
+The runtime of a benchmark is the fastest of its repeats. The peak memory is the
+largest increase of the resident set size of the process during a repeat, sampled
+by a background thread, so it includes the memory allocated by the C++ algorithms.
+
+The overhead of calling an algorithm through the simple API is benchmarked as
+well, from functions of increasing length, since the assignment of the result is
+found by inspecting the bytecode of the calling function.
+
+The input is made up by the benchmarks and written to a temporary directory when an
+algorithm reads a file. LoadVesuvio can only read raw files, it is benchmarked on
+a run of the system test data and skipped when the data is not found.
+"""
+
+import argparse
+from collections import namedtuple
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from mantid.api import AnalysisDataService, FileFinder
+from mantid.kernel import Atom, ConfigService
+from mantid.simpleapi import (Abins, AlignAndFocusPowder, CreateGroupingWorkspace, CreateSampleWorkspace,
+                              CreateSingleValuedWorkspace, CreateWorkspace, CylinderPaalmanPingsCorrection,
+                              FlatPlatePaalmanPingsCorrection, LoadVesuvio, MuonMaxent, Scale,
+                              VelocityAutoCorrelations)
+
+# Prefix of the names of the benchmarks in the database
+NAME_PREFIX = "PythonAlgorithms"
+
+# Interval between two samples of the resident set size in seconds
+MEMORY_SAMPLE_INTERVAL = 0.005
+
+MIB = 1024.0**2
+
+# A benchmark of an algorithm
+#   name :: name of the benchmark
+#   parameter :: name of the size parameter
+#   sizes :: the sizes the benchmark is run for, increasing
+#   setup :: function(size, directory) returning the keyword arguments of run. Not timed.
+#   run :: function(**kwargs) running the algorithm
+#   available :: function() returning whether the benchmark can run
+#   teardown :: function() undoing the changes of setup to the global state, or None. Not timed.
+Benchmark = namedtuple('Benchmark', 'name parameter sizes setup run available teardown')
+Benchmark.__new__.__defaults__ = (None, )
+
+# Values of the settings changed by the setup of a benchmark, to be restored by its teardown
+_saved_config = {}
+
+
+def save_config(key):
+    """ Keep the value of a setting of the ConfigService to be restored by restore_config """
+    _saved_config.setdefault(key, ConfigService.getString(key))
+
+
+def set_config(key, value):
+    """ Change a setting of the ConfigService until restore_config is called """
+    save_config(key)
+    ConfigService.setString(key, value)
+
+
+def restore_config():
+    """ Restore the settings kept by save_config, the latest first """
+    for key, value in reversed(list(_saved_config.items())):
+        ConfigService.setString(key, value)
+    _saved_config.clear()
+
+
+class MemorySampler(object):
+    """ Samples the resident set size of the process in a background thread
+    and keeps the largest value """
+
+    def __init__(self, interval=MEMORY_SAMPLE_INTERVAL):
+        self._interval = interval
+        self._process = psutil.Process() if psutil is not None else None
+        self._stop = threading.Event()
+        self._thread = None
+        self.start_rss = 0
+        self.peak_rss = 0
+
+    def __enter__(self):
+        if self._process is not None:
+            self.start_rss = self.peak_rss = self._process.memory_info().rss
+            self._thread = threading.Thread(target=self._sample)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._update()
+
+    @property
+    def peak_increase(self):
+        """ The largest increase of the resident set size in MiB, 0 if it can not be measured """
+        return (self.peak_rss - self.start_rss) / MIB
+
+    def _sample(self):
+        while not self._stop.wait(self._interval):
+            self._update()
+
+    def _update(self):
+        self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+
+def measure(benchmark, size, repeat):
+    """ Run a benchmark for one size
+
+    Returns
+    -------
+        runtime :: the fastest runtime of the repeats in seconds
+        peak_memory :: the largest peak memory increase of the repeats in MiB
+        cpu_fraction :: CPU time over runtime for the fastest repeat
+    """
+    runtime, peak_memory, cpu_fraction = np.inf, 0.0, 0.0
+    for _ in range(repeat):
+        directory = tempfile.mkdtemp(prefix="benchmark_")
+        try:
+            kwargs = benchmark.setup(size, directory)
+            with MemorySampler() as memory:
+                start_cpu = time.process_time()
+                start = time.perf_counter()
+                benchmark.run(**kwargs)
+                elapsed = time.perf_counter() - start
+                elapsed_cpu = time.process_time() - start_cpu
+        finally:
+            if benchmark.teardown is not None:
+                benchmark.teardown()
+            AnalysisDataService.clear()
+            shutil.rmtree(directory, ignore_errors=True)
+        if elapsed < runtime:
+            runtime, cpu_fraction = elapsed, elapsed_cpu / elapsed
+        peak_memory = max(peak_memory, memory.peak_increase)
+    return runtime, peak_memory, cpu_fraction
+
+
+def scaling_exponent(sizes, values):
+    """ Return the exponent b of the power law a * size**b fitted to the values,
+    or None if there are not enough positive values """
+    sizes, values = np.asarray(sizes, dtype=float), np.asarray(values, dtype=float)
+    positive = values > 0
+    if np.count_nonzero(positive) < 2:
+        return None
+    return np.polyfit(np.log(sizes[positive]), np.log(values[positive]), 1)[0]
+
+
+#====================================================================================
+# Abins
+#====================================================================================
+_ABINS_ELEMENTS = ['H', 'C', 'N', 'O']
+
+
+def write_castep_phonon(filename, n_atoms, seed=0):
+    """ Write a CASTEP .phonon file for a random cubic crystal with one k-point """
+    rng = np.random.RandomState(seed)
+    n_branches = 3 * n_atoms
+    lattice = 3.0 * n_atoms**(1.0 / 3.0)
+    symbols = [_ABINS_ELEMENTS[i % len(_ABINS_ELEMENTS)] for i in range(n_atoms)]
+    frequencies = np.sort(rng.uniform(50.0, 4000.0, n_branches))
+    displacements = rng.normal(size=(n_branches, n_atoms, 6))
+
+    lines = [" BEGIN header",
+             " Number of ions %11d" % n_atoms,
+             " Number of branches %7d" % n_branches,
+             " Number of wavevectors %4d" % 1,
+             " Frequencies in         cm-1",
+             " IR intensities in      (D/A)**2/amu",
+             " Raman activities in    A**4 amu**(-1)",
+             " Unit cell vectors (A)",
+             "   %10.6f  %10.6f  %10.6f" % (lattice, 0.0, 0.0),
+             "   %10.6f  %10.6f  %10.6f" % (0.0, lattice, 0.0),
+             "   %10.6f  %10.6f  %10.6f" % (0.0, 0.0, lattice),
+             " Fractional Co-ordinates"]
+    for atom, position in enumerate(rng.uniform(size=(n_atoms, 3))):
+        lines.append("   %5d %12.6f %12.6f %12.6f   %-2s %15.6f"
+                     % ((atom + 1,) + tuple(position) + (symbols[atom], Atom(symbol=symbols[atom]).mass)))
+    lines.append(" END header")
+    lines.append("     q-pt=    1    0.000000  0.000000  0.000000      1.0000000000")
+    for branch, frequency in enumerate(frequencies):
+        lines.append("   %5d %14.6f" % (branch + 1, frequency))
+    lines.append("                        Phonon Eigenvectors")
+    lines.append("Mode Ion                X                                   Y                                   Z")
+    for branch in range(n_branches):
+        for atom in range(n_atoms):
+            lines.append("   %d   %d" % (branch + 1, atom + 1)
+                         + "".join(" %12.6f" % component for component in displacements[branch, atom]))
+
+    with open(filename, "w") as phonon_file:
+        phonon_file.write("\n".join(lines) + "\n")
+
+
+def setup_abins(n_atoms, directory):
+    # Abins caches its results next to the default save directory, keyed by the hash of the input
+    # Setting the save directory adds it to the data search directories
+    save_config("datasearch.directories")
+    set_config("defaultsave.directory", directory)
+    filename = os.path.join(directory, "benchmark.phonon")
+    write_castep_phonon(filename, n_atoms)
+    return {'VibrationalOrPhononFile': filename}
+
+
+def run_abins(VibrationalOrPhononFile):
+    Abins(VibrationalOrPhononFile=VibrationalOrPhononFile, AbInitioProgram="CASTEP", QuantumOrderEventsNumber='2',
+          SumContributions=True, OutputWorkspace="abins")
+
+
+#====================================================================================
+# Paalman-Pings corrections
+#====================================================================================
+def setup_paalman_pings(n_detectors, directory):
+    sample = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=int(round(np.sqrt(n_detectors))), XUnit='Wavelength',
+                                   XMin=1.0, XMax=9.0, BinWidth=0.01, OutputWorkspace="sample")
+    can = Scale(InputWorkspace=sample, Factor=1.2, OutputWorkspace="can")
+    return {'SampleWorkspace': sample, 'CanWorkspace': can}
+
+
+def run_cylinder_paalman_pings(SampleWorkspace, CanWorkspace):
+    CylinderPaalmanPingsCorrection(SampleWorkspace=SampleWorkspace, SampleChemicalFormula='H2-O',
+                                   SampleInnerRadius=0.05, SampleOuterRadius=0.1,
+                                   CanWorkspace=CanWorkspace, CanChemicalFormula='V', CanOuterRadius=0.15,
+                                   BeamHeight=0.1, BeamWidth=0.1, StepSize=0.002, NumberWavelengths=10,
+                                   Emode='Elastic', OutputWorkspace="corrections")
+
+
+def run_flat_plate_paalman_pings(SampleWorkspace, CanWorkspace):
+    FlatPlatePaalmanPingsCorrection(SampleWorkspace=SampleWorkspace, SampleChemicalFormula='H2-O',
+                                    SampleThickness=0.1, SampleAngle=45.0,
+                                    CanWorkspace=CanWorkspace, CanChemicalFormula='V',
+                                    CanFrontThickness=0.1, CanBackThickness=0.1, NumberWavelengths=10,
+                                    Emode='Elastic', OutputWorkspace="corrections")
+
+
+#====================================================================================
+# VelocityAutoCorrelations
+#====================================================================================
+_TRAJECTORY_ELEMENTS = ['h', 'c', 'o']
+_TRAJECTORY_TIMESTEPS = 1000
+
+
+def write_trajectory(filename, n_particles, n_timesteps=_TRAJECTORY_TIMESTEPS, seed=0):
+    """ Write an nMoldyn/MMTK netCDF trajectory of particles diffusing in a cubic box """
+    from scipy.io import netcdf
+
+    rng = np.random.RandomState(seed)
+    box = 2.0 * n_particles**(1.0 / 3.0)
+    description = "".join(("AC('m{0}',[" if i % 3 == 0 else "")
+                          + "A('{1}{0}',{0})".format(i, _TRAJECTORY_ELEMENTS[i % len(_TRAJECTORY_ELEMENTS)])
+                          + ("])" if i % 3 == 2 else "")
+                          for i in range(n_particles))
+    description = description.encode('UTF-8')
+
+    trajectory = netcdf.netcdf_file(filename, mode="w")
+    try:
+        trajectory.createDimension('step', n_timesteps)
+        trajectory.createDimension('atom_number', n_particles)
+        trajectory.createDimension('xyz', 3)
+        trajectory.createDimension('box_size_length', 9)
+        trajectory.createDimension('description_length', len(description))
+        trajectory.createVariable('description', 'c', ('description_length',))[:] = \
+            np.frombuffer(description, dtype='S1')
+        configuration = trajectory.createVariable('configuration', 'f', ('step', 'atom_number', 'xyz'))
+        configuration[:] = np.cumsum(rng.normal(scale=0.01 * box, size=(n_timesteps, n_particles, 3)), axis=0) % box
+        trajectory.createVariable('box_size', 'f', ('step', 'box_size_length'))[:] = \
+            np.tile(box * np.eye(3).ravel(), (n_timesteps, 1))
+    finally:
+        trajectory.close()
+
+
+def setup_velocity_auto_correlations(n_particles, directory):
+    filename = os.path.join(directory, "benchmark.nc")
+    write_trajectory(filename, n_particles)
+    return {'InputFile': filename}
+
+
+def run_velocity_auto_correlations(InputFile):
+    VelocityAutoCorrelations(InputFile=InputFile, Timestep="1.0", OutputWorkspace="correlations")
+
+
+#====================================================================================
+# LoadVesuvio
+#====================================================================================
+_VESUVIO_RUN = "EVS14188.raw"
+
+
+def vesuvio_data_available():
+    return bool(FileFinder.getFullPath(_VESUVIO_RUN))
+
+
+def setup_load_vesuvio(n_spectra, directory):
+    # The back scattering spectra start at 3
+    return {'SpectrumList': "3-%d" % (2 + n_spectra)}
+
+
+def run_load_vesuvio(SpectrumList):
+    LoadVesuvio(Filename=_VESUVIO_RUN, SpectrumList=SpectrumList, Mode="DoubleDifference", OutputWorkspace="evs")
+
+
+#====================================================================================
+# MuonMaxent
+#====================================================================================
+def setup_muon_maxent(n_spectra, directory):
+    rng = np.random.RandomState(0)
+    x_data = np.linspace(0.0, 30.0, 2001)
+    centres = (x_data[1:] + x_data[:-1]) / 2.0
+    phases = 2.0 * np.pi * np.arange(n_spectra) / n_spectra
+    y_data = np.sin(2.3 * centres + phases[:, np.newaxis]) * np.exp(-centres / 2.19703)
+    y_data += rng.normal(scale=0.05, size=y_data.shape)
+    workspace = CreateWorkspace(DataX=x_data, DataY=y_data.ravel(), DataE=np.full(y_data.size, 0.05),
+                                NSpec=n_spectra, UnitX='Time', OutputWorkspace="muon")
+    return {'InputWorkspace': workspace}
+
+
+def run_muon_maxent(InputWorkspace):
+    MuonMaxent(InputWorkspace=InputWorkspace, Npts=8192, FitDeadTime=False, FixPhases=False,
+               OuterIterations=5, InnerIterations=10, OutputWorkspace='freq', ReconstructedSpectra='time',
+               OutputPhaseTable="phase")
+
+
+#====================================================================================
+# SNSPowderReduction
+#====================================================================================
+def setup_powder_focusing(n_events, directory):
+    # NumEvents is the number of events of each pixel
+    events = CreateSampleWorkspace(WorkspaceType='Event', Function='Powder Diffraction', NumBanks=4,
+                                   BankPixelWidth=10, NumEvents=n_events, XUnit='TOF', XMin=300.0, XMax=16000.0,
+                                   BinWidth=10.0, OutputWorkspace="events")
+    CreateGroupingWorkspace(InputWorkspace=events, GroupNames="bank1,bank2,bank3,bank4",
+                            OutputWorkspace="grouping")
+    return {'InputWorkspace': events, 'GroupingWorkspace': "grouping"}
+
+
+def run_powder_focusing(InputWorkspace, GroupingWorkspace):
+    AlignAndFocusPowder(InputWorkspace=InputWorkspace, GroupingWorkspace=GroupingWorkspace, Params="-0.0004",
+                        Dspacing=True, PreserveEvents=True, RemovePromptPulseWidth=50.0,
+                        OutputWorkspace="focused")
+
+
+#====================================================================================
+# Simple API call overhead
+#====================================================================================
+_SIMPLEAPI_CALLS = 200
+
+
+def setup_simpleapi_calls(n_statements, directory):
+    # The calls are made from a function with many statements, like a long reduction script
+    source = ("def reduce(CreateSingleValuedWorkspace):\n"
+              + "".join("    x%d = %d\n" % (i, i) for i in range(n_statements))
+              + "    for _ in range(%d):\n" % _SIMPLEAPI_CALLS
+              + "        value = CreateSingleValuedWorkspace(DataValue=1.0)\n")
+    namespace = {}
+    exec(compile(source, "<benchmark>", "exec"), namespace)
+    return {'function': namespace['reduce']}
+
+
+def run_simpleapi_calls(function):
+    function(CreateSingleValuedWorkspace)
+
+
+def always():
+    return True
+
+
+BENCHMARKS = [
+    Benchmark("Abins", "atoms", [4, 16, 64], setup_abins, run_abins, always, restore_config),
+    Benchmark("CylinderPaalmanPingsCorrection", "detectors", [1, 4, 16], setup_paalman_pings,
+              run_cylinder_paalman_pings, always),
+    Benchmark("FlatPlatePaalmanPingsCorrection", "detectors", [1, 4, 16], setup_paalman_pings,
+              run_flat_plate_paalman_pings, always),
+    Benchmark("VelocityAutoCorrelations", "particles", [30, 300, 3000], setup_velocity_auto_correlations,
+              run_velocity_auto_correlations, always),
+    Benchmark("LoadVesuvio", "spectra", [8, 32, 132], setup_load_vesuvio, run_load_vesuvio,
+              vesuvio_data_available),
+    Benchmark("MuonMaxent", "spectra", [1, 8, 64], setup_muon_maxent, run_muon_maxent, always),
+    # SNSPowderReduction only reads event files, so the event focusing it spends its time in is benchmarked
+    Benchmark("SNSPowderReduction.AlignAndFocusPowder", "events_per_pixel", [100, 1000, 10000], setup_powder_focusing,
+              run_powder_focusing, always),
+    Benchmark("SimpleAPI.CallOverhead", "statements", [10, 1000, 10000], setup_simpleapi_calls,
+              run_simpleapi_calls, always),
+]
+
+
+#====================================================================================
+def run(args):
+    """ Execute the program """
+    if psutil is None:
+        print("psutil is not available: the peak memory is not measured.")
+    pattern = re.compile(args.filter)
+    variables = "repeat=%d" % args.repeat
+    results = []
+    for benchmark in BENCHMARKS:
+        if not pattern.search(benchmark.name):
+            continue
+        if not benchmark.available():
+            print("Skipping %s: its input data is not available." % benchmark.name)
+            continue
+        sizes = benchmark.sizes[:1] if args.quick else benchmark.sizes
+        runtimes, peak_memories = [], []
+        for size in sizes:
+            runtime, peak_memory, cpu_fraction = measure(benchmark, size, args.repeat)
+            runtimes.append(runtime)
+            peak_memories.append(peak_memory)
+            name = "%s.%s.%s_%d" % (NAME_PREFIX, benchmark.name, benchmark.parameter, size)
+            print("%-70s %10.4f s %10.1f MiB" % (name, runtime, peak_memory))
+            results.append({"name": name, "runtime": runtime, "peak_memory": peak_memory,
+                            "cpu_fraction": cpu_fraction, "variables": variables})
+        time_exponent = scaling_exponent(sizes, runtimes)
+        memory_exponent = scaling_exponent(sizes, peak_memories)
+        if time_exponent is not None:
+            print("%s: runtime scales as %s^%.2f" % (benchmark.name, benchmark.parameter, time_exponent))
+        if memory_exponent is not None:
+            print("%s: peak memory scales as %s^%.2f" % (benchmark.name, benchmark.parameter, memory_exponent))
+
+    with open(args.output[0], "w") as output:
+        json.dump({"results": results}, output, indent=2)
+    print("Wrote %d results to %s" % (len(results), args.output[0]))
+
+
+#====================================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks the heavier Python algorithms on synthetic input of '
+                                                 'increasing size and writes the results to a JSON file for '
+                                                 'xunit_to_sql.py.')
+
+    parser.add_argument('output', metavar='OUTPUT', type=str, nargs=1,
+                        help='Path to the JSON file to write.')
+
+    parser.add_argument('--repeat', dest='repeat', type=int, default=3,
+                        help='Number of times each benchmark is run. The fastest run is reported. Default 3.')
+
+    parser.add_argument('--filter', dest='filter', type=str, default="",
+                        help='Only run the benchmarks whose name matches this regular expression.')
+
+    parser.add_argument('--quick', dest='quick', action='store_const', const=True, default=False,
+                        help='Only run the smallest size of each benchmark.')
+
+    args = parser.parse_args()
+    if args.repeat < 1:
+        print("The number of repeats must be at least 1.")
+        sys.exit(1)
+
+    run(args)
@@ -17,6 +17,7 @@ import testresult
 import os
 import shutil
 import random
+import numpy as np
 
 
 def getSourceDir():
@@ -33,7 +34,11 @@ def getSourceDir():
 TABLE_FIELDS = ['date', 'name', 'type', 'host', 'environment', 'runner',
                  'revision', 'commitid', 'runtime', 'cpu_fraction',
                  'success',
-                 'status', 'logarchive', 'variables']
+                 'status', 'logarchive', 'variables', 'peak_memory']
+
+# Indexes of the TestRuns table: name and columns
+TABLE_INDEXES = [('TestRunsNameRevision', 'name, revision'),
+                 ('TestRunsRevision', 'revision')]
 
 
 # The default path to the database file
@@ -198,6 +203,36 @@ def add_revision():
     return get_latest_revison()
 
 
+def get_history(name, last_num=-1):
+    """Return the performance history of a test, averaged over
+    the runs of each revision.
+    Parameters
+    ----------
+        name :: full name of the test
+        last_num :: only get this many of the latest revisions.
+                if < 0, then get everything
+
+    Returns
+    -------
+        revisions :: array of revisions, sorted increasing
+        runtimes :: array of the runtime at each revision
+        peak_memories :: array of the peak memory at each revision
+    """
+    db = SQLgetConnection()
+    c = db.cursor()
+    query = ("SELECT revision, AVG(runtime), AVG(peak_memory) FROM TestRuns WHERE name = ? "
+             "GROUP BY revision ORDER BY revision DESC")
+    if last_num > 0:
+        query += " LIMIT %d" % last_num
+    c.execute(query, (name,))
+    rows = c.fetchall()[::-1]
+    c.close()
+    revisions = np.array([row[0] for row in rows], dtype=int)
+    runtimes = np.array([row[1] for row in rows], dtype=float)
+    peak_memories = np.array([row[2] or 0.0 for row in rows], dtype=float)
+    return revisions, runtimes, peak_memories
+
+
 def get_all_test_names(where_clause=""):
     """Returns a set containing all the UNIQUE test names in the database.
     ----
@@ -231,8 +266,10 @@ def setup_database():
     runtime DOUBLE, cpu_fraction DOUBLE,
     success BOOL,
     status VARCHAR(50), logarchive VARCHAR(80),
-    variables VARCHAR(200)
+    variables VARCHAR(200),
+    peak_memory DOUBLE
     ); """)
+    create_indexes(c)
 
     # Now a table that is just one entry per run (a fake "revision")
 
@@ -242,6 +279,29 @@ def setup_database():
     ); """)
 
 
+def create_indexes(cursor):
+    """ Create the indexes of the TestRuns table, if they do not exist yet """
+    for index_name, columns in TABLE_INDEXES:
+        cursor.execute("CREATE INDEX IF NOT EXISTS %s ON TestRuns (%s);" % (index_name, columns))
+
+
+def upgrade_database():
+    """ Bring a database created by an older version of these scripts up to date:
+    add the columns which are missing from the TestRuns table and create its indexes.
+    The existing results are kept.
+    """
+    db = SQLgetConnection()
+    c = db.cursor()
+    c.execute("PRAGMA table_info(TestRuns);")
+    columns = [row[1] for row in c.fetchall()]
+    if 'peak_memory' not in columns:
+        c.execute("ALTER TABLE TestRuns ADD COLUMN peak_memory DOUBLE;")
+    create_indexes(c)
+    db.commit()
+    c.close()
+    db.close()
+
+
 ###########################################################################
 # A class to report the results of system tests to the Mantid Test database
 # (requires sqlite3 module)
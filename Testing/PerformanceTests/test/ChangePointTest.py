@@ -0,0 +1,85 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Unit tests of the change-point detection of the performance histories. Run with
+    python -m unittest discover -s Testing/PerformanceTests/test -p "*Test.py"
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+import changepoint  # noqa: E402
+
+
+class ChangePointTest(unittest.TestCase):
+
+    def test_single_step_is_found(self):
+        values = [10.0] * 20 + [12.0] * 20
+
+        change_points, _ = changepoint.find_change_points(values)
+
+        self.assertEqual(1, len(change_points))
+        self.assertEqual(20, change_points[0].index)
+        self.assertAlmostEqual(10.0, change_points[0].before)
+        self.assertAlmostEqual(12.0, change_points[0].after)
+
+    def test_constant_history_has_no_change(self):
+        change_points, noise = changepoint.find_change_points([5.0] * 30)
+
+        self.assertEqual([], change_points)
+        self.assertEqual(0.01, noise)
+
+    def test_noisy_history_without_change_has_no_change(self):
+        values = 10.0 * np.exp(np.random.RandomState(42).normal(0.0, 0.05, 100))
+
+        change_points, noise = changepoint.find_change_points(values)
+
+        self.assertEqual([], change_points)
+        self.assertAlmostEqual(0.05, noise, delta=0.015)
+
+    def test_step_is_found_in_noisy_history(self):
+        noise = np.exp(np.random.RandomState(42).normal(0.0, 0.05, 80))
+        values = np.concatenate([np.full(50, 10.0), np.full(30, 13.0)]) * noise
+
+        change_points, _ = changepoint.find_change_points(values)
+
+        self.assertEqual(1, len(change_points))
+        self.assertLessEqual(abs(change_points[0].index - 50), 1)
+        self.assertAlmostEqual(13.0 / 10.0, change_points[0].after / change_points[0].before, delta=0.05)
+        self.assertGreater(change_points[0].score, 5.0)
+
+    def test_single_outlier_is_not_a_change(self):
+        values = [10.0] * 20 + [30.0] + [10.0] * 20
+
+        change_points, _ = changepoint.find_change_points(values)
+
+        self.assertEqual([], change_points)
+
+    def test_too_few_points_have_no_change(self):
+        for values in ([], [1.0], [1.0, 2.0], [1.0, 2.0, 4.0]):
+            change_points, noise = changepoint.find_change_points(values)
+            self.assertEqual([], change_points)
+            self.assertGreaterEqual(noise, 0.01)
+        self.assertIsNone(changepoint.detect_recent_change([1.0, 2.0]))
+
+    def test_recent_change_is_reported_once_confirmed(self):
+        history = [10.0] * 20 + [12.0]
+
+        self.assertIsNone(changepoint.detect_recent_change(history))
+        change_point = changepoint.detect_recent_change(history + [12.0])
+        self.assertEqual(20, change_point.index)
+
+    def test_old_change_is_not_recent(self):
+        self.assertIsNone(changepoint.detect_recent_change([10.0] * 20 + [12.0] * 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,6 +58,7 @@ class TestResult(object):
                  runtime=0.0,
                  speed_up=0.0,
                  cpu_fraction=0.0,
+                 peak_memory=0.0,
                  iterations=1,
                  success=False,
                  status="",
@@ -75,6 +76,7 @@ class TestResult(object):
         self.data["commitid"] = commitid
         self.data["runtime"] = runtime
         self.data["cpu_fraction"] = cpu_fraction
+        self.data["peak_memory"] = peak_memory
         self.data["success"] = success
         self.data["status"] = status
         self.data["log_contents"] = log_contents
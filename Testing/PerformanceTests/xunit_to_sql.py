@@ -6,9 +6,18 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 """ Module to convert XUnit XML to SQL database of test results of the same type used
-by python system tests """
+by python system tests.
+
+Results of Python benchmarks are read from JSON files of the form
+
+    {"results": [{"name": "Project.Suite.Case", "runtime": 1.5, "peak_memory": 250.0}, ...]}
+
+where runtime is in seconds and peak_memory, the peak resident set size, is in MiB.
+The optional entries "cpu_fraction" and "variables" of each result are stored as well.
+"""
 
 import argparse
+import json
 import sys
 import os
 import sqlresults
@@ -71,10 +80,39 @@ def handle_suite(suite):
         handle_testcase(case, suite_name)
 
 
+def handle_benchmark(result):
+    """ Handle the result of one Python benchmark and save it to DB"""
+    tr = TestResult(date = datetime.datetime.now(),
+                 name=result["name"],
+                 type="performance",
+                 host=platform.uname()[1],
+                 environment=envAsString(),
+                 runner="python",
+                 revision=revision,
+                 commitid=commitid,
+                 runtime=float(result["runtime"]),
+                 cpu_fraction=float(result.get("cpu_fraction", 0.0)),
+                 peak_memory=float(result.get("peak_memory", 0.0)),
+                 success=True,
+                 status="",
+                 log_contents="",
+                 variables=result.get("variables", variables))
+    sql_reporter.dispatchResults(tr)
+
+
+def convert_json(filename):
+    """Convert a single JSON file of Python benchmark results to SQL db"""
+    print("Reading", filename)
+    with open(filename) as json_file:
+        results = json.load(json_file)["results"]
+    for result in results:
+        handle_benchmark(result)
+
+
 def convert_xml(filename):
     """Convert a single XML file to SQL db"""
     # Parse the xml
-    print "Reading", filename
+    print("Reading", filename)
     doc = parse(filename)
     suites = doc.getElementsByTagName("testsuite")
     for suite in suites:
@@ -84,7 +122,8 @@ def convert_xml(filename):
 #====================================================================================
 if __name__ == "__main__":
     # Parse the command line
-    parser = argparse.ArgumentParser(description='Add the contents of Xunit-style XML test result files to a SQL database.')
+    parser = argparse.ArgumentParser(description='Add the contents of Xunit-style XML test result files '
+                                     'and JSON Python benchmark result files to a SQL database.')
 
     parser.add_argument('--db', dest='db',
                         default="./MantidPerformanceTests.db",
@@ -100,7 +139,7 @@ if __name__ == "__main__":
 
     parser.add_argument('xmlpath', metavar='XMLPATH', type=str, nargs='+',
                         default="",
-                        help='Required: Path to the Xunit XML files.')
+                        help='Required: Path to the Xunit XML and JSON benchmark files.')
 
     args = parser.parse_args()
 
@@ -108,6 +147,8 @@ if __name__ == "__main__":
     sqlresults.set_database_filename(args.db)
     if not os.path.exists(args.db):
         sqlresults.setup_database()
+    else:
+        sqlresults.upgrade_database()
     # Set up the reporter
     sql_reporter = sqlresults.SQLResultReporter()
 
@@ -122,12 +163,15 @@ if __name__ == "__main__":
         xmldir = args.xmlpath[0]
         if not os.path.isabs(xmldir):
             xmldir = os.path.abspath(xmldir)
-        xmlfiles = glob.glob(os.path.join(xmldir, '*.xml'))
+        xmlfiles = glob.glob(os.path.join(xmldir, '*.xml')) + glob.glob(os.path.join(xmldir, '*.json'))
     else:
         xmlfiles = args.xmlpath
 
     # Convert each file
     for file in xmlfiles:
-        convert_xml(file)
+        if file.endswith('.json'):
+            convert_json(file)
+        else:
+            convert_xml(file)
 
 
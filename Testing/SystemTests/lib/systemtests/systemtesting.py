@@ -32,6 +32,7 @@ import datetime
 import difflib
 import importlib.util
 import inspect
+import json
 from mantid.api import FileFinder
 from mantid.api import FrameworkManager
 from mantid.kernel import config, MemoryStats, ConfigService
@@ -227,6 +228,8 @@ class MantidSystemTest(unittest.TestCase):
         self.__verifyRequiredFiles()
 
         self.__verifyMemory()
+        # Recorded by the runner to pack tests by memory in later runs
+        self.reportResult('required memory MB', '%g' % self.requiredMemoryMB())
 
         # A custom check for skipping the tests for other reasons
         if self.skipTests():
@@ -732,6 +735,9 @@ class TestSuite(object):
         self._result.addItem(['host_name', sysinfo[1]])
         self._result.addItem(['environment', envAsString()])
         self._result.status = 'skipped'  # the test has been skipped until it has been executed
+        # Wall-clock time in seconds and memory required by the last execution, if it ran
+        self.duration = None
+        self.required_memory_mb = 0.0
 
     name = property(lambda self: self._fqtestname)
     status = property(lambda self: self._result.status)
@@ -745,7 +751,9 @@ class TestSuite(object):
             script = TestScript(self._test_dir, self._modname, self._test_cls_name,
                                 exclude_in_pr_builds)
             # Start the new process and wait until it finishes
+            start = time.time()
             retcode, output = runner.start(script)
+            self.duration = time.time() - start
         else:
             retcode, output = TestRunner.SKIP_TEST, ""
 
@@ -781,6 +789,8 @@ class TestSuite(object):
             entries = line.split(MantidSystemTest.DELIMITER)
             if len(entries) == 3 and entries[0] == MantidSystemTest.PREFIX:
                 self._result.addItem([entries[1], entries[2]])
+                if entries[1] == 'required memory MB':
+                    self.required_memory_mb = float(entries[2])
 
     def setOutputMsg(self, msg=None):
         if msg is not None:
@@ -810,7 +820,8 @@ class TestManager(object):
                  exclude_in_pr_builds=None,
                  output_on_failure=False,
                  clean=False,
-                 list_of_tests=None):
+                 list_of_tests=None,
+                 durations_dict=None):
         '''Initialize a class instance'''
 
         # Runners and reporters
@@ -835,6 +846,8 @@ class TestManager(object):
         self._lastTestRun = 0
 
         self._tests = list_of_tests
+        # Optional dict-like object receiving the duration and required memory of each executed test
+        self._durations = durations_dict
 
     def _get_sub_dirs(self, parent_dir: str) -> List[pathlib.Path]:
         parent = pathlib.Path(self._config.testDir) / parent_dir
@@ -1028,6 +1041,9 @@ class TestManager(object):
         for suite in self._tests:
             if self.__shouldTest(suite):
                 suite.execute(self._runner, self._exclude_in_pr_builds)
+                # Skipped tests return straight away so their duration says nothing about the test
+                if self._durations is not None and suite.duration is not None and suite.status != "skipped":
+                    self._durations[suite.name] = {"duration": suite.duration, "memory_mb": suite.required_memory_mb}
             if suite.status == "success":
                 self._passedTests += 1
             elif suite.status == "skipped":
@@ -1272,17 +1288,124 @@ def using_gsl_v1():
     return GSL_VERSION.startswith('1')
 
 
+#########################################################################
+# Historical test durations used to schedule and shard the test modules
+#########################################################################
+def load_test_durations(filename):
+    '''
+    Read the durations file written by save_test_durations. Returns a dict
+    mapping test names to {"duration": seconds, "memory_mb": MB}, which is
+    empty if the file does not exist or cannot be read.
+    '''
+    if filename is None or not os.path.isfile(filename):
+        return {}
+    try:
+        with open(filename, 'r') as durations_file:
+            return json.load(durations_file)
+    except (IOError, ValueError) as exc:
+        print("Unable to read test durations from '{}': {}".format(filename, exc))
+        return {}
+
+
+def save_test_durations(filename, durations, new_durations):
+    '''
+    Update the durations file with the results of this run. Tests that did
+    not run keep their previous entry.
+    '''
+    durations = dict(durations)
+    durations.update(new_durations)
+    try:
+        with open(filename, 'w') as durations_file:
+            json.dump(durations, durations_file, indent=1, sort_keys=True)
+    except IOError as exc:
+        print("Unable to write test durations to '{}': {}".format(filename, exc))
+
+
+def estimate_module_costs(test_list, durations):
+    '''
+    Estimate the run time and peak memory of each test module from the
+    durations of its tests in previous runs. Tests without a recorded
+    duration are assumed to take the median recorded duration, or 1 second
+    if nothing has been recorded, so without history modules are ordered by
+    their number of tests.
+
+    :param test_list: dict of module name to list of TestSuite
+    :param durations: dict as returned by load_test_durations
+    :returns: dict of module name to (seconds, memory in MB)
+    '''
+    known = sorted(entry["duration"] for entry in durations.values())
+    default_duration = known[len(known) // 2] if known else 1.0
+
+    costs = dict()
+    for module, tests in test_list.items():
+        entries = [durations.get(test.name, {}) for test in tests]
+        costs[module] = (sum(entry.get("duration", default_duration) for entry in entries),
+                         max([entry.get("memory_mb", 0.0) for entry in entries] + [0.0]))
+    return costs
+
+
+def schedule_test_modules(costs):
+    '''
+    Order the test modules longest first so that long tests do not start last
+    and dominate the total run time. Ties are broken by name so that every
+    shard computes the same order.
+    '''
+    return sorted(costs, key=lambda module: (-costs[module][0], module))
+
+
+def shard_test_modules(costs, shard_index, number_of_shards):
+    '''
+    Split the test modules into number_of_shards groups of similar total
+    duration and return the modules of group shard_index (0-based). All shards
+    must use the same durations to get disjoint groups.
+    '''
+    totals = [0.0] * number_of_shards
+    shard_modules = []
+    for module in schedule_test_modules(costs):
+        # Give the module to the least loaded shard (lowest index on ties)
+        shard = totals.index(min(totals))
+        totals[shard] += costs[module][0]
+        if shard == shard_index:
+            shard_modules.append(module)
+    return shard_modules
+
+
+def restrict_to_shard(test_list, test_counts, test_stats, costs, shard_index, number_of_shards):
+    '''
+    Remove the test modules of the other shards from the test list, counts and
+    costs, and the tests they contain from the test statistics, in place.
+    Tests of other shards are not counted as skipped in this one.
+
+    :param test_list: dict of module name to list of TestSuite
+    :param test_counts: dict of module name to number of tests
+    :param test_stats: list of [number of tests, longest name, number of tests including skipped]
+    :param costs: dict as returned by estimate_module_costs
+    :param shard_index: index of the shard to keep (0-based)
+    :param number_of_shards: number of shards the modules are split into
+    '''
+    shard_modules = shard_test_modules(costs, shard_index, number_of_shards)
+    for module in list(test_list.keys()):
+        if module not in shard_modules:
+            test_stats[0] -= len(test_list[module])
+            test_stats[2] -= len(test_list[module])
+            del test_list[module]
+            del test_counts[module]
+            del costs[module]
+
+
 #########################################################################
 # Function to keep a pool of threads active in a loop to run the tests.
 # Each thread starts a loop and gathers a first test module from the
 # master test list which is stored in the tests_dict shared dictionary,
-# starting with the number in the module list equal to the process id.
+# in which the modules are ordered with the longest first.
 #
 # Each process then checks if all the data files required by the current
 # test module are available (i.e. have not been locked by another
 # thread). If all files are unlocked, the thread proceeds with that test
 # module. If not, it goes further down the list until it finds a module
-# whose files are all available.
+# whose files are all available. A module is also passed over if its
+# memory requirement, added to that of the modules currently running,
+# exceeds the memory limit, unless nothing else is running.
 #
 # Once it has completed the work in the current module, it checks if the
 # number of modules that remains to be executed is greater than 0. If
@@ -1293,12 +1416,13 @@ def using_gsl_v1():
 #########################################################################
 def testThreadsLoop(mtdconf, options, tests_dict, tests_lock, tests_left, res_array,
                     stat_dict, total_number_of_tests, maximum_name_length, tests_done,
-                    process_number, lock, required_files_dict, locked_files_dict):
+                    process_number, lock, required_files_dict, locked_files_dict,
+                    durations_dict=None, memory_in_use=None, memory_limit_mb=0):
     try:
         testThreadsLoopImpl(mtdconf, options, tests_dict, tests_lock, tests_left,
                             res_array, stat_dict, total_number_of_tests, maximum_name_length,
                             tests_done, process_number, lock, required_files_dict,
-                            locked_files_dict)
+                            locked_files_dict, durations_dict, memory_in_use, memory_limit_mb)
         exit_code = 0
     except Exception as exc:
         import traceback
@@ -1311,7 +1435,8 @@ def testThreadsLoop(mtdconf, options, tests_dict, tests_lock, tests_left, res_ar
 
 def testThreadsLoopImpl(mtdconf, options, tests_dict, tests_lock, tests_left, res_array,
                         stat_dict, total_number_of_tests, maximum_name_length, tests_done,
-                        process_number, lock, required_files_dict, locked_files_dict):
+                        process_number, lock, required_files_dict, locked_files_dict,
+                        durations_dict=None, memory_in_use=None, memory_limit_mb=0):
     reporter = XmlResultReporter(showSkipped=options.showskipped,
                                  total_number_of_tests=total_number_of_tests,
                                  maximum_name_length=maximum_name_length)
@@ -1333,9 +1458,8 @@ def testThreadsLoopImpl(mtdconf, options, tests_dict, tests_lock, tests_left, re
         local_test_list = None
         # Get the lock to inspect the global list of tests
         lock.acquire()
-        # Run through the list of test modules, starting from the ith
-        # element where i is the process number.
-        for i in range(process_number, len(tests_lock)):
+        # Run through the list of test modules, longest first
+        for i in range(len(tests_lock)):
             # If the lock for this particular module is 0, it means
             # this module has not yet been run and it will be chosen
             # for this particular loop
@@ -1347,13 +1471,19 @@ def testThreadsLoopImpl(mtdconf, options, tests_dict, tests_lock, tests_left, re
                     if locked_files_dict[f]:
                         no_files_are_locked = False
                         break
+                # Check the module fits in memory alongside the modules that are running
+                module_memory = tests_dict[str(i)][2]
+                fits_in_memory = memory_in_use is None or memory_limit_mb <= 0 or memory_in_use.value == 0 \
+                    or memory_in_use.value + module_memory <= memory_limit_mb
                 # If all files are available, we can proceed with this module
-                if no_files_are_locked:
+                if no_files_are_locked and fits_in_memory:
                     # Lock the data files for this test module
                     for f in required_files_dict[modname]:
                         locked_files_dict[f] = True
+                    if memory_in_use is not None:
+                        memory_in_use.value += module_memory
                     # Set the current test list to the chosen module
-                    test_sub_directory, local_test_list = tests_dict[str(i)]
+                    test_sub_directory, local_test_list, _ = tests_dict[str(i)]
                     tests_lock[i] = 1
                     imodule = i
                     tests_left.value -= 1
@@ -1389,7 +1519,8 @@ def testThreadsLoopImpl(mtdconf, options, tests_dict, tests_lock, tests_left, re
                               showSkipped=options.showskipped,
                               output_on_failure=options.output_on_failure,
                               clean=options.clean,
-                              list_of_tests=local_test_list)
+                              list_of_tests=local_test_list,
+                              durations_dict=durations_dict)
 
             try:
                 mgr.executeTests(tests_done)
@@ -1409,7 +1540,12 @@ def testThreadsLoopImpl(mtdconf, options, tests_dict, tests_lock, tests_left, re
             lock.acquire()
             for f in required_files_dict[modname]:
                 locked_files_dict[f] = False
+            if memory_in_use is not None:
+                memory_in_use.value -= module_memory
             lock.release()
+        else:
+            # Wait for a running module to release its files or memory
+            time.sleep(0.1)
 
     # Report the errors
     local_dict = dict()
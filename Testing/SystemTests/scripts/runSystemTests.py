@@ -27,6 +27,57 @@ DATA_DIRS_LIST_PATH = os.path.join(THIS_MODULE_DIR, "datasearch-directories.txt"
 SAVE_DIR_LIST_PATH = os.path.join(THIS_MODULE_DIR, "defaultsave-directory.txt")
 
 
+def shard_type(value):
+    """Parse a shard specification of the form i/N with 1 <= i <= N"""
+    try:
+        index, number = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Shard must be given as i/N, e.g. 1/4, got '{}'".format(value))
+    if number < 1 or not 1 <= index <= number:
+        raise argparse.ArgumentTypeError("Shard index must be between 1 and N, got '{}'".format(value))
+    return index, number
+
+
+def get_durations_file(durations_file, save_dir):
+    """Return the file storing the test durations, by default in the save directory"""
+    if durations_file is None:
+        return os.path.join(save_dir, "systemtest-durations.json")
+    return durations_file
+
+
+def get_memory_limit(systemtesting, memory_limit):
+    """Return the memory in MB shared by the tests run in parallel, by default the memory available now"""
+    if memory_limit is None:
+        return systemtesting.MemoryStats().availMem() // 1024
+    return memory_limit
+
+
+def order_test_modules(systemtesting, test_list, test_counts, test_stats, durations, shard=None):
+    """
+    Estimate the cost of each test module from the durations of previous runs, keep only the modules
+    of the given shard and order them longest first. test_list, test_counts and test_stats are updated
+    in place when a shard is given.
+
+    :param systemtesting: the system testing framework module
+    :param shard: (i, N) to run part i of N of the test modules, or None to run them all
+    :returns: dict of module name to (seconds, memory in MB) and the list of module names, longest first
+    """
+    module_costs = systemtesting.estimate_module_costs(test_list, durations)
+    if shard is not None:
+        shard_index, number_of_shards = shard
+        systemtesting.restrict_to_shard(test_list, test_counts, test_stats, module_costs, shard_index - 1,
+                                        number_of_shards)
+        print("Running shard {} of {}: {} test modules".format(shard_index, number_of_shards, len(test_list)))
+    return module_costs, systemtesting.schedule_test_modules(module_costs)
+
+
+def remove_xml_reports(save_dir):
+    """Cleanup any pre-existing XML reporter files"""
+    for file in os.listdir(save_dir):
+        if file.startswith('TEST-systemtests-') and file.endswith('.xml'):
+            os.remove(os.path.join(save_dir, file))
+
+
 def kill_children(processes):
     for process in processes:
         process.terminate()
@@ -131,6 +182,22 @@ def main():
                         dest="exclude_in_pr_builds",
                         action="store_true",
                         help="Skip tests that are not run in pull request builds")
+    parser.add_argument("--shard",
+                        dest="shard",
+                        type=shard_type,
+                        help="Only run part i of N of the test modules, e.g. 2/4. The modules are split into parts of "
+                        "similar total duration, so every shard must use the same durations file.")
+    parser.add_argument("--durations-file",
+                        dest="durations_file",
+                        help="File storing the duration and required memory of each test, used to run the longest "
+                        "tests first. It is updated at the end of every run "
+                        "(default=<savedir>/systemtest-durations.json)")
+    parser.add_argument("--memory-limit",
+                        dest="memory_limit",
+                        type=float,
+                        help="Memory in MB shared by the tests run in parallel. Modules are not started together if "
+                        "their recorded memory requirements add up to more than this. Default is the memory "
+                        "available at start.")
     parser.add_argument("--ignore-failed-imports",
                         dest="ignore_failed_imports",
                         action="store_true",
@@ -199,6 +266,12 @@ def main():
     test_counts, test_list, test_sub_directories, test_stats, files_required_by_test_module, data_file_lock_status = \
         tmgr.generateMasterTestList(["framework", "qt"])
 
+    # Order the modules longest first using the durations of previous runs
+    durations_file = get_durations_file(options.durations_file, mtdconf.saveDir)
+    durations = systemtesting.load_test_durations(durations_file)
+    module_costs, ordered_modules = order_test_modules(systemtesting, test_list, test_counts, test_stats, durations,
+                                                       options.shard)
+
     number_of_test_modules = len(test_list.keys())
     total_number_of_tests = test_stats[0]
     maximum_name_length = test_stats[1]
@@ -211,11 +284,7 @@ def main():
     if options.clean:
         print("Performing cleanup run")
 
-    # Cleanup any pre-existing XML reporter files
-    entries = os.listdir(mtdconf.saveDir)
-    for file in entries:
-        if file.startswith('TEST-systemtests-') and file.endswith('.xml'):
-            os.remove(os.path.join(mtdconf.saveDir, file))
+    remove_xml_reports(mtdconf.saveDir)
 
     if not options.dry_run:
         # Multi-core processes --------------
@@ -243,13 +312,17 @@ def main():
         locked_files_dict = manager.dict()
         for key in data_file_lock_status.keys():
             locked_files_dict[key] = data_file_lock_status[key]
+        # A shared dict to store the duration and required memory of the tests that are run
+        new_durations_dict = manager.dict()
+        # A shared value with the memory required by the modules that are running
+        memory_in_use = Value('i', 0)
+        memory_limit = get_memory_limit(systemtesting, options.memory_limit)
 
-        # Store in reverse number of number of tests in each module into the shared dictionary
-        reverse_sorted_dict = [(k, test_counts[k])
-                               for k in sorted(test_counts, key=test_counts.get, reverse=True)]
+        # Store the modules into the shared dictionary, longest first
         counter = 0
-        for key, value in reverse_sorted_dict:
-            tests_dict[str(counter)] = tuple([test_sub_directories[key], test_list[key]])
+        for key in ordered_modules:
+            value = test_counts[key]
+            tests_dict[str(counter)] = tuple([test_sub_directories[key], test_list[key], int(module_costs[key][1])])
             counter += 1
             if not options.quiet:
                 print("Test module {} has {} tests:".format(key, value))
@@ -266,7 +339,8 @@ def main():
                 Process(target=systemtesting.testThreadsLoop,
                         args=(mtdconf, options, tests_dict, tests_lock, tests_left, results_array,
                               status_dict, total_number_of_tests, maximum_name_length, tests_done,
-                              ip, lock, required_files_dict, locked_files_dict)))
+                              ip, lock, required_files_dict, locked_files_dict, new_durations_dict, memory_in_use,
+                              memory_limit)))
         # Start and join processes
         exitcodes = []
         try:
@@ -284,6 +358,10 @@ def main():
             print("Unexpected exception occured: {}".format(e))
             kill_children(processes)
 
+        # Record the durations for scheduling the next run
+        if not options.clean:
+            systemtesting.save_test_durations(durations_file, durations, dict(new_durations_dict))
+
         # test processes could have failed to even start the tests. In this case skip printing the results
         if systemtesting.TESTING_PROC_FAILURE_CODE in exitcodes:
             sys.exit("\nFailed to execute tests. See traceback for more details.")
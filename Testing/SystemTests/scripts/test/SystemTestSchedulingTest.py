@@ -0,0 +1,122 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Unit tests of the scheduling and sharding of the system test modules. Run with
+    python -m unittest discover -s Testing/SystemTests/scripts/test -p "*Test.py"
+"""
+import argparse
+from collections import namedtuple
+import os
+import sys
+import unittest
+
+THIS_MODULE_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(THIS_MODULE_DIR, ".."))
+sys.path.append(os.path.join(THIS_MODULE_DIR, "..", "..", "lib", "systemtests"))
+
+import runSystemTests  # noqa: E402
+import systemtesting  # noqa: E402
+
+FakeTestSuite = namedtuple("FakeTestSuite", "name")
+
+
+def _make_test_list(tests_per_module):
+    return {module: [FakeTestSuite("{}.{}".format(module, name)) for name in names]
+            for module, names in tests_per_module.items()}
+
+
+class SystemTestSchedulingTest(unittest.TestCase):
+
+    def test_module_costs_use_recorded_durations_and_memory(self):
+        test_list = _make_test_list({"A": ["t1", "t2"], "B": ["t1"]})
+        durations = {"A.t1": {"duration": 10.0, "memory_mb": 100.0},
+                     "A.t2": {"duration": 5.0, "memory_mb": 300.0},
+                     "B.t1": {"duration": 2.0}}
+
+        costs = systemtesting.estimate_module_costs(test_list, durations)
+
+        self.assertEqual(costs, {"A": (15.0, 300.0), "B": (2.0, 0.0)})
+
+    def test_unknown_tests_take_the_median_duration(self):
+        test_list = _make_test_list({"A": ["t1", "new"], "B": ["t1"], "C": ["t1"]})
+        durations = {"A.t1": {"duration": 1.0}, "B.t1": {"duration": 4.0}, "C.t1": {"duration": 9.0}}
+
+        costs = systemtesting.estimate_module_costs(test_list, durations)
+
+        self.assertEqual(costs["A"][0], 5.0)
+
+    def test_without_history_modules_are_ordered_by_number_of_tests(self):
+        test_list = _make_test_list({"A": ["t1"], "B": ["t1", "t2", "t3"], "C": ["t1", "t2"]})
+
+        costs = systemtesting.estimate_module_costs(test_list, {})
+
+        self.assertEqual(systemtesting.schedule_test_modules(costs), ["B", "C", "A"])
+
+    def test_schedule_is_longest_first_with_ties_broken_by_name(self):
+        costs = {"D": (1.0, 0.0), "B": (5.0, 0.0), "A": (5.0, 0.0), "C": (7.0, 0.0)}
+
+        self.assertEqual(systemtesting.schedule_test_modules(costs), ["C", "A", "B", "D"])
+
+    def test_shards_are_disjoint_and_balanced(self):
+        costs = {"A": (8.0, 0.0), "B": (7.0, 0.0), "C": (6.0, 0.0), "D": (5.0, 0.0), "E": (4.0, 0.0)}
+
+        shards = [systemtesting.shard_test_modules(costs, index, 2) for index in range(2)]
+
+        self.assertEqual(shards, [["A", "D", "E"], ["B", "C"]])
+        self.assertEqual(sorted(shards[0] + shards[1]), sorted(costs))
+
+    def test_restrict_to_shard_removes_modules_of_other_shards(self):
+        test_list = _make_test_list({"A": ["t1", "t2"], "B": ["t1"]})
+        test_counts = {"A": 2, "B": 1}
+        test_stats = [3, 10, 5]
+        costs = {"A": (10.0, 0.0), "B": (1.0, 0.0)}
+
+        systemtesting.restrict_to_shard(test_list, test_counts, test_stats, costs, 1, 2)
+
+        self.assertEqual(list(test_list), ["B"])
+        self.assertEqual(test_counts, {"B": 1})
+        self.assertEqual(costs, {"B": (1.0, 0.0)})
+        # the tests of the other shard are neither run nor skipped
+        self.assertEqual(test_stats, [1, 10, 3])
+
+    def test_order_test_modules_of_shard(self):
+        test_list = _make_test_list({"A": ["t1"], "B": ["t1"], "C": ["t1"]})
+        test_counts = {"A": 1, "B": 1, "C": 1}
+        test_stats = [3, 10, 3]
+        durations = {"A.t1": {"duration": 1.0}, "B.t1": {"duration": 3.0}, "C.t1": {"duration": 2.0}}
+
+        costs, ordered_modules = runSystemTests.order_test_modules(systemtesting, test_list, test_counts, test_stats,
+                                                                   durations, shard=(2, 2))
+
+        self.assertEqual(ordered_modules, ["C", "A"])
+        self.assertEqual(sorted(costs), ["A", "C"])
+        self.assertEqual(test_stats, [2, 10, 2])
+
+    def test_order_test_modules_without_shard_keeps_every_module(self):
+        test_list = _make_test_list({"A": ["t1"], "B": ["t1", "t2"]})
+        test_stats = [3, 10, 3]
+
+        _, ordered_modules = runSystemTests.order_test_modules(systemtesting, test_list, {"A": 1, "B": 2}, test_stats,
+                                                               {})
+
+        self.assertEqual(ordered_modules, ["B", "A"])
+        self.assertEqual(test_stats, [3, 10, 3])
+
+    def test_shard_type(self):
+        self.assertEqual(runSystemTests.shard_type("2/4"), (2, 4))
+        for value in ("0/4", "5/4", "1/0", "1", "a/b"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                runSystemTests.shard_type(value)
+
+    def test_durations_file_defaults_to_save_directory(self):
+        self.assertEqual(runSystemTests.get_durations_file(None, "save"),
+                         os.path.join("save", "systemtest-durations.json"))
+        self.assertEqual(runSystemTests.get_durations_file("durations.json", "save"), "durations.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
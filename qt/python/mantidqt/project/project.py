@@ -33,6 +33,8 @@ class Project(AnalysisDataServiceObserver):
 
         self.__is_saving = False
         self.__is_loading = False
+        # Loads the workspaces of the last opened project while they are loaded in the background
+        self._lazy_workspace_loader = None
 
         # Last save locations
         self.last_project_location = None
@@ -126,6 +128,8 @@ class Project(AnalysisDataServiceObserver):
     def _save(self):
         self.__is_saving = True
         try:
+            # Save every workspace of the project, including those that are still being loaded
+            self._wait_for_lazy_workspace_loading()
             workspaces_to_save = self._get_workspace_names_to_save()
 
             if self.save_altered_workspaces_only:
@@ -235,13 +239,46 @@ class Project(AnalysisDataServiceObserver):
             self.last_project_location = file_name
             self.__saved = True
         finally:
-            self.__is_loading = False
+            if self._lazy_workspace_loader is None:
+                self.__is_loading = False
+            else:
+                # The project is loading until every workspace has been loaded in the background
+                self._lazy_workspace_loader.add_finished_callback(self._lazy_workspace_loading_finished)
 
     def _load(self, file_name):
+        if self._lazy_workspace_loader is not None:
+            # Finish loading the previous project first
+            task = BlockingAsyncTaskWithCallback(target=self._wait_for_lazy_workspace_loading,
+                                                 blocking_cb=QApplication.processEvents)
+            task.start()
         project_loader = ProjectLoader(self.project_file_ext)
+        lazy_load = ConfigService.getString("projectLoading.lazyWorkspaceLoading").lower() == "true"
         task = BlockingAsyncTaskWithCallback(target=project_loader.load_project, args=[file_name],
+                                             kwargs={"lazy_load": lazy_load},
                                              blocking_cb=QApplication.processEvents)
         task.start()
+        # Set before the project is marked as saved, so that workspaces added by the loader do not modify it
+        self._lazy_workspace_loader = project_loader.lazy_workspace_loader
+
+    def ensure_loaded(self, workspace_name):
+        """
+        Make sure a workspace of the last opened project is in the ADS, loading it straight away if it is still waiting
+        to be loaded in the background. Looking a workspace up in the ADS does not wait for the background loading, so
+        code that needs a workspace of the project while it is loading calls this first.
+        :param workspace_name: String; the name of the workspace
+        """
+        lazy_workspace_loader = self._lazy_workspace_loader
+        if lazy_workspace_loader is not None and not lazy_workspace_loader.is_loading_in_current_thread():
+            lazy_workspace_loader.ensure_loaded([workspace_name])
+
+    def _wait_for_lazy_workspace_loading(self):
+        lazy_workspace_loader = self._lazy_workspace_loader
+        if lazy_workspace_loader is not None:
+            lazy_workspace_loader.wait()
+
+    def _lazy_workspace_loading_finished(self):
+        self._lazy_workspace_loader = None
+        self.__is_loading = False
 
     def _load_file_dialog(self):
         return open_a_file_dialog(accept_mode=QFileDialog.AcceptOpen, file_mode=QFileDialog.ExistingFile,
@@ -295,6 +332,10 @@ class Project(AnalysisDataServiceObserver):
         The method that will be triggered if any of the changes in the ADS have occurred, that are checked for using the
         AnalysisDataServiceObserver class' observeAll method
         """
+        lazy_workspace_loader = self._lazy_workspace_loader
+        if lazy_workspace_loader is not None and lazy_workspace_loader.is_loading_in_current_thread():
+            # Loading the workspaces of the project does not modify it
+            return
         self.modified_project()
 
     def notify(self, *args):
@@ -11,7 +11,7 @@ import os
 from qtpy.QtCore import Qt
 
 from mantidqt.project.projectreader import ProjectReader
-from mantidqt.project.workspaceloader import WorkspaceLoader
+from mantidqt.project.workspaceloader import LazyWorkspaceLoader, WorkspaceLoader
 from mantidqt.project.plotsloader import PlotsLoader
 from mantidqt.project.decoderfactory import DecoderFactory
 from mantid import AnalysisDataService as ADS, logger
@@ -30,19 +30,37 @@ def _confirm_all_workspaces_loaded(workspaces_to_confirm):
     return True
 
 
+def _get_plotted_workspace_names(plot_list):
+    """
+    Find the workspaces that are needed to restore the plots of a project
+    :param plot_list: List of dicts; the plots as read from the project file
+    :return: List of Strings; the workspace names in the order they are first used
+    """
+    workspace_names = []
+    for plot_dict in plot_list if plot_list is not None else []:
+        for cargs_list in plot_dict.get("creationArguments", []):
+            for cargs in cargs_list:
+                if "workspaces" in cargs and cargs["workspaces"] not in workspace_names:
+                    workspace_names.append(cargs["workspaces"])
+    return workspace_names
+
+
 class ProjectLoader(object):
     def __init__(self, project_file_ext):
         self.project_reader = ProjectReader(project_file_ext)
         self.workspace_loader = WorkspaceLoader()
+        self.lazy_workspace_loader = None
         self.plot_loader = PlotsLoader()
         self.decoder_factory = DecoderFactory()
         self.project_file_ext = project_file_ext
 
-    def load_project(self, file_name, load_workspaces=True):
+    def load_project(self, file_name, load_workspaces=True, lazy_load=False):
         """
         Will load the project in the given file_name
         :param file_name: String or string castable object; the file_name of the project
         :param load_workspaces: Bool; True if you want ProjectLoader to handle loading workspaces else False.
+        :param lazy_load: Bool; If True only the workspaces needed by the plots are loaded before returning, the rest
+        are loaded in the background by self.lazy_workspace_loader.
         :return: Bool; True if all workspace loaded successfully, False if not loaded successfully.
         """
         # It can be expected that if at this point it is NoneType that it's an error
@@ -54,11 +72,14 @@ class ProjectLoader(object):
 
         directory = os.path.dirname(file_name)
         # Load in the workspaces
-        if load_workspaces:
-            self.workspace_loader.load_workspaces(directory=directory,
-                                                  workspaces_to_load=self.project_reader.workspace_names)
+        if load_workspaces and lazy_load:
+            workspace_success = self._load_workspaces_lazily(directory)
+        else:
+            if load_workspaces:
+                self.workspace_loader.load_workspaces(directory=directory,
+                                                      workspaces_to_load=self.project_reader.workspace_names)
 
-        workspace_success = _confirm_all_workspaces_loaded(workspaces_to_confirm=self.project_reader.workspace_names)
+            workspace_success = _confirm_all_workspaces_loaded(workspaces_to_confirm=self.project_reader.workspace_names)
 
         if workspace_success:
             # Load plots
@@ -67,10 +88,33 @@ class ProjectLoader(object):
 
             # Load interfaces
             if self.project_reader.interface_list is not None:
+                # Interfaces may use any of the workspaces
+                if self.lazy_workspace_loader is not None and self.project_reader.interface_list:
+                    self.lazy_workspace_loader.wait()
                 QAppThreadCall(self.load_interfaces)(directory)
 
         return workspace_success
 
+    def _load_workspaces_lazily(self, directory):
+        """
+        Load the workspaces used by the plots and start prefetching the others in the background
+        :param directory: String; the project directory
+        :return: Bool; True if the workspaces used by the plots loaded successfully
+        """
+        if self.project_reader.workspace_names is None:
+            return True
+
+        plotted_workspaces = _get_plotted_workspace_names(self.project_reader.plot_list)
+        self.lazy_workspace_loader = LazyWorkspaceLoader(directory, self.project_reader.workspace_names)
+        self.lazy_workspace_loader.ensure_loaded([name for name in plotted_workspaces
+                                                  if name in self.project_reader.workspace_names])
+        if not all(ADS.doesExist(name) for name in plotted_workspaces):
+            # Plotted workspaces that are members of a group are only available once all the groups are loaded
+            self.lazy_workspace_loader.wait()
+        self.lazy_workspace_loader.start_prefetch()
+
+        return _confirm_all_workspaces_loaded(workspaces_to_confirm=plotted_workspaces)
+
     def load_interfaces(self, directory):
         for interface in self.project_reader.interface_list:
             decoder = self.decoder_factory.find_decoder(interface["tag"])
@@ -7,7 +7,7 @@
 #  This file is part of the mantidqt package
 #
 import os
-from json import dump
+from json import dump, load
 
 from mantid import logger
 from mantid.api import AnalysisDataService as ADS
@@ -43,12 +43,16 @@ class ProjectSaver(object):
         directory = os.path.dirname(file_name)
         # Save workspaces to that location
         if project_recovery:
-            workspace_saver = WorkspaceSaver(directory=directory)
+            # Workspaces that have not changed since the project was last saved here are not written again
+            previous_tokens = self._read_workspace_tokens(file_name)
+            workspace_saver = WorkspaceSaver(directory=directory, previous_tokens=previous_tokens)
             workspace_saver.save_workspaces(workspaces_to_save=workspace_to_save)
             saved_workspaces = workspace_saver.get_output_list()
+            workspace_tokens = workspace_saver.get_token_dict()
         else:
             # Assume that this is project recovery so pass a list of workspace names
             saved_workspaces = ADS.getObjectNames()
+            workspace_tokens = None
 
         # Generate plots
         plots_to_save_list = PlotsSaver().save_plots(plots_to_save, not project_recovery)
@@ -64,9 +68,27 @@ class ProjectSaver(object):
                                plots_to_save=plots_to_save_list,
                                interfaces_to_save=interfaces,
                                save_location=file_name,
-                               project_file_ext=self.project_file_ext)
+                               project_file_ext=self.project_file_ext,
+                               workspace_tokens=workspace_tokens)
         writer.write_out()
 
+    def _read_workspace_tokens(self, file_name):
+        """
+        Read the workspace change tokens from an existing project file
+        :param file_name: String; The file_name of the project
+        :return: Dict; of workspace names to change tokens, empty if there is no previous project or it has no tokens
+        """
+        if self.project_file_ext not in os.path.basename(file_name):
+            file_name = file_name + self.project_file_ext
+        if not os.path.isfile(file_name):
+            return {}
+        try:
+            with open(file_name) as f:
+                return load(f).get("workspace_tokens", {})
+        except Exception as e:
+            logger.debug("Could not read workspace tokens from the previous project: {}".format(e))
+            return {}
+
     @staticmethod
     def _return_interfaces_dicts(directory, interfaces_to_save):
         interfaces = []
@@ -86,8 +108,10 @@ class ProjectSaver(object):
 
 
 class ProjectWriter(object):
-    def __init__(self, save_location, workspace_names, project_file_ext, plots_to_save, interfaces_to_save):
+    def __init__(self, save_location, workspace_names, project_file_ext, plots_to_save, interfaces_to_save,
+                 workspace_tokens=None):
         self.workspace_names = workspace_names
+        self.workspace_tokens = workspace_tokens
         self.file_name = save_location
         self.project_file_ext = project_file_ext
         self.plots_to_save = plots_to_save
@@ -99,6 +123,8 @@ class ProjectWriter(object):
         """
         # Get the JSON string versions
         to_save_dict = {"workspaces": self.workspace_names, "plots": self.plots_to_save, "interfaces": self.interfaces_to_save}
+        if self.workspace_tokens is not None:
+            to_save_dict["workspace_tokens"] = self.workspace_tokens
 
         # Open file and save the string to it alongside the workspace_names
         if self.project_file_ext not in os.path.basename(self.file_name):
@@ -222,6 +222,63 @@ class ProjectTest(unittest.TestCase):
                 pass
         self.assertFalse(self.project.is_loading)
 
+    def test_is_loading_until_lazily_loaded_workspaces_are_loaded(self):
+        lazy_workspace_loader = mock.MagicMock()
+
+        def fake_load(file_name):
+            self.project._lazy_workspace_loader = lazy_workspace_loader
+
+        with mock.patch.object(self.project, '_load_file_dialog', lambda: "project.mtdproj"):
+            with mock.patch.object(self.project, '_load', fake_load):
+                self.project.load()
+
+        self.assertTrue(self.project.is_loading)
+        self.assertTrue(self.project.saved)
+        finished_callback = lazy_workspace_loader.add_finished_callback.call_args[0][0]
+        finished_callback()
+        self.assertFalse(self.project.is_loading)
+
+    def test_workspaces_added_by_lazy_loading_do_not_modify_project(self):
+        self.project._lazy_workspace_loader = mock.MagicMock()
+        self.project._lazy_workspace_loader.is_loading_in_current_thread.return_value = True
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        self.assertTrue(self.project.saved)
+
+        self.project._lazy_workspace_loader.is_loading_in_current_thread.return_value = False
+        CreateSampleWorkspace(OutputWorkspace="ws2")
+        self.assertFalse(self.project.saved)
+
+    def test_ensure_loaded_loads_the_workspace_with_the_lazy_loader(self):
+        lazy_workspace_loader = mock.MagicMock()
+        lazy_workspace_loader.is_loading_in_current_thread.return_value = False
+        self.project._lazy_workspace_loader = lazy_workspace_loader
+
+        self.project.ensure_loaded("ws1")
+
+        lazy_workspace_loader.ensure_loaded.assert_called_once_with(["ws1"])
+
+    def test_ensure_loaded_does_nothing_in_the_loading_thread(self):
+        lazy_workspace_loader = mock.MagicMock()
+        lazy_workspace_loader.is_loading_in_current_thread.return_value = True
+        self.project._lazy_workspace_loader = lazy_workspace_loader
+
+        self.project.ensure_loaded("ws1")
+        self.project._lazy_workspace_loader = None
+        self.project.ensure_loaded("ws1")
+
+        lazy_workspace_loader.ensure_loaded.assert_not_called()
+
+    def test_save_waits_for_lazily_loaded_workspaces(self):
+        lazy_workspace_loader = mock.MagicMock()
+        self.project._lazy_workspace_loader = lazy_workspace_loader
+        self.project._get_project_size = mock.MagicMock(return_value=0)
+        self.project.last_project_location = os.path.join(tempfile.mkdtemp(), "project.mtdproj")
+        self._folders_to_remove.add(os.path.dirname(self.project.last_project_location))
+
+        self.project._save()
+
+        self.assertEqual(1, lazy_workspace_loader.wait.call_count)
+
     def test_is_saving_is_False_if_error_thrown_during_save(self):
         with mock.patch.object(self.project, '_get_project_size', lambda x: _raise(IOError)):
             try:
@@ -55,6 +55,23 @@ class ProjectLoaderTest(unittest.TestCase):
 
         self.assertEqual(ADS.getObjectNames(), ["ws1"])
 
+    def test_lazy_project_loading(self):
+        ADS.clear()
+        project_loader = projectloader.ProjectLoader(project_file_ext)
+
+        self.assertTrue(project_loader.load_project(working_project_file, lazy_load=True))
+        project_loader.lazy_workspace_loader.wait()
+
+        self.assertEqual(ADS.getObjectNames(), ["ws1"])
+
+    def test_get_plotted_workspace_names(self):
+        plot_list = [{"creationArguments": [[{"workspaces": "ws2", "specNum": 1}, {"function": "axhline"}],
+                                            [{"workspaces": "ws1"}, {"workspaces": "ws2"}]]},
+                     {"creationArguments": []}]
+
+        self.assertEqual(projectloader._get_plotted_workspace_names(plot_list), ["ws2", "ws1"])
+        self.assertEqual(projectloader._get_plotted_workspace_names(None), [])
+
     def test_confirm_all_workspaces_loaded(self):
         ws1_name = "ws1"
         ADS.addOrReplace(ws1_name, CreateSampleWorkspace(OutputWorkspace=ws1_name))
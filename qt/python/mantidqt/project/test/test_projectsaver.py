@@ -146,7 +146,23 @@ class ProjectSaverTest(unittest.TestCase):
 
         self.assertEqual(pwriter.call_args, mock.call(interfaces_to_save=[], plots_to_save=[],
                                                       project_file_ext=file_ext, save_location=working_project_file,
-                                                      workspace_names=['ws1']))
+                                                      workspace_names=['ws1'], workspace_tokens=None))
+
+    @mock.patch('mantidqt.project.workspacesaver.WorkspaceSaver._save_workspace')
+    def test_unchanged_workspaces_are_not_saved_again(self, save_workspace):
+        os.makedirs(working_directory)
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        project_saver = projectsaver.ProjectSaver(project_file_ext)
+        project_saver.save_project(workspace_to_save=["ws1"], file_name=working_project_file)
+        self.assertEqual(save_workspace.call_count, 1)
+        # The mocked saver does not write a file
+        open(os.path.join(working_directory, "ws1.nxs"), "w").close()
+
+        project_saver.save_project(workspace_to_save=["ws1"], file_name=working_project_file)
+
+        self.assertEqual(save_workspace.call_count, 1)
+        with open(working_project_file, "r") as f:
+            self.assertIn("ws1", json.load(f)["workspace_tokens"])
 
 
 class ProjectWriterTest(unittest.TestCase):
@@ -9,9 +9,10 @@
 
 import unittest
 
-from os.path import isdir
+from os.path import isdir, join
 from shutil import rmtree
 import tempfile
+from unittest import mock
 
 from mantid.api import AnalysisDataService as ADS
 from mantid.simpleapi import CreateSampleWorkspace
@@ -37,6 +38,67 @@ class WorkspaceLoaderTest(unittest.TestCase):
         workspace_loader.load_workspaces(self.working_directory, workspaces_to_load=[self.ws1_name])
         self.assertEqual(ADS.getObjectNames(), [self.ws1_name])
 
+    def _save_workspaces_and_clear(self, workspace_names):
+        for workspace_name in workspace_names:
+            CreateSampleWorkspace(OutputWorkspace=workspace_name)
+        project_saver = projectsaver.ProjectSaver(self.project_ext)
+        project_saver.save_project(workspace_to_save=workspace_names,
+                                   file_name=join(self.working_directory, "project" + self.project_ext))
+        ADS.clear()
+
+    def test_lazy_workspace_loading_only_loads_requested_workspaces(self):
+        self._save_workspaces_and_clear(["ws1", "ws2", "ws3"])
+        workspace_loader = workspaceloader.LazyWorkspaceLoader(self.working_directory, ["ws1", "ws2", "ws3"])
+
+        workspace_loader.ensure_loaded(["ws2"])
+
+        self.assertEqual(ADS.getObjectNames(), ["ws2"])
+        self.assertFalse(workspace_loader.is_pending("ws2"))
+        self.assertTrue(workspace_loader.is_pending("ws1"))
+
+    def test_lazy_workspace_loading_prefetches_remaining_workspaces(self):
+        self._save_workspaces_and_clear(["ws1", "ws2", "ws3"])
+        workspace_loader = workspaceloader.LazyWorkspaceLoader(self.working_directory, ["ws1", "ws2", "ws3"])
+
+        workspace_loader.ensure_loaded(["ws3"])
+        workspace_loader.start_prefetch()
+        workspace_loader.ensure_loaded(["ws1"])
+        workspace_loader.wait()
+
+        self.assertEqual(ADS.getObjectNames(), ["ws1", "ws2", "ws3"])
+        self.assertFalse(workspace_loader.is_pending("ws2"))
+
+    def test_looking_up_a_pending_workspace_does_not_load_it(self):
+        self._save_workspaces_and_clear(["ws1", "ws2"])
+        workspace_loader = workspaceloader.LazyWorkspaceLoader(self.working_directory, ["ws1", "ws2"])
+
+        self.assertFalse("ws2" in ADS)
+        self.assertRaises(KeyError, ADS.retrieve, "ws2")
+
+        self.assertTrue(workspace_loader.is_pending("ws2"))
+
+    def test_ensure_loaded_ignores_workspaces_not_in_the_project(self):
+        self._save_workspaces_and_clear(["ws1"])
+        workspace_loader = workspaceloader.LazyWorkspaceLoader(self.working_directory, ["ws1"])
+
+        workspace_loader.ensure_loaded(["not_in_project"])
+
+        self.assertEqual(ADS.getObjectNames(), [])
+        self.assertTrue(workspace_loader.is_pending("ws1"))
+
+    def test_lazy_workspace_loading_finishes_after_prefetch(self):
+        self._save_workspaces_and_clear(["ws1", "ws2"])
+        workspace_loader = workspaceloader.LazyWorkspaceLoader(self.working_directory, ["ws1", "ws2"])
+        finished_callback = mock.MagicMock()
+        workspace_loader.add_finished_callback(finished_callback)
+
+        workspace_loader.start_prefetch()
+        workspace_loader.wait()
+
+        self.assertTrue(workspace_loader.is_finished())
+        self.assertEqual(1, finished_callback.call_count)
+        self.assertEqual(ADS.getObjectNames(), ["ws1", "ws2"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -9,8 +9,8 @@
 
 import unittest
 
-from os import listdir
-from os.path import isdir
+from os import listdir, remove
+from os.path import isdir, join
 from shutil import rmtree
 import tempfile
 
@@ -19,7 +19,7 @@ from mantid.dataobjects import MDHistoWorkspace, MaskWorkspace  # noqa
 from mantidqt.project import workspacesaver
 from unittest import mock
 from mantid.simpleapi import (CreateSampleWorkspace, CreateMDHistoWorkspace, LoadMD, LoadMask, MaskDetectors,  # noqa
-                              ExtractMask, GroupWorkspaces)  # noqa
+                              ExtractMask, GroupWorkspaces, CreateEmptyTableWorkspace, CreateMDWorkspace)  # noqa
 
 
 class WorkspaceSaverTest(unittest.TestCase):
@@ -91,6 +91,89 @@ class WorkspaceSaverTest(unittest.TestCase):
         logger.warning.assert_called_with(u'Couldn\'t save workspace in project: "group2" because SaveNexusProcessed-v1: '
                                           u'NeXus files do not support nested groups of groups')
 
+    def test_unchanged_workspaces_are_skipped(self):
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        CreateSampleWorkspace(OutputWorkspace="ws2")
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory)
+        ws_saver.save_workspaces(["ws1", "ws2"])
+        tokens = ws_saver.get_token_dict()
+
+        MaskDetectors(Workspace="ws2", WorkspaceIndexList="0")
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory, previous_tokens=tokens)
+        ws_saver.save_workspaces(["ws1", "ws2"])
+
+        self.assertEqual(["ws1"], ws_saver.skipped_list)
+        self.assertEqual(["ws1", "ws2"], ws_saver.get_output_list())
+        self.assertEqual(tokens["ws1"], ws_saver.get_token_dict()["ws1"])
+        self.assertNotEqual(tokens["ws2"], ws_saver.get_token_dict()["ws2"])
+
+    def test_unchanged_workspace_is_saved_if_its_file_is_missing(self):
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory)
+        ws_saver.save_workspaces(["ws1"])
+        tokens = ws_saver.get_token_dict()
+        remove(join(self.working_directory, "ws1.nxs"))
+
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory, previous_tokens=tokens)
+        ws_saver.save_workspaces(["ws1"])
+
+        self.assertEqual([], ws_saver.skipped_list)
+        self.assertTrue("ws1.nxs" in listdir(self.working_directory))
+
+    def _assert_edit_changes_token(self, workspace, edit):
+        token = workspacesaver.get_change_token(workspace)
+        self.assertIsNotNone(token)
+        self.assertEqual(token, workspacesaver.get_change_token(workspace))
+
+        edit(workspace)
+
+        self.assertNotEqual(token, workspacesaver.get_change_token(workspace))
+
+    def test_token_changes_when_data_is_written_directly(self):
+        def edit(workspace):
+            workspace.dataY(0)[0] += 1.0
+
+        self._assert_edit_changes_token(CreateSampleWorkspace(), edit)
+
+    def test_token_changes_when_the_title_is_set(self):
+        self._assert_edit_changes_token(CreateSampleWorkspace(), lambda workspace: workspace.setTitle("new title"))
+
+    def test_token_changes_when_a_log_is_edited(self):
+        def edit(workspace):
+            workspace.mutableRun().addProperty("edited_log", 1.0, True)
+
+        self._assert_edit_changes_token(CreateSampleWorkspace(), edit)
+
+    def test_token_changes_when_a_table_cell_is_edited(self):
+        table = CreateEmptyTableWorkspace()
+        table.addColumn("double", "value")
+        table.addRow([1.0])
+
+        self._assert_edit_changes_token(table, lambda workspace: workspace.setCell(0, 0, 2.0))
+
+    def test_token_changes_when_an_md_histo_workspace_is_edited(self):
+        ws = CreateMDHistoWorkspace(SignalInput='1,2,3,4', ErrorInput='1,1,1,1', Dimensionality='2',
+                                    Extents='-1,1,-1,1', NumberOfBins='2,2', Names='A,B', Units='U,T')
+
+        self._assert_edit_changes_token(ws, lambda workspace: workspace.setSignalAt(0, 10.0))
+
+    def test_workspace_without_a_token_is_always_saved(self):
+        CreateMDWorkspace(Dimensions='2', Extents='-1,1,-1,1', Names='A,B', Units='U,T', OutputWorkspace="ws1")
+        CreateSampleWorkspace(OutputWorkspace="ws2")
+        GroupWorkspaces(InputWorkspaces="ws1,ws2", OutputWorkspace="group")
+        self.assertIsNone(workspacesaver.get_change_token(ADS.retrieve("ws1")))
+        self.assertIsNone(workspacesaver.get_change_token(ADS.retrieve("group")))
+
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory)
+        ws_saver.save_workspaces(["ws1"])
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory, previous_tokens=ws_saver.get_token_dict())
+        with mock.patch.object(ws_saver, "_save_workspace") as save_workspace:
+            ws_saver.save_workspaces(["ws1"])
+
+        save_workspace.assert_called_once_with("ws1", mock.ANY)
+        self.assertEqual({}, ws_saver.get_token_dict())
+        self.assertEqual([], ws_saver.skipped_list)
+
     def _load_MDWorkspace_and_test_it(self, save_name):
         filename = self.working_directory + '/' + save_name + ".nxs"
         ws = LoadMD(Filename=filename)
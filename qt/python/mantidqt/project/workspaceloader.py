@@ -6,6 +6,7 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 #  This file is part of the mantidqt package
 #
+import threading
 from os import path
 
 from mantid import logger
@@ -29,3 +30,140 @@ class WorkspaceLoader(object):
                 Load(path.join(directory, (workspace + ".nxs")), OutputWorkspace=workspace)
             except Exception:
                 logger.warning("Couldn't load file in project: " + workspace + ".nxs")
+
+
+class LazyWorkspaceLoader(object):
+    """
+    Loads the workspaces of a project on demand. Each workspace is registered as pending when the loader is created,
+    workspaces passed to ensure_loaded are loaded straight away and the remaining ones are loaded in order by a
+    background prefetch thread. A workspace is only ever loaded once.
+
+    Looking a workspace up in the ADS does not wait for it, so code that needs a workspace of the project while the
+    prefetch runs calls ensure_loaded first, which waits for the given workspaces only.
+    """
+    def __init__(self, directory, workspaces_to_load):
+        """
+        :param directory: String or string castable object; The project directory
+        :param workspaces_to_load: List of Strings; of the workspaces to load, in the order they should be prefetched
+        """
+        self.directory = directory
+        self._pending = list(workspaces_to_load) if workspaces_to_load is not None else []
+        # Events set once the workspace has been loaded, for workspaces that are being or have been loaded
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._prefetch_thread = None
+        self._finished = threading.Event()
+        self._finished_callbacks = []
+        # Records whether the current thread is loading a workspace
+        self._local = threading.local()
+
+    def is_pending(self, workspace_name):
+        """
+        :param workspace_name: String; the name of the workspace
+        :return: Bool; True if the workspace has not started loading yet
+        """
+        with self._lock:
+            return workspace_name in self._pending
+
+    def is_finished(self):
+        """
+        :return: Bool; True once the prefetch has loaded every workspace
+        """
+        return self._finished.is_set()
+
+    def is_loading_in_current_thread(self):
+        """
+        :return: Bool; True if the calling thread is loading a workspace of the project, so that changes to the ADS
+        made by the calling thread are made by the loader
+        """
+        return getattr(self._local, "loading", False)
+
+    def add_finished_callback(self, callback):
+        """
+        Call callback, without arguments, once the prefetch has loaded every workspace. It is called in the prefetch
+        thread, or straight away if the prefetch has already finished.
+        :param callback: Callable; the function to call
+        """
+        with self._lock:
+            if not self._finished.is_set():
+                self._finished_callbacks.append(callback)
+                return
+        callback()
+
+    def ensure_loaded(self, workspaces_to_load):
+        """
+        Load the given workspaces if they have not been loaded yet, waiting for any that are being prefetched.
+        Names that are not workspaces saved in the project, such as members of a group that has not been loaded,
+        are ignored.
+        :param workspaces_to_load: List of Strings; of the workspaces that are needed now
+        """
+        for workspace_name in workspaces_to_load:
+            if self._claim(workspace_name):
+                self._load(workspace_name)
+            else:
+                with self._lock:
+                    loaded = self._loading.get(workspace_name)
+                if loaded is not None:
+                    loaded.wait()
+
+    def start_prefetch(self):
+        """
+        Start loading the pending workspaces in a background thread.
+        """
+        if self._prefetch_thread is None:
+            self._prefetch_thread = threading.Thread(target=self._prefetch, name="ProjectWorkspacePrefetch")
+            self._prefetch_thread.daemon = True
+            self._prefetch_thread.start()
+
+    def wait(self):
+        """
+        Block until every workspace has been loaded.
+        """
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+        with self._lock:
+            pending = list(self._pending)
+        self.ensure_loaded(pending)
+
+    def _prefetch(self):
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        loading = list(self._loading.values())
+                        break
+                    workspace_name = self._pending[0]
+                if self._claim(workspace_name):
+                    self._load(workspace_name)
+            # Workspaces loaded on access by other threads
+            for loaded in loading:
+                loaded.wait()
+        finally:
+            self._finish()
+
+    def _finish(self):
+        with self._lock:
+            self._finished.set()
+            callbacks, self._finished_callbacks = self._finished_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:
+                logger.warning("Project Loader: error at the end of loading workspaces: " + str(exc))
+
+    def _claim(self, workspace_name):
+        # Mark the workspace as loading; returns False if it is not pending
+        with self._lock:
+            if workspace_name not in self._pending:
+                return False
+            self._pending.remove(workspace_name)
+            self._loading[workspace_name] = threading.Event()
+            return True
+
+    def _load(self, workspace_name):
+        self._local.loading = True
+        try:
+            WorkspaceLoader.load_workspaces(self.directory, [workspace_name])
+        finally:
+            self._local.loading = False
+            self._loading[workspace_name].set()
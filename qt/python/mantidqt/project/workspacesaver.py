@@ -6,27 +6,122 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 #  This file is part of the mantidqt package
 #
+import hashlib
 import os.path
 
-from mantid.api import AnalysisDataService as ADS, IMDEventWorkspace
+import numpy as np
+
+from mantid.api import (AnalysisDataService as ADS, IEventWorkspace, IMDEventWorkspace, IMDHistoWorkspace,
+                        ITableWorkspace, MatrixWorkspace, WorkspaceGroup)
 from mantid.dataobjects import MDHistoWorkspace
 from mantid import logger
 
 
+def get_change_token(workspace):
+    """
+    Returns a string that changes whenever the workspace changes, or None if that cannot be worked out. It is made of
+    the workspace type and a digest of its history, data, masking, metadata and logs, so that it changes both when an
+    algorithm is run on the workspace and when the workspace is edited directly, e.g. by writing to its data arrays,
+    setting its title or masking detectors in the instrument view. A group's token is made of the tokens of its
+    members. Workspace types whose content is not digested, such as MD event workspaces, have no token.
+    :param workspace: Workspace; the workspace to make the token for
+    :return: String; the change token, or None if the workspace has to be saved every time
+    """
+    if isinstance(workspace, WorkspaceGroup):
+        tokens = [get_change_token(workspace.getItem(i)) for i in range(workspace.getNumberOfEntries())]
+        return None if None in tokens else "[" + ",".join(tokens) + "]"
+
+    digest = hashlib.sha1()
+    try:
+        history = workspace.getHistory()
+        last_execution = str(history.lastAlgorithm().executionDate()) if history.size() > 0 else ""
+        _update_digest(digest, history.size(), last_execution, workspace.getTitle(), workspace.getComment())
+        if isinstance(workspace, MatrixWorkspace):
+            _update_digest_with_matrix_workspace(digest, workspace)
+        elif isinstance(workspace, ITableWorkspace):
+            _update_digest_with_table_workspace(digest, workspace)
+        elif isinstance(workspace, IMDHistoWorkspace):
+            _update_digest_with_md_histo_workspace(digest, workspace)
+        else:
+            return None
+    except Exception as exc:
+        logger.debug("Could not work out whether workspace \"" + workspace.name() + "\" has changed: " + str(exc))
+        return None
+    return "{}:{}".format(workspace.id(), digest.hexdigest())
+
+
+def _update_digest(digest, *values):
+    for value in values:
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            digest.update(str((value.dtype.str, value.shape)).encode())
+            digest.update(np.ascontiguousarray(value))
+        else:
+            digest.update(str(value).encode())
+        digest.update(b"|")
+
+
+def _update_digest_with_matrix_workspace(digest, workspace):
+    _update_digest(digest, workspace.YUnit(), workspace.YUnitLabel(), workspace.isDistribution(),
+                   workspace.getNumberHistograms(), workspace.getAxis(0).getUnit().unitID())
+    if workspace.axes() > 1:
+        axis = workspace.getAxis(1)
+        _update_digest(digest, axis.getUnit().unitID(), axis.extractValues())
+    if isinstance(workspace, IEventWorkspace):
+        _update_digest(digest, workspace.getNumberEvents())
+
+    run = workspace.getRun()
+    for name in sorted(run.keys()):
+        _update_digest(digest, name, run.getLogData(name).valueAsStr)
+
+    spectrum_info = workspace.spectrumInfo()
+    for index in range(workspace.getNumberHistograms()):
+        spectrum = workspace.getSpectrum(index)
+        _update_digest(digest, spectrum.getSpectrumNo(), sorted(spectrum.getDetectorIDs()), workspace.readX(index),
+                       workspace.readY(index), workspace.readE(index))
+        if workspace.hasDx(index):
+            _update_digest(digest, workspace.readDx(index))
+        if workspace.hasMaskedBins(index):
+            _update_digest(digest, workspace.maskedBinsIndices(index))
+        if spectrum_info.hasDetectors(index):
+            position = spectrum_info.position(index)
+            _update_digest(digest, spectrum_info.isMasked(index), position.X(), position.Y(), position.Z())
+
+
+def _update_digest_with_table_workspace(digest, workspace):
+    _update_digest(digest, workspace.getColumnNames(), workspace.columnTypes(), workspace.rowCount())
+    for column in range(workspace.columnCount()):
+        _update_digest(digest, [str(value) for value in workspace.column(column)])
+
+
+def _update_digest_with_md_histo_workspace(digest, workspace):
+    for index in range(workspace.getNumDims()):
+        dimension = workspace.getDimension(index)
+        _update_digest(digest, dimension.name, dimension.getUnits(), dimension.getMinimum(), dimension.getMaximum(),
+                       dimension.getNBins())
+    _update_digest(digest, workspace.getSignalArray(), workspace.getErrorSquaredArray(),
+                   workspace.getNumEventsArray())
+
+
 class WorkspaceSaver(object):
-    def __init__(self, directory):
+    def __init__(self, directory, previous_tokens=None):
         """
 
-        :param directory:
+        :param directory: String; The directory the workspaces are saved to
+        :param previous_tokens: Dict; of workspace names to the change tokens recorded when the project was last saved
+        to directory. Workspaces whose token has not changed, and whose file is still present, are not saved again.
+        Workspaces without a token are always saved.
         """
         self.directory = directory
+        self.previous_tokens = previous_tokens if previous_tokens is not None else {}
         self.output_list = []
+        self.token_dict = {}
+        self.skipped_list = []
 
     def save_workspaces(self, workspaces_to_save=None):
         """
-        Use the private method _get_workspaces_to_save to get a list of workspaces that are present in the ADS to save
-        to the directory that was passed at object creation time, it will also add each of them to the output_list
-        private instance variable on the WorkspaceSaver class.
+        Save the given workspaces that are present in the ADS to the directory that was passed at object creation
+        time, it will also add each of them to the output_list private instance variable on the WorkspaceSaver class.
+        Workspaces that have not changed since the previous save are skipped.
         :param workspaces_to_save: List of Strings; The workspaces that are to be saved to the project.
         """
 
@@ -37,21 +132,37 @@ class WorkspaceSaver(object):
         for workspace_name in workspaces_to_save:
             # Get the workspace from the ADS
             workspace = ADS.retrieve(workspace_name)
-            place_to_save_workspace = os.path.join(self.directory, workspace_name)
+            token = get_change_token(workspace)
+            self.output_list.append(workspace_name)
 
-            from mantid.simpleapi import SaveMD, SaveNexusProcessed
+            if token is None:
+                # Without a token the workspace cannot be shown to be unchanged, so it is always saved
+                self._save_workspace(workspace_name, workspace)
+                continue
 
-            try:
-                if isinstance(workspace, MDHistoWorkspace) or isinstance(workspace, IMDEventWorkspace):
-                    # Save normally using SaveMD
-                    SaveMD(InputWorkspace=workspace_name, Filename=place_to_save_workspace + ".nxs")
-                else:
-                    # Save normally using SaveNexusProcessed
-                    SaveNexusProcessed(InputWorkspace=workspace_name, Filename=place_to_save_workspace + ".nxs")
-            except Exception as exc:
-                logger.warning("Couldn't save workspace in project: \"" + workspace_name + "\" because " + str(exc))
+            self.token_dict[workspace_name] = token
+            if self.previous_tokens.get(workspace_name) == token and os.path.isfile(self._file_name(workspace_name)):
+                self.skipped_list.append(workspace_name)
+            else:
+                self._save_workspace(workspace_name, workspace)
 
-            self.output_list.append(workspace_name)
+    def _file_name(self, workspace_name):
+        return os.path.join(self.directory, workspace_name) + ".nxs"
+
+    def _save_workspace(self, workspace_name, workspace):
+        from mantid.simpleapi import SaveMD, SaveNexusProcessed
+
+        try:
+            if isinstance(workspace, MDHistoWorkspace) or isinstance(workspace, IMDEventWorkspace):
+                # Save normally using SaveMD
+                SaveMD(InputWorkspace=workspace_name, Filename=self._file_name(workspace_name))
+            else:
+                # Save normally using SaveNexusProcessed
+                SaveNexusProcessed(InputWorkspace=workspace_name, Filename=self._file_name(workspace_name))
+        except Exception as exc:
+            logger.warning("Couldn't save workspace in project: \"" + workspace_name + "\" because " + str(exc))
+            # Do not record a token so that the workspace is saved again next time
+            self.token_dict.pop(workspace_name, None)
 
     def get_output_list(self):
         """
@@ -59,3 +170,10 @@ class WorkspaceSaver(object):
         :return: List; String list of the workspaces that were saved
         """
         return self.output_list
+
+    def get_token_dict(self):
+        """
+        Get the change tokens of the saved workspaces
+        :return: Dict; of workspace names to change tokens
+        """
+        return self.token_dict
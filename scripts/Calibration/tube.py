@@ -378,12 +378,26 @@ def calibrate(ws, tubeSet, knownPositions, funcForm, **kwargs):
                outputPeak=peakTable)
       # now, peakTable has information for tube[1] and tube[2]
 
+    :param parallel: Fit the peaks of the tubes concurrently. The fits run as child algorithms, so nothing is stored \
+    in the AnalysisDataService, and the calibration and peak tables are filled in the order of the tubes in \
+    rangeList. It may be passed as True or 'threads' to use a pool of threads, or 'processes' to use a pool of \
+    processes. Tubes in plotTube or overridePeaks are fitted as usual. Default = False.
+
+    .. code-block:: python
+
+       calibTable = calibrate(ws, (omitted), parallel=True, max_workers=8)
+
+    :param max_workers: Maximum number of threads or processes when fitting in parallel. Default = None, the \
+    default of the pool.
+
     :rtype: calibrationTable, a TableWorkspace with two columns DetectorID(int) and DetectorPositions(V3D).
 
     """
     # Legacy code requires kwargs to contain only the list of parameters specify below. Thus, we pop other
     # arguments into temporary variables, such as `parameters_table_group`
     parameters_table_group = kwargs.pop('parameters_table_group') if 'parameters_table_group' in kwargs else None
+    parallel = kwargs.pop('parallel') if 'parallel' in kwargs else False
+    max_workers = kwargs.pop('max_workers') if 'max_workers' in kwargs else None
 
     FITPAR = 'fitPar'
     MARGIN = 'margin'
@@ -443,7 +457,7 @@ def calibrate(ws, tubeSet, knownPositions, funcForm, **kwargs):
 
     getCalibration(ws, tubeSet, calib_table, fit_par, ideal_tube, output_peak,
                    override_peaks, exclude_short_tubes, plot_tube, range_list, polin_fit,
-                   parameters_table_group=parameters_table_group)
+                   parameters_table_group=parameters_table_group, parallel=parallel, max_workers=max_workers)
 
     if delete_peak_table_after:
         DeleteWorkspace(str(output_peak))
@@ -17,14 +17,16 @@ Users should not need to directly call any other function other than :func:`getC
 ## Author: Karl palmen ISIS and for readPeakFile Gesner Passos ISIS
 
 # Standard and third-party
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import copy
 import numpy
 import os
 import re
+import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 # Mantid
-from mantid.api import AnalysisDataService as ADS
+from mantid.api import AlgorithmManager, AnalysisDataService as ADS
 from mantid.dataobjects import EventWorkspace, TableWorkspace, Workspace2D
 from mantid.simpleapi import *
 from mantid.kernel import *
@@ -101,12 +103,48 @@ def fit_end_erfc_params(B, C):  # Compose string argument for fit
     return "name=EndErfc, B={0}, C={1}".format(B, C)
 
 
+def _run_child_algorithm(name, **properties):
+    r"""
+    Execute an algorithm as a child algorithm, so that none of its output workspaces are stored in the
+    AnalysisDataService. Properties are set in the order they are passed.
+    """
+    algorithm = AlgorithmManager.createUnmanaged(name)
+    algorithm.initialize()
+    algorithm.setChild(True)
+    algorithm.setLogging(False)
+    for property_name, value in properties.items():
+        algorithm.setProperty(property_name, value)
+    algorithm.execute()
+    return algorithm
+
+
+def _fit(ws, function, start, end, output_ws, workspace_index=0, in_memory=False):
+    r"""
+    Fit a function to one spectrum of a workspace.
+
+    :param in_memory: if True, Fit runs as a child algorithm and its output workspaces are not stored in the
+        AnalysisDataService. Child fits can then run concurrently.
+    :return: the table of fitted parameters and the workspace holding the data, calculated and difference values
+    """
+    if not in_memory:
+        Fit(InputWorkspace=ws, Function=function, WorkspaceIndex=workspace_index, StartX=str(start), EndX=str(end),
+            Output=output_ws)
+        return ADS.retrieve(output_ws + '_Parameters'), ADS.retrieve(output_ws + '_Workspace')
+    fit = _run_child_algorithm('Fit', Function=function, InputWorkspace=ws, WorkspaceIndex=workspace_index,
+                               StartX=float(start), EndX=float(end), Output=output_ws, CreateOutput=True)
+    return fit.getProperty('OutputParameters').value, fit.getProperty('OutputWorkspace').value
+
+
 #
 # definition of the functions to fit
 #
 
 
 def fit_edges(fit_par, index, ws, output_ws):
+    return _fit_edges(fit_par, index, ws, output_ws)[0]
+
+
+def _fit_edges(fit_par, index, ws, output_ws, in_memory=False):
     # find the edge position
     centre = fit_par.getPeaks()[index]
     outer_edge, inner_edge, end_grad = fit_par.getEdgeParameters()
@@ -126,12 +164,16 @@ def fit_edges(fit_par, index, ws, output_ws):
         start = max(centre - inner_edge, 0)
         end = min(centre + outer_edge, right_limit)
         edgeMode = 1
-    Fit(InputWorkspace=ws, Function=fit_end_erfc_params(centre, end_grad * edgeMode), StartX=str(start), EndX=str(end),
-        Output=output_ws)
-    return 1  # peakIndex (center) -> parameter B of EndERFC
+    parameters, fitted_ws = _fit(ws, fit_end_erfc_params(centre, end_grad * edgeMode), start, end, output_ws,
+                                 in_memory=in_memory)
+    return 1, parameters, fitted_ws  # peakIndex (center) -> parameter B of EndERFC
 
 
 def fit_gaussian(fit_par, index, ws, output_ws):
+    return _fit_gaussian(fit_par, index, ws, output_ws)[0]
+
+
+def _fit_gaussian(fit_par, index, ws, output_ws, in_memory=False):
     # find the peak position
     centre = fit_par.getPeaks()[index]
     margin = fit_par.getMargin()
@@ -172,8 +214,7 @@ def fit_gaussian(fit_par, index, ws, output_ws):
         fit_msg = 'name=LinearBackground,A0=%f;name=Gaussian,Height=%f,PeakCentre=%f,Sigma=%f' % (
                   background, height, centre, width)
 
-        Fit(InputWorkspace=ws, Function=fit_msg,
-            StartX=str(start), EndX=str(end), Output=output_ws)
+        parameters, fitted_ws = _fit(ws, fit_msg, start, end, output_ws, in_memory=in_memory)
 
         peak_index = 3
 
@@ -187,15 +228,44 @@ def fit_gaussian(fit_par, index, ws, output_ws):
         # fit the input data as a linear background + gaussian fit
         # it was seen that the best result for static general fitParamters,
         # is to divide the values in two fitting steps
-        Fit(InputWorkspace=ws, Function='name=LinearBackground,A0=%f' % background,
-            StartX=str(start), EndX=str(end), Output='Z1')
-        Fit(InputWorkspace='Z1_Workspace',
-            Function='name=Gaussian,Height=%f,PeakCentre=%f,Sigma=%f' % (height, centre, width),
-            WorkspaceIndex=2, StartX=str(start), EndX=str(end), Output=output_ws)
-        CloneWorkspace(output_ws + '_Workspace', OutputWorkspace='gauss_' + str(index))
+        _, background_ws = _fit(ws, 'name=LinearBackground,A0=%f' % background, start, end, 'Z1',
+                                in_memory=in_memory)
+        parameters, fitted_ws = _fit(background_ws,
+                                     'name=Gaussian,Height=%f,PeakCentre=%f,Sigma=%f' % (height, centre, width),
+                                     start, end, output_ws, workspace_index=2, in_memory=in_memory)
+        if not in_memory:
+            CloneWorkspace(output_ws + '_Workspace', OutputWorkspace='gauss_' + str(index))
         peak_index = 1
 
-    return peak_index
+    return peak_index, parameters, fitted_ws
+
+
+def _fit_points(points_ws, func_forms, fit_params, in_memory=False, show_plot=False):
+    r"""
+    Fit the peaks and edges of one tube, returning their positions and, if `show_plot`, the fitted curves
+    """
+    calib_points_ws = 'CalibPoint'
+    results = []
+    fitt_y_values = []
+    fitt_x_values = []
+
+    # Loop over the points
+    for i in range(len(func_forms)):
+        if func_forms[i] == 2:
+            # find the edge position
+            peak_index, parameters, fitted_ws = _fit_edges(fit_params, i, points_ws, calib_points_ws,
+                                                           in_memory=in_memory)
+        else:
+            peak_index, parameters, fitted_ws = _fit_gaussian(fit_params, i, points_ws, calib_points_ws,
+                                                              in_memory=in_memory)
+        peak_centre = tuple(parameters.row(peak_index).items())[1][1]
+        results.append(peak_centre)
+
+        if show_plot:
+            fitt_y_values.append(copy.copy(fitted_ws.dataY(1)))
+            fitt_x_values.append(copy.copy(fitted_ws.dataX(1)))
+
+    return results, fitt_x_values, fitt_y_values
 
 
 def getPoints(integrated_ws, func_forms, fit_params, which_tube, show_plot=False):
@@ -224,25 +294,7 @@ def getPoints(integrated_ws, func_forms, fit_params, which_tube, show_plot=False
     if len(counts_y) == 0:
         return
     get_points_ws = CreateWorkspace(range(len(counts_y)), counts_y, OutputWorkspace='TubePlot')
-    calib_points_ws = 'CalibPoint'
-    results = []
-    fitt_y_values = []
-    fitt_x_values = []
-
-    # Loop over the points
-    for i in range(len(func_forms)):
-        if func_forms[i] == 2:
-            # find the edge position
-            peak_index = fit_edges(fit_params, i, get_points_ws, calib_points_ws)
-        else:
-            peak_index = fit_gaussian(fit_params, i, get_points_ws, calib_points_ws)
-        peak_centre = tuple(ADS.retrieve(calib_points_ws + '_Parameters').row(peak_index).items())[1][1]
-        results.append(peak_centre)
-
-        if show_plot:
-            ws = ADS.retrieve(calib_points_ws + '_Workspace')
-            fitt_y_values.append(copy.copy(ws.dataY(1)))
-            fitt_x_values.append(copy.copy(ws.dataX(1)))
+    results, fitt_x_values, fitt_y_values = _fit_points(get_points_ws, func_forms, fit_params, show_plot=show_plot)
 
     if show_plot:
         CreateWorkspace(OutputWorkspace='FittedData',
@@ -251,6 +303,53 @@ def getPoints(integrated_ws, func_forms, fit_params, which_tube, show_plot=False
     return results
 
 
+def get_points_in_memory(counts_y, func_forms, fit_params):
+    """
+    Get the centres of N slits or edges for calibration without using the AnalysisDataService
+
+    Same as :func:`getPoints`, but the fits run as child algorithms so that tubes can be fitted
+    concurrently, in threads or in separate processes.
+
+    :param counts_y: integrated counts of the pixels of one tube
+    :param func_forms: array of function form 1=slit/bar, 2=edge
+    :param fit_params: a TubeCalibFitParams object contain the fit parameters
+
+    :rtype: tuple with the array of the slit/edge positions and the time taken to fit them, in seconds
+    """
+    start_time = time.perf_counter()
+    counts_y = numpy.asarray(counts_y, dtype=float)
+    points_ws = _run_child_algorithm('CreateWorkspace', DataX=numpy.arange(len(counts_y), dtype=float),
+                                     DataY=counts_y, OutputWorkspace='TubePlot').getProperty('OutputWorkspace').value
+    results = _fit_points(points_ws, func_forms, fit_params, in_memory=True)[0]
+    return results, time.perf_counter() - start_time
+
+
+def fit_tubes_concurrently(tube_counts, func_forms, fit_params, parallel='threads', max_workers=None):
+    """
+    Fit the peaks and edges of several tubes concurrently
+
+    :param tube_counts: dictionary of tube index and integrated counts of the pixels of the tube
+    :param func_forms: array of function form 1=slit/bar, 2=edge
+    :param fit_params: a TubeCalibFitParams object contain the fit parameters
+    :param parallel: 'threads' to fit the tubes in a pool of threads, 'processes' to fit them in a pool of processes
+    :param max_workers: maximum number of threads or processes. Default None lets the pool decide.
+
+    :rtype: dictionary of tube index and tuple with the slit/edge positions and the fitting time in seconds,
+        with the same keys as `tube_counts` irrespective of the order in which the fits finished
+    """
+    if parallel == 'threads':
+        executor_type = ThreadPoolExecutor
+    elif parallel == 'processes':
+        executor_type = ProcessPoolExecutor
+    else:
+        raise ValueError("Wrong argument parallel='{0}'. Accepted values are 'threads' and "
+                         "'processes'".format(parallel))
+    with executor_type(max_workers=max_workers) as executor:
+        futures = {index: executor.submit(get_points_in_memory, counts_y, func_forms, fit_params)
+                   for index, counts_y in tube_counts.items()}
+        return {index: future.result() for index, future in futures.items()}
+
+
 def get_ideal_tube_from_n_slits(integrated_workspace, slits):
     """
        Given N slits for calibration on an ideal tube
@@ -509,7 +608,9 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
                    range_list: Optional[List[int]] = None,
                    polinFit: int = 2,
                    peaksTestMode: bool = False,
-                   parameters_table_group: Optional[str] = None) -> None:
+                   parameters_table_group: Optional[str] = None,
+                   parallel: Union[bool, str] = False,
+                   max_workers: Optional[int] = None) -> None:
     """
     Get the results the calibration and put them in the calibration table provided.
 
@@ -535,6 +636,12 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
         holds the goodness-of-fit, chi-square value. The name of each individual TableWorkspace is the string
         `parameters_table_group` plus the suffix `_I`, where `I` is the tube index as given by list `range_list`.
         If `None`, no group workspace is generated.
+    :param parallel: fit the peaks of the tubes concurrently, without storing the fit results in the
+        AnalysisDataService. `True` or 'threads' uses a pool of threads, 'processes' a pool of processes.
+        Tubes to be plotted or with overridden peaks are not part of the concurrent fits. The tables are
+        filled in the order of `range_list` irrespective of the order in which the fits finish.
+    :param max_workers: maximum number of threads or processes fitting tubes concurrently. Default None
+        lets the pool decide.
 
     This is the main method called from :func:`~tube.calibrate` to perform the calibration.
     """
@@ -547,6 +654,21 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
 
     all_skipped = set()
 
+    # fit the peaks of all eligible tubes concurrently, and collect the results for the loop below
+    fitted_tubes = dict()
+    if parallel:
+        tube_counts = dict()
+        for i in range_list:
+            wht = tubeSet.getTube(i)[0]
+            if len(wht) < 1 or tubeSet.getTubeLength(i) <= excludeShortTubes or i in overridePeaks or i in plotTube:
+                continue
+            tube_counts[i] = numpy.array([ws.dataY(j)[0] for j in wht])
+        start_time = time.perf_counter()
+        fitted_tubes = fit_tubes_concurrently(tube_counts, iTube.getFunctionalForms(), fitPar,
+                                              parallel='threads' if parallel is True else parallel,
+                                              max_workers=max_workers)
+        print("Fitted the peaks of", len(tube_counts), "tubes in %.3f seconds" % (time.perf_counter() - start_time))
+
     parameters_tables = list()  # hold the names of all the fit parameter tables
     for i in range_list:
 
@@ -573,10 +695,15 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
         # if this tube is to be override, get the peaks positions for this tube.
         if i in overridePeaks:
             actual_tube = overridePeaks[i]
+        elif i in fitted_tubes:
+            actual_tube, fit_time = fitted_tubes[i]
+            print("Peaks of tube", tubeSet.getTubeName(i), "fitted in %.3f seconds" % fit_time)
         else:
             # find the peaks positions
             plot_this_tube = i in plotTube
+            start_time = time.perf_counter()
             actual_tube = getPoints(ws, iTube.getFunctionalForms(), fitPar, wht, show_plot=plot_this_tube)
+            print("Peaks of tube", tubeSet.getTubeName(i), "fitted in %.3f seconds" % (time.perf_counter() - start_time))
             if plot_this_tube:
                 RenameWorkspace('FittedData', OutputWorkspace='FittedTube%d' % (i))
                 RenameWorkspace('TubePlot', OutputWorkspace='TubePlot%d' % (i))
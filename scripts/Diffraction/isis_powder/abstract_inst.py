@@ -225,6 +225,14 @@ class AbstractInst(object):
         """
         return common_enums.INPUT_BATCHING.Summed
 
+    def _get_focus_workers(self):
+        """
+        Returns the number of worker processes focusing individual runs in parallel. This is None
+        by default, which focuses the runs one after another in this process
+        :return: The number of worker processes or None
+        """
+        return None
+
     def _get_current_tt_mode(self):
         """
         Returns the current tt_mode this is only applicable
@@ -203,6 +203,9 @@ class Gem(AbstractInst):
     def _get_input_batching_mode(self):
         return self._inst_settings.input_batching
 
+    def _get_focus_workers(self):
+        return self._inst_settings.focus_workers
+
     def _get_unit_to_keep(self):
         return self._inst_settings.unit_to_keep
 
@@ -29,6 +29,7 @@ attr_mapping = [
     ParamMapEntry(ext_name="do_absorb_corrections", int_name="do_absorb_corrections"),
     ParamMapEntry(ext_name="file_ext", int_name="file_extension", optional=True),
     ParamMapEntry(ext_name="first_cycle_run_no", int_name="run_in_range"),
+    ParamMapEntry(ext_name="focus_workers", int_name="focus_workers", optional=True),
     ParamMapEntry(ext_name="focused_cropping_values", int_name="focused_cropping_values"),
     ParamMapEntry(ext_name="grouping_file_name", int_name="grouping_file_name"),
     ParamMapEntry(ext_name="gsas_calib_filename", int_name="gsas_calib_filename"),
@@ -21,6 +21,7 @@ attr_mapping = [
     ParamMapEntry(ext_name="do_van_normalisation", int_name="do_van_normalisation"),
     ParamMapEntry(ext_name="file_ext", int_name="file_extension", optional=True),
     ParamMapEntry(ext_name="first_cycle_run_no", int_name="run_in_range"),
+    ParamMapEntry(ext_name="focus_workers", int_name="focus_workers", optional=True),
     ParamMapEntry(ext_name="focused_cropping_values", int_name="focused_cropping_values"),
     ParamMapEntry(ext_name="focused_bin_widths", int_name="focused_bin_widths"),
     ParamMapEntry(ext_name="freq_params", int_name="freq_params", optional=True),
@@ -4,15 +4,25 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+from concurrent.futures import as_completed
+import hashlib
+import time
+
 from mantid.api import WorkspaceGroup
 import mantid.simpleapi as mantid
 from mantid.kernel import logger
+from mantid.utils.workerpool import create_worker_pool
 
 import isis_powder.routines.common as common
 from isis_powder.routines.common_enums import INPUT_BATCHING
 import numpy
 import os
 
+# The files each splined vanadium workspace on the ADS was loaded from: workspace name -> key of the files
+_vanadium_spline_keys = {}
+# Hashes of the contents of files: (path, modification time, size) -> hash
+_file_hashes = {}
+
 
 def focus(run_number_string, instrument, perform_vanadium_norm, absorb, sample_details=None):
     input_batching = instrument._get_input_batching_mode()
@@ -29,8 +39,6 @@ def focus(run_number_string, instrument, perform_vanadium_norm, absorb, sample_d
 def _focus_one_ws(input_workspace, run_number, instrument, perform_vanadium_norm, absorb, sample_details,
                   vanadium_path):
     run_details = instrument._get_run_details(run_number_string=run_number)
-    if perform_vanadium_norm:
-        _test_splined_vanadium_exists(instrument, run_details)
 
     # Subtract empty instrument runs, as long as this run isn't an empty, user hasn't turned empty subtraction off, or
     # The user has not supplied a sample empty
@@ -127,13 +135,8 @@ def _batched_run_focusing(instrument, perform_vanadium_norm, run_number_string,
                                                           instrument=instrument)
     run_details = instrument._get_run_details(run_number_string=run_number_string)
     vanadium_splines = None
-    van = "van_{}".format(run_details.vanadium_run_numbers)
     if perform_vanadium_norm:
-        if van not in mantid.mtd:
-            vanadium_splines = mantid.LoadNexus(Filename=run_details.splined_vanadium_file_path,
-                                                OutputWorkspace=van)
-        else:
-            vanadium_splines = mantid.mtd[van]
+        vanadium_splines = _load_vanadium_splines(instrument, run_details)
     output = None
     for ws in read_ws_list:
         output = _focus_one_ws(input_workspace=ws, run_number=run_number_string, instrument=instrument,
@@ -163,6 +166,8 @@ def _divide_one_spectrum_by_spline(spectrum, spline, instrument):
 
 
 def _divide_by_vanadium_splines(spectra_list, vanadium_splines, instrument):
+    # Each bank is divided separately: the banks are binned differently once focused and GEM crops each bank
+    # to its own vanadium peak. The loop is over the few banks, each division is over all the bins of a bank
     if hasattr(vanadium_splines, "OutputWorkspace"):
         vanadium_splines = vanadium_splines.OutputWorkspace
     if type(vanadium_splines) is WorkspaceGroup:  # vanadium splines is a workspacegroup
@@ -174,23 +179,24 @@ def _divide_by_vanadium_splines(spectra_list, vanadium_splines, instrument):
         output_list = [_divide_one_spectrum_by_spline(data_ws, van_ws, instrument)
                        for data_ws, van_ws in zip(spectra_list, vanadium_splines)]
         return output_list
+    # The splines are kept on the ADS to be shared by the following runs
     output_list = [_divide_one_spectrum_by_spline(spectra_list[0], vanadium_splines, instrument)]
-    common.remove_intermediate_workspace(vanadium_splines)
     return output_list
 
 
 def _individual_run_focusing(instrument, perform_vanadium_norm, run_number, absorb, sample_details):
     # Load and process one by one
     run_numbers = common.generate_run_numbers(run_number_string=run_number)
+    focus_workers = instrument._get_focus_workers()
+    if focus_workers and len(run_numbers) > 1:
+        return _parallel_run_focusing(instrument=instrument, perform_vanadium_norm=perform_vanadium_norm,
+                                      run_number_string=run_number, run_numbers=run_numbers, absorb=absorb,
+                                      sample_details=sample_details, max_workers=focus_workers)
+
     run_details = instrument._get_run_details(run_number_string=run_number)
     vanadium_splines = None
-    van = "van_{}".format(run_details.vanadium_run_numbers)
     if perform_vanadium_norm:
-        if van not in mantid.mtd:
-            vanadium_splines = mantid.LoadNexus(Filename=run_details.splined_vanadium_file_path,
-                                                OutputWorkspace=van)
-        else:
-            vanadium_splines = mantid.mtd[van]
+        vanadium_splines = _load_vanadium_splines(instrument, run_details)
 
     output = None
     for run in run_numbers:
@@ -201,6 +207,99 @@ def _individual_run_focusing(instrument, perform_vanadium_norm, run_number, abso
     return output
 
 
+def _focus_run_in_process(instrument, perform_vanadium_norm, run_number_string, run, absorb, sample_details):
+    """
+    Focuses a single run in a worker process. The focused data is saved to file by the instrument.
+    The splined vanadium is loaded by the first run a worker focuses and shared by its following runs.
+    :param run_number_string: The run numbers of the whole batch, which determine the vanadium
+    :param run: The run number to focus
+    :return: The run number and the wall-time spent focusing it
+    """
+    start_time = time.time()
+    vanadium_splines = None
+    if perform_vanadium_norm:
+        run_details = instrument._get_run_details(run_number_string=run_number_string)
+        vanadium_splines = _load_vanadium_splines(instrument, run_details)
+    workspaces_before = set(mantid.mtd.getObjectNames())
+
+    ws = common.load_current_normalised_ws_list(run_number_string=run, instrument=instrument)
+    _focus_one_ws(input_workspace=ws[0], run_number=run, instrument=instrument, absorb=absorb,
+                  perform_vanadium_norm=perform_vanadium_norm, sample_details=sample_details,
+                  vanadium_path=vanadium_splines)
+
+    # The output has been saved, free the memory for the next runs of the worker
+    for name in set(mantid.mtd.getObjectNames()) - workspaces_before:
+        if name in mantid.mtd:
+            mantid.DeleteWorkspace(name)
+    return run, time.time() - start_time
+
+
+def _parallel_run_focusing(instrument, perform_vanadium_norm, run_number_string, run_numbers, absorb, sample_details,
+                           max_workers):
+    """
+    Focuses independent runs in a pool of worker processes. Workspaces do not outlive the worker
+    processes, so the focused data is only saved to file and nothing is returned.
+    """
+    run_details = instrument._get_run_details(run_number_string=run_number_string)
+    if perform_vanadium_norm:
+        # Fail before starting any worker
+        _test_splined_vanadium_exists(instrument, run_details)
+
+    # The workers are given the data search and save directories of this process to find and save the runs
+    with create_worker_pool(max_workers) as executor:
+        futures = [executor.submit(_focus_run_in_process, instrument, perform_vanadium_norm, run_number_string, run,
+                                   absorb, sample_details) for run in run_numbers]
+        try:
+            for focused, future in enumerate(as_completed(futures), start=1):
+                run, wall_time = future.result()
+                logger.notice("Focused run {} ({} of {}) in {:.2f} s".format(run, focused, len(run_numbers), wall_time))
+        finally:
+            # Don't start the remaining runs if a run failed
+            for future in futures:
+                future.cancel()
+    return None
+
+
+def _load_vanadium_splines(instrument, run_details):
+    """
+    Loads the splined vanadium of a run. The workspace loaded for a previous run is reused
+    as long as it is on the ADS and the splined vanadium and offset files have not changed.
+    :param instrument: The instrument object
+    :param run_details: The run details of the run to focus
+    :return: The splined vanadium workspace
+    """
+    _test_splined_vanadium_exists(instrument, run_details)
+    van = "van_{}".format(run_details.vanadium_run_numbers)
+    key = (run_details.splined_vanadium_file_path, _hash_file(run_details.splined_vanadium_file_path),
+           run_details.offset_file_path, _hash_file(run_details.offset_file_path))
+    if van in mantid.mtd and _vanadium_spline_keys.get(van) == key:
+        return mantid.mtd[van]
+
+    vanadium_splines = mantid.LoadNexus(Filename=run_details.splined_vanadium_file_path, OutputWorkspace=van)
+    _vanadium_spline_keys[van] = key
+    return vanadium_splines
+
+
+def _hash_file(path):
+    """
+    :param path: The path to a file
+    :return: The hash of the contents of the file, which is only read again once the file has changed,
+             or None if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    stat_key = (path, stat.st_mtime_ns, stat.st_size)
+    if stat_key not in _file_hashes:
+        file_hash = hashlib.sha1()
+        with open(path, "rb") as hashed_file:
+            for block in iter(lambda: hashed_file.read(1 << 20), b""):
+                file_hash.update(block)
+        _file_hashes[stat_key] = file_hash.hexdigest()
+    return _file_hashes[stat_key]
+
+
 def _test_splined_vanadium_exists(instrument, run_details):
     # Check the necessary splined vanadium file has been created
     if not os.path.isfile(run_details.splined_vanadium_file_path):
@@ -0,0 +1,100 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import shutil
+import tempfile
+import unittest
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import mantid.simpleapi as mantid
+from isis_powder.routines import focus
+
+_RunDetails = namedtuple("_RunDetails", "vanadium_run_numbers splined_vanadium_file_path offset_file_path")
+
+
+def _fake_load_nexus(Filename, OutputWorkspace):
+    return mantid.CreateSampleWorkspace(OutputWorkspace=OutputWorkspace)
+
+
+class ISISPowderFocusTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._run_details = _RunDetails(vanadium_run_numbers="123",
+                                        splined_vanadium_file_path=self._write_file("splined_vanadium.nxs", "spline"),
+                                        offset_file_path=self._write_file("offsets.cal", "offsets"))
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+        mantid.mtd.clear()
+        focus._vanadium_spline_keys.clear()
+
+    def _write_file(self, name, content):
+        path = os.path.join(self._directory, name)
+        with open(path, "w") as out_file:
+            out_file.write(content)
+        return path
+
+    def test_splined_vanadium_is_loaded_once_for_unchanged_files(self):
+        with mock.patch.object(focus.mantid, "LoadNexus", side_effect=_fake_load_nexus) as load_nexus:
+            focus._load_vanadium_splines(instrument=None, run_details=self._run_details)
+            vanadium_splines = focus._load_vanadium_splines(instrument=None, run_details=self._run_details)
+
+        self.assertEqual(1, load_nexus.call_count)
+        self.assertEqual("van_123", vanadium_splines.name())
+
+    def test_splined_vanadium_is_loaded_again_when_the_offset_file_changes(self):
+        with mock.patch.object(focus.mantid, "LoadNexus", side_effect=_fake_load_nexus) as load_nexus:
+            focus._load_vanadium_splines(instrument=None, run_details=self._run_details)
+            self._write_file("offsets.cal", "new offsets")
+            focus._load_vanadium_splines(instrument=None, run_details=self._run_details)
+
+        self.assertEqual(2, load_nexus.call_count)
+
+    def test_splined_vanadium_is_loaded_again_when_deleted_from_the_ads(self):
+        with mock.patch.object(focus.mantid, "LoadNexus", side_effect=_fake_load_nexus) as load_nexus:
+            focus._load_vanadium_splines(instrument=None, run_details=self._run_details)
+            mantid.DeleteWorkspace("van_123")
+            focus._load_vanadium_splines(instrument=None, run_details=self._run_details)
+
+        self.assertEqual(2, load_nexus.call_count)
+
+    def test_missing_splined_vanadium_raises(self):
+        os.remove(self._run_details.splined_vanadium_file_path)
+
+        self.assertRaisesRegex(ValueError, "Processed vanadium runs not found", focus._load_vanadium_splines,
+                               instrument=None, run_details=self._run_details)
+
+    def test_parallel_focusing_focuses_every_run_in_the_worker_pool(self):
+        instrument = mock.Mock()
+        instrument._get_focus_workers.return_value = 2
+        with mock.patch.object(focus, "create_worker_pool", side_effect=ThreadPoolExecutor) as create_worker_pool, \
+                mock.patch.object(focus.common, "load_current_normalised_ws_list",
+                                  side_effect=lambda run_number_string, instrument: [run_number_string]), \
+                mock.patch.object(focus, "_focus_one_ws") as focus_one_ws:
+            output = focus._individual_run_focusing(instrument=instrument, perform_vanadium_norm=False,
+                                                    run_number="1-3", absorb=False, sample_details=None)
+
+        self.assertEqual(None, output)
+        create_worker_pool.assert_called_once_with(2)
+        focused_runs = [call[1]["input_workspace"] for call in focus_one_ws.call_args_list]
+        self.assertEqual(sorted(focus.common.generate_run_numbers("1-3")), sorted(focused_runs))
+
+    def test_parallel_focusing_raises_if_a_run_fails(self):
+        instrument = mock.Mock()
+        instrument._get_focus_workers.return_value = 2
+        with mock.patch.object(focus, "create_worker_pool", side_effect=ThreadPoolExecutor), \
+                mock.patch.object(focus.common, "load_current_normalised_ws_list",
+                                  side_effect=RuntimeError("Unable to find run")):
+            self.assertRaisesRegex(RuntimeError, "Unable to find run", focus._individual_run_focusing,
+                                   instrument=instrument, perform_vanadium_norm=False, run_number="1-3", absorb=False,
+                                   sample_details=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
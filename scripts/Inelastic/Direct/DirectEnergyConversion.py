@@ -10,9 +10,12 @@
 from mantid.simpleapi import *
 from mantid.kernel import funcinspect
 from mantid import geometry,api
+from mantid import __version__ as mantid_version
 
 import os.path
 import copy
+import hashlib
+import json
 import math
 import time
 import numpy as np
@@ -1850,6 +1853,13 @@ class DirectEnergyConversion(object):
            workspace in question or using cashed value
         """
         run = self.get_run_descriptor(run)
+        # The integrals saved by an earlier reduction replace loading and integrating the white beam run
+        cache_file = self._get_wb_integrals_cache_file(run)
+        if cache_file is not None and os.path.isfile(cache_file):
+            self.prop_man.log("do_white: loading white beam integrals from cache file {0}".format(cache_file),
+                              'information')
+            cached_ws = LoadNexusProcessed(Filename=cache_file,OutputWorkspace=run.set_action_suffix('_norm_white'))
+            run.synchronize_ws(cached_ws)
         white_ws = run.get_workspace()
         # This both integrates the workspace into one bin spectra and sets up
         # common bin boundaries for all spectra
@@ -1900,7 +1910,9 @@ class DirectEnergyConversion(object):
         # Why aren't we doing this...-> because integration does not work properly for event workspaces
         #Integration(white_ws, white_ws, RangeLower=low, RangeUpper=upp)
         AddSampleLog(white_ws,LogName = done_Log,LogText=done_log_VAL,LogType='String')
-        run.synchronize_ws(white_ws)
+        white_ws = run.synchronize_ws(white_ws)
+        if cache_file is not None:
+            self._save_wb_integrals_cache(white_ws,cache_file)
         if self._keep_wb_workspace:
             result = run.get_ws_clone()
         else:
@@ -1908,6 +1920,61 @@ class DirectEnergyConversion(object):
         return result
 #-------------------------------------------------------------------------------
 
+    def _get_wb_integrals_cache_file(self,run):
+        """Return the file to keep the white beam integrals of the run in between reductions, or None
+           if the integrals are not cached on disk.
+
+           The file name is the hash of everything the integrals depend on: the white beam run file,
+           the normalisation method, the integration range, the detector calibration and the
+           instrument definition. Only runs loaded from a single file are cached.
+        """
+        cache_dir = self.prop_man.wb_integrals_cache_dir
+        if not cache_dir or run.is_existing_ws() or run.run_number() is None:
+            return None
+#pylint: disable=protected-access
+        if run._run_list and self.prop_man.sum_runs:
+            return None
+        calibration = self.prop_man.det_cal_file
+        if not (calibration is None or isinstance(calibration,(str,int))):
+            return None # calibration workspace
+        found,white_file = run.find_file(self.prop_man,be_quet=True)
+        if not found:
+            return None
+
+        def file_state(file_name):
+            if not (isinstance(file_name,str) and os.path.isfile(file_name)):
+                return None
+            file_stat = os.stat(file_name)
+            return [file_name,file_stat.st_size,file_stat.st_mtime]
+        idf_file = api.ExperimentInfo.getInstrumentFilename(self.prop_man.instr_name)
+        parameters_file = os.path.join(os.path.dirname(idf_file),self.prop_man.instr_name + '_Parameters.xml')
+        cache_key = {'mantid_version':mantid_version,
+                     'white_run':file_state(white_file),
+                     'white_tag':self._build_white_tag(),
+                     'norm_mon_integration_range':self.prop_man.norm_mon_integration_range,
+                     'mon1_norm_spec':self.prop_man.mon1_norm_spec,
+                     'load_monitors_with_workspace':self.prop_man.load_monitors_with_workspace,
+                     'det_cal_file':file_state(calibration) or str(calibration),
+                     'instrument':[file_state(idf_file),file_state(parameters_file)]}
+        key_hash = hashlib.sha1(json.dumps(cache_key,sort_keys=True,default=str).encode()).hexdigest()
+        return os.path.join(cache_dir,'{0}{1}_wb_integrals_{2}.nxs'.format(self.prop_man.short_inst_name,
+                                                                             run.run_number(),key_hash[:16]))
+
+    def _save_wb_integrals_cache(self,white_ws,cache_file):
+        """Save the white beam integrals for later reductions. The file is written under a temporary name
+           and renamed, so that a reduction running concurrently never reads a partially written file.
+        """
+        temp_file = '{0}.{1}.tmp.nxs'.format(os.path.splitext(cache_file)[0],os.getpid())
+        try:
+            SaveNexusProcessed(InputWorkspace=white_ws,Filename=temp_file)
+            os.replace(temp_file,cache_file)
+        except (OSError,RuntimeError,ValueError) as err:
+            self.prop_man.log("*** Can not save white beam integrals to cache file {0}: {1}".format(cache_file,err),
+                              'warning')
+            if os.path.isfile(temp_file):
+                os.remove(temp_file)
+#-------------------------------------------------------------------------------
+
     def _build_white_tag(self):
         """build tag indicating wb-integration ranges """
         low,upp = self.wb_integr_range
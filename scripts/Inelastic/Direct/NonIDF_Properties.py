@@ -58,6 +58,7 @@ class NonIDF_Properties(object):
 
         object.__setattr__(self,'_current_log_level',3)
         object.__setattr__(self,'_archive_upload_log_file',None)
+        object.__setattr__(self,'_wb_integrals_cache_dir','')
 
         self._set_instrument_and_facility(Instrument,run_workspace)
 
@@ -221,6 +222,29 @@ class NonIDF_Properties(object):
             if report_failure:
                 self.log("archive upload file log {0} does not exist. Ignoring it.".format(filename), 'warning')
 
+    # -----------------------------------------------------------------------------
+    @property
+    def wb_integrals_cache_dir(self):
+        """ The folder where the white beam integrals are saved to be reused by later reductions
+            with the same white beam run and white beam processing parameters, e.g. by
+            autoreduction, which reduces every run in a new session.
+            Empty (default) if the integrals are not saved.
+        """
+        return self._wb_integrals_cache_dir
+
+    @wb_integrals_cache_dir.setter
+    def wb_integrals_cache_dir(self,folder):
+        if not folder:
+            folder = ''
+        elif not os.path.isdir(folder):
+            try:
+                os.makedirs(folder)
+            except OSError as err:
+                self.log("Can not create white beam integrals cache folder {0}: {1}. Integrals will not be cached."
+                         .format(folder,err), 'warning')
+                folder = ''
+        object.__setattr__(self,'_wb_integrals_cache_dir',folder)
+
     # -----------------------------------------------------------------------------
     # Service properties (used by class itself)
     # -----------------------------------------------------------------------------
@@ -0,0 +1,33 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import numpy as np
+
+"""
+   work arrays for the transforms in OPUS and TROPUS
+   the transform length SAVETIME_i2 is the same for every call within a run, so the
+   zero padded complex input arrays are allocated once and reused for every iteration.
+   numpy caches the FFT set-up for a given length, so repeated transforms of the same
+   length do not need to be planned again.
+"""
+
+
+class FFTBuffers(object):
+
+    def __init__(self, SAVETIME_i2):
+        self.SAVETIME_i2 = SAVETIME_i2
+        self._buffers = {}
+
+    def get(self, n, shape=()):
+        """
+        Returns a complex array of shape (SAVETIME_i2,) + shape to be filled in its first n rows.
+        Rows from n onwards are zero. They are never written to, so they stay zero when the
+        array is reused by a later call with the same n and shape.
+        """
+        key = (n, tuple(shape))
+        if key not in self._buffers:
+            self._buffers[key] = np.zeros((self.SAVETIME_i2,) + tuple(shape), dtype=np.complex_)
+        return self._buffers[key]
@@ -6,6 +6,8 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import numpy as np
 import math
+import time
+from Muon.MaxentTools.fft_buffers import FFTBuffers
 from Muon.MaxentTools.opus import OPUS
 from Muon.MaxentTools.tropus import TROPUS
 from Muon.MaxentTools.project import PROJECT
@@ -25,11 +27,15 @@ def warningMsg(values,name,mylog):
 
 
 def MAXENT(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, MAXPAGE_f, PULSESHAPE_convol,
-           DETECT_a, DETECT_b, DETECT_e, FAC_factor, FAC_facfake, SAVETIME_i2, mylog, prog):
+           DETECT_a, DETECT_b, DETECT_e, FAC_factor, FAC_facfake, SAVETIME_i2, mylog, prog, buffers=None, convergence=None):
+    # buffers: FFTBuffers reused by every transform, pass the same one in for repeated calls
+    # convergence: if a list, a row (cycle, iteration, test, entropy, chtarg, chisq, xsum, seconds) is appended per iteration
     npts, ngroups = datum.shape
     p = npts*ngroups
     xi = np.zeros([MAXPAGE_n, 3])
     eta = np.zeros([npts, ngroups, 3])
+    if(buffers is None):
+        buffers = FFTBuffers(SAVETIME_i2)
     #
     SPACE_blank = flat
     if(SPACE_blank != 0):
@@ -50,15 +56,16 @@ def MAXENT(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, M
     SPACE_chisq = SPACE_chizer*2. # temporary for 1st test
     mylog.debug("entering loop with spectrum from {0} to {1}".format(np.amin(MAXPAGE_f), np.amax(MAXPAGE_f)))
     while( HERITAGE_iter <= itermax and (HERITAGE_iter <= 1 or not (test < 0.02 and abs(SPACE_chisq/SPACE_chizer-1) < 0.01) ) ): # label 6
+        start_time = time.time()
         mylog.debug("start loop, iter={} ngo={} test={} chisq={}".format(HERITAGE_iter, SAVETIME_ngo, test, SPACE_chisq/SPACE_chizer))
         mylog.debug("entering loop with spectrum from {0} to {1}".format(np.amin(MAXPAGE_f), np.amax(MAXPAGE_f)))
-        ox = OPUS(MAXPAGE_f, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        ox = OPUS(MAXPAGE_f, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, buffers)
         warningMsg(ox,'ox',mylog)
         mylog.debug("ox from {0} to {1}".format(np.amin(ox), np.amax(ox)))
         a = ox-datum
         SPACE_chisq = np.sum(a**2/sigma**2)
         ox = 2*a/(sigma**2)
-        cgrad = TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        cgrad = TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, buffers)
         warningMsg(cgrad,'cgrad',mylog)
         mylog.debug("cgrad from {0} to {1}".format(np.amin(cgrad), np.amax(cgrad)))
         SPACE_xsum = np.sum(MAXPAGE_f)
@@ -92,18 +99,18 @@ def MAXENT(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, M
         if(sumfix):
             PROJECT(0, MAXPAGE_n, xi)
             PROJECT(1, MAXPAGE_n, xi)
-        eta[:,:, 0] = OPUS(xi[:, 0], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
-        eta[:,:, 1] = OPUS(xi[:, 1], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        # both search directions in a single transform
+        eta[:,:, :2] = OPUS(xi[:, :2], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, buffers)
         warningMsg(eta[:,:, 0],"eta[,,0]",mylog)
         warningMsg(eta[:,:, 1],"eta[,,1]",mylog)
         ox = eta[:,:, 1]/(sigma**2)
-        xi[:, 2] = TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        xi[:, 2] = TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, buffers)
         warningMsg(xi[:, 2],"xi[,2]", mylog)
         a = 1./math.sqrt(np.sum(xi[:, 2]**2*MAXPAGE_f))
         xi[:, 2] = xi[:, 2]*MAXPAGE_f*a
         if(sumfix):
             PROJECT(2, MAXPAGE_n, xi)
-        eta[:,:, 2] = OPUS(xi[:, 2], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        eta[:,:, 2] = OPUS(xi[:, 2], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, buffers)
         warningMsg(eta[:,:, 2],"eta[,,2]",mylog)
         # loop DO 17, DO 18
         SPACE_s1 = np.dot(sgrad, xi)
@@ -123,6 +130,7 @@ def MAXENT(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, M
         a = s*SPACE_blank*math.e/SPACE_xsum
         mylog.notice("{:3}    {:10.4}  {:10.4}  {:10.4}  {:10.4}  {:10.4}".format(HERITAGE_iter,
                      test, s, SPACE_chtarg, SPACE_chisq, SPACE_xsum))
+        report = (SAVETIME_ngo, HERITAGE_iter, test, s, SPACE_chtarg, SPACE_chisq, SPACE_xsum)
         SPACE_beta = np.array([-0.5*SPACE_c1[0]/SPACE_c2[0, 0], 0.0, 0.0])
         warningMsg(SPACE_beta,"SPACE_beta", mylog)
         if(HERITAGE_iter != 0):
@@ -135,6 +143,8 @@ def MAXENT(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, M
         a = np.sum(MAXPAGE_f)
         if(sumfix):
             MAXPAGE_f /= a
+        if(convergence is not None):
+            convergence.append(report + (time.time() - start_time,))
         # 50
         HERITAGE_iter += 1
         prog.report("chisq="+str(SPACE_chisq))
@@ -15,13 +15,14 @@ from Muon.MaxentTools.modbak import MODBAK
 from Muon.MaxentTools.modamp import MODAMP
 from Muon.MaxentTools.modab import MODAB
 from Muon.MaxentTools.outspec import OUTSPEC
+from Muon.MaxentTools.fft_buffers import FFTBuffers
 
 
 def MULTIMAX(
       POINTS_nhists, POINTS_ngroups, POINTS_npts, CHANNELS_itzero, CHANNELS_i1stgood, CHANNELS_itotal, RUNDATA_res, RUNDATA_frames,
       GROUPING_group, DATALL_rdata, FAC_factor, SENSE_taud, MAXPAGE_n, filePHASE,
       PULSES_def, PULSES_npulse, FLAGS_fitdead, FLAGS_fixphase, SAVETIME_i2,
-      OuterIter, InnerIter, mylog, prog, phaseconvWS, TZERO_fine,deadDetectors):
+      OuterIter, InnerIter, mylog, prog, phaseconvWS, TZERO_fine,deadDetectors, convergence=None):
     #
     base = np.zeros([MAXPAGE_n])
     (datum, sigma, corr, datt, MISSCHANNELS_mm, RUNDATA_fnorm, RUNDATA_hists, FAC_facfake, FAC_ratio) = INPUT(
@@ -35,13 +36,15 @@ def MULTIMAX(
         RUNDATA_hists, datum, sigma, DETECT_e, filePHASE, mylog)
     SAVETIME_ngo = -1
     MAXPAGE_f = None
+    # transform work arrays shared by all cycles
+    buffers = FFTBuffers(SAVETIME_i2)
     for j in range(OuterIter):  # outer "alpha chop" iterations?
         SAVETIME_ngo = SAVETIME_ngo + 1
         mylog.information("CYCLE NUMBER=" + str(SAVETIME_ngo))
         (sigma, base, HERITAGE_iter, MAXPAGE_f, FAC_factor, FAC_facfake) = MAXENT(
             datum, sigma, PULSES_def, base, InnerIter, False,
             SAVETIME_ngo, MAXPAGE_n, MAXPAGE_f, PULSESHAPE_convol, DETECT_a,
-            DETECT_b, DETECT_e, FAC_factor, FAC_facfake, SAVETIME_i2, mylog, prog)
+            DETECT_b, DETECT_e, FAC_factor, FAC_facfake, SAVETIME_i2, mylog, prog, buffers, convergence)
 
         if(FLAGS_fitdead):
             (datum, corr, DETECT_c, DETECT_d, SENSE_taud) = DEADFIT(
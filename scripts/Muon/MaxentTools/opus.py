@@ -7,12 +7,18 @@
 import numpy as np
 
 
-def OPUS(x, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e):
+def OPUS(x, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, buffers=None):
+    # x may have extra trailing axes to transform several spectra at once,
+    # the result then has the same trailing axes after the group axis
     npts = DETECT_e.shape[0]
     n = x.shape[0]
-    y = np.zeros([SAVETIME_i2], dtype=np.complex_)
-    y[:n] = x * PULSESHAPE_convol
-    y2 = np.fft.ifft(y) * SAVETIME_i2  # SN=+1, inverse FFT without the 1/N
-    ox = (np.outer(np.real(y2[:npts]), DETECT_a) + np.outer(
-        np.imag(y2[:npts]), DETECT_b)) * DETECT_e[:, np.newaxis]
+    extra = x.shape[1:]
+    if buffers is None:
+        y = np.zeros((SAVETIME_i2,) + extra, dtype=np.complex_)
+    else:
+        y = buffers.get(n, extra)
+    y[:n] = x * PULSESHAPE_convol.reshape((n,) + (1,) * len(extra))
+    y2 = np.fft.ifft(y, axis=0)[:npts] * SAVETIME_i2  # SN=+1, inverse FFT without the 1/N
+    ox = (np.einsum('t...,g->tg...', np.real(y2), DETECT_a) + np.einsum(
+        't...,g->tg...', np.imag(y2), DETECT_b)) * DETECT_e.reshape((npts, 1) + (1,) * len(extra))
     return ox
@@ -7,16 +7,21 @@
 import numpy as np
 
 
-def TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e):
-    npts, ngroups = ox.shape
+def TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, buffers=None):
+    # ox may have extra trailing axes after the group axis to transform several sets at once,
+    # the result then has the same trailing axes
+    npts, ngroups = ox.shape[:2]
+    extra = ox.shape[2:]
     n = PULSESHAPE_convol.shape[0]
-    y = np.zeros([SAVETIME_i2], dtype=np.complex_)
-    y[:npts] = np.dot(
-        ox,
-        DETECT_a) * DETECT_e + 1.j * np.dot(ox,
-                                            DETECT_b) * DETECT_e
-    y2 = np.fft.fft(y)  # SN=-1 meaning forward fft, scale is OK
-    x = np.real(y2)[:n] * np.real(PULSESHAPE_convol) + \
-        np.imag(y2)[:n] * np.imag(PULSESHAPE_convol)
+    if buffers is None:
+        y = np.zeros((SAVETIME_i2,) + extra, dtype=np.complex_)
+    else:
+        y = buffers.get(npts, extra)
+    e = DETECT_e.reshape((npts,) + (1,) * len(extra))
+    y[:npts] = np.tensordot(ox, DETECT_a, axes=(1, 0)) * e + 1.j * np.tensordot(ox, DETECT_b, axes=(1, 0)) * e
+    y2 = np.fft.fft(y, axis=0)[:n]  # SN=-1 meaning forward fft, scale is OK
+    convol = PULSESHAPE_convol.reshape((n,) + (1,) * len(extra))
+    x = np.real(y2) * np.real(convol) + \
+        np.imag(y2) * np.imag(convol)
 
     return x
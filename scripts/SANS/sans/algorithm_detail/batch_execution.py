@@ -4,10 +4,14 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import time
+from collections import namedtuple
+from concurrent.futures import as_completed
 from copy import deepcopy
 
 from mantid.api import AnalysisDataService, WorkspaceGroup
 from mantid.dataobjects import Workspace2D
+from mantid.utils.workerpool import create_worker_pool
 from sans.common.general_functions import (create_managed_non_child_algorithm,
                                            create_unmanaged_algorithm, get_output_name,
                                            get_base_name_from_multi_period_name, get_transmission_output_name,
@@ -60,6 +64,19 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
     """
     Runs a single reduction.
 
+    See _single_reduction_for_batch for the parameters.
+    :return: the scale factors and the shift factors of the reduction.
+    """
+    out_scale_factors, out_shift_factors, _ = _single_reduction_for_batch(state, use_optimizations, output_mode,
+                                                                          plot_results, output_graph,
+                                                                          save_can=save_can)
+    return out_scale_factors, out_shift_factors
+
+
+def _single_reduction_for_batch(state, use_optimizations, output_mode, plot_results, output_graph, save_can=False):
+    """
+    Runs a single reduction.
+
     This function creates reduction packages which essentially contain information for a single valid reduction, run it
     and store the results according to the user specified setting (output_mode). Although this is considered a single
     reduction it can contain still several reductions since the SANSState object can at this point contain slice
@@ -71,6 +88,7 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
                          with event slice compatibility
     :param output_graph: The graph object for plotting workspaces.
     :param save_can: bool. whether or not to save out can workspaces
+    :return: the scale factors, the shift factors and the names of the workspaces which were saved to file.
     """
     # ------------------------------------------------------------------------------------------------------------------
     # Load the data
@@ -166,11 +184,14 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
     # 3. Both:
     #    * This means that we need to save out the reduced data
     #    * The data is already on the ADS, so do nothing
+    saved_names = []
     if output_mode is OutputMode.SAVE_TO_FILE:
-        save_to_file(reduction_packages, save_can, additional_run_numbers, event_slice_optimisation=event_slice_optimisation)
+        saved_names = save_to_file(reduction_packages, save_can, additional_run_numbers,
+                                   event_slice_optimisation=event_slice_optimisation)
         delete_reduced_workspaces(reduction_packages)
     elif output_mode is OutputMode.BOTH:
-        save_to_file(reduction_packages, save_can, additional_run_numbers, event_slice_optimisation=event_slice_optimisation)
+        saved_names = save_to_file(reduction_packages, save_can, additional_run_numbers,
+                                   event_slice_optimisation=event_slice_optimisation)
 
     # -----------------------------------------------------------------------
     # Clean up other workspaces if the optimizations have not been turned on.
@@ -184,7 +205,60 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
         out_scale_factors.extend(reduction_package.out_scale_factor)
         out_shift_factors.extend(reduction_package.out_shift_factor)
 
-    return out_scale_factors, out_shift_factors
+    return out_scale_factors, out_shift_factors, saved_names
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Functions for the execution of a batch in worker processes
+# ----------------------------------------------------------------------------------------------------------------------
+BatchRowResult = namedtuple('BatchRowResult', 'index, out_scale_factors, out_shift_factors, saved_names, wall_time')
+
+
+def single_reduction_for_batch_in_process(index, serialized_state, use_optimizations, save_can=False):
+    """
+    Runs a single reduction of a batch in a worker process and saves the reduced data to file.
+
+    The state is passed as JSON since it has to be sent to the worker process.
+    :param index: the index of the row in the batch.
+    :param serialized_state: a SANSState object serialized with the Serializer.
+    :param use_optimizations: if true then the optimizations of child algorithms are enabled.
+    :param save_can: bool. whether or not to save out can workspaces
+    :return: a BatchRowResult.
+    """
+    start_time = time.time()
+    state = Serializer.from_json(serialized_state)
+    out_scale_factors, out_shift_factors, saved_names = \
+        _single_reduction_for_batch(state, use_optimizations, OutputMode.SAVE_TO_FILE, plot_results=False,
+                                    output_graph='', save_can=save_can)
+    return BatchRowResult(index, out_scale_factors, out_shift_factors, saved_names, time.time() - start_time)
+
+
+def reduce_batch_in_processes(states, use_optimizations, save_can=False, max_workers=None):
+    """
+    Reduces the rows of a batch in a pool of worker processes.
+
+    Each row is reduced independently of the others and its reduced data is saved to file, since workspaces do not
+    outlive the worker process. The results are yielded as the rows finish, hence not necessarily in the order of
+    the states. The worker processes are given the data search and save directories and the default facility and
+    instrument of this process.
+    :param states: a list of SANSState objects, one for each row.
+    :param use_optimizations: if true then the optimizations of child algorithms are enabled.
+    :param save_can: bool. whether or not to save out can workspaces
+    :param max_workers: the maximum number of worker processes. Defaults to the number of processors.
+    :return: a generator of BatchRowResult, one for each row.
+    """
+    serialized_states = [Serializer.to_json(state) for state in states]
+    with create_worker_pool(max_workers) as executor:
+        futures = [executor.submit(single_reduction_for_batch_in_process, index, serialized_state,
+                                   use_optimizations, save_can)
+                   for index, serialized_state in enumerate(serialized_states)]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Don't start the remaining rows if a row failed or the caller stopped listening
+            for future in futures:
+                future.cancel()
 
 
 def _get_ws_from_alg(reduction_alg, reduction_package):
@@ -1119,6 +1193,7 @@ def save_to_file(reduction_packages, save_can, additional_run_numbers, event_sli
     :type additional_run_numbers: dict
     :param event_slice_optimisation: optional. If true then reduction packages contain event slice data
     :type event_slice_optimisation: bool
+    :return: the names of the saved workspaces, which are also the names of the files.
     """
     if not event_slice_optimisation:
         workspaces_names_to_save = get_all_names_to_save(reduction_packages, save_can=save_can)
@@ -1128,6 +1203,7 @@ def save_to_file(reduction_packages, save_can, additional_run_numbers, event_sli
     state = reduction_packages[0].state
     save_info = state.save
     file_formats = save_info.file_format
+    saved_names = []
     for to_save in workspaces_names_to_save:
         if isinstance(to_save, tuple):
             for i, ws_name_to_save in enumerate(to_save[0]):
@@ -1135,8 +1211,11 @@ def save_to_file(reduction_packages, save_can, additional_run_numbers, event_sli
                 transmission_can = to_save[2][i] if to_save[2] else ''
                 save_workspace_to_file(ws_name_to_save, file_formats, ws_name_to_save, additional_run_numbers,
                                        transmission, transmission_can)
+                saved_names.append(ws_name_to_save)
         else:
             save_workspace_to_file(to_save, file_formats, to_save, additional_run_numbers)
+            saved_names.append(to_save)
+    return saved_names
 
 
 def delete_reduced_workspaces(reduction_packages, include_non_transmission=True):
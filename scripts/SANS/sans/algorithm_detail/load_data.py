@@ -58,6 +58,7 @@ from sans.common.constants import (EMPTY_NAME, SANS_SUFFIX, TRANS_SUFFIX, MONITO
                                    SANS_FILE_TAG, OUTPUT_WORKSPACE_GROUP, OUTPUT_MONITOR_WORKSPACE,
                                    OUTPUT_MONITOR_WORKSPACE_GROUP)
 from sans.common.enums import (SANSFacility, SANSDataType, SANSInstrument)
+from sans.common.cached_workspace_index import get_cached_workspace_index
 from sans.common.general_functions import (create_child_algorithm)
 from sans.common.log_tagger import (set_tag, has_tag, get_tag)
 from sans.state.StateObjects.StateData import (StateData)
@@ -253,19 +254,16 @@ def get_workspaces_from_ads_if_exist(file_tags, full_calibration_file_path, work
     Retrieves workspaces from the ADS depending on their file tags and calibration file tags which would have been
     set by the sans loading mechanism when they were loaded the first time.
 
+    The workspaces are looked up in an index of the ADS by file tag, rather than by reading the sample logs of every
+    workspace on the ADS.
+
     :param file_tags: a list of file tags which we look for on the workspaces on the ADS
     :param full_calibration_file_path: the calibration file name which we look for on the workspaces on the ADS
     :param workspaces: a list of workspaces which is being updated in this function.
     """
-    for workspace_name in AnalysisDataService.getObjectNames():
-        workspace = AnalysisDataService.retrieve(workspace_name)
-        try:
-            if has_tag(SANS_FILE_TAG, workspace):
-                file_tag = get_tag(SANS_FILE_TAG, workspace)
-                if file_tag in file_tags and is_calibration_correct(workspace, full_calibration_file_path):
-                    workspaces.append(workspace)
-        except RuntimeError:
-            continue
+    for workspace in get_cached_workspace_index().get_workspaces(file_tags):
+        if is_calibration_correct(workspace, full_calibration_file_path):
+            workspaces.append(workspace)
 
 
 def use_cached_workspaces_from_ads(file_information,  is_transmission,  period, calibration_file_name):
@@ -0,0 +1,152 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+""" Index of the workspaces on the ADS by their SANS file tag.
+
+The SANS loading mechanism reuses workspaces which are already on the ADS when they were loaded from the same file
+with the same calibration. Finding them by going through every workspace on the ADS and reading its sample logs
+becomes slow in long sessions with many workspaces, hence the workspace names are indexed by their file tag when
+they are added to the ADS. The index is kept up to date when workspaces are replaced, renamed or deleted.
+"""
+from threading import Lock
+
+from mantid.api import AnalysisDataService, AnalysisDataServiceObserver, MatrixWorkspace
+from mantid.kernel import config
+from sans.common.constants import SANS_FILE_TAG
+from sans.common.log_tagger import (has_tag, get_tag)
+
+
+class CachedWorkspaceIndex(AnalysisDataServiceObserver):
+    """
+    Maps SANS file tags to the names of the workspaces on the ADS which carry them.
+
+    The file tag of a workspace is read when it is added to the ADS. Every workspace returned by a look-up is checked
+    against its current file tag, so an outdated entry is never returned. Names on the ADS are case-insensitive.
+    """
+    def __init__(self):
+        super(CachedWorkspaceIndex, self).__init__()
+        self._lock = Lock()
+        self._names_by_file_tag = {}
+        self._entries_by_key = {}
+
+        self.observeAdd(True)
+        self.observeReplace(True)
+        self.observeDelete(True)
+        self.observeRename(True)
+        self.observeClear(True)
+
+        for workspace_name in AnalysisDataService.getObjectNames():
+            self._add(workspace_name, AnalysisDataService.retrieve(workspace_name))
+
+    def get_workspaces(self, file_tags):
+        """
+        Gets the workspaces on the ADS with one of the file tags.
+
+        The workspaces are in the order in which the ADS lists them. Hidden workspaces are only included if the ADS
+        is set to show them.
+        :param file_tags: a list of file tags which we look for on the workspaces on the ADS
+        :return: a list of workspaces
+        """
+        with self._lock:
+            workspace_names = [workspace_name for file_tag in set(file_tags)
+                               for workspace_name in self._names_by_file_tag.get(file_tag, [])]
+
+        show_hidden = config["MantidOptions.InvisibleWorkspaces"] == "1"
+        workspaces = []
+        for workspace_name in sorted(workspace_names, key=str.lower):
+            if workspace_name.startswith("__") and not show_hidden:
+                continue
+            try:
+                workspace = AnalysisDataService.retrieve(workspace_name)
+            except KeyError:
+                # The workspace has been deleted since the look-up
+                continue
+            if get_file_tag(workspace) in file_tags:
+                workspaces.append(workspace)
+        return workspaces
+
+    def unsubscribe(self):
+        self.observeAll(False)
+
+    def addHandle(self, workspace_name, workspace):
+        self._add(workspace_name, workspace)
+
+    def replaceHandle(self, workspace_name, workspace):
+        self._add(workspace_name, workspace)
+
+    def deleteHandle(self, workspace_name, workspace):
+        with self._lock:
+            self._remove(workspace_name)
+
+    def renameHandle(self, old_workspace_name, new_workspace_name):
+        with self._lock:
+            file_tag = self._remove(old_workspace_name)
+            # The renamed workspace takes the place of any workspace with the new name
+            self._remove(new_workspace_name)
+            if file_tag is not None:
+                self._insert(new_workspace_name, file_tag)
+
+    def clearHandle(self):
+        with self._lock:
+            self._names_by_file_tag.clear()
+            self._entries_by_key.clear()
+
+    def _add(self, workspace_name, workspace):
+        file_tag = get_file_tag(workspace)
+        with self._lock:
+            self._remove(workspace_name)
+            if file_tag is not None:
+                self._insert(workspace_name, file_tag)
+
+    def _insert(self, workspace_name, file_tag):
+        self._entries_by_key[workspace_name.lower()] = (workspace_name, file_tag)
+        self._names_by_file_tag.setdefault(file_tag, []).append(workspace_name)
+
+    def _remove(self, workspace_name):
+        """
+        Removes a workspace from the index, if it is indexed.
+
+        :param workspace_name: the name of the workspace.
+        :return: the file tag of the workspace or None if it was not indexed.
+        """
+        entry = self._entries_by_key.pop(workspace_name.lower(), None)
+        if entry is None:
+            return None
+        indexed_name, file_tag = entry
+        workspace_names = self._names_by_file_tag[file_tag]
+        workspace_names.remove(indexed_name)
+        if not workspace_names:
+            del self._names_by_file_tag[file_tag]
+        return file_tag
+
+
+def get_file_tag(workspace):
+    """
+    Gets the SANS file tag of a workspace.
+
+    :param workspace: the workspace.
+    :return: the file tag or None if the workspace is not a tagged MatrixWorkspace.
+    """
+    if not isinstance(workspace, MatrixWorkspace) or not has_tag(SANS_FILE_TAG, workspace):
+        return None
+    return get_tag(SANS_FILE_TAG, workspace)
+
+
+_cached_workspace_index = None
+_cached_workspace_index_lock = Lock()
+
+
+def get_cached_workspace_index():
+    """
+    Gets the index of the ADS, which is created and starts observing the ADS on first use.
+
+    :return: the CachedWorkspaceIndex.
+    """
+    global _cached_workspace_index
+    with _cached_workspace_index_lock:
+        if _cached_workspace_index is None:
+            _cached_workspace_index = CachedWorkspaceIndex()
+        return _cached_workspace_index
@@ -6,8 +6,9 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 # pylint: disable=invalid-name
 """ SANBatchReduction algorithm is the starting point for any new type reduction, event single reduction"""
+from mantid.kernel import Logger
 from sans.state.AllStates import AllStates
-from sans.algorithm_detail.batch_execution import (single_reduction_for_batch)
+from sans.algorithm_detail.batch_execution import (single_reduction_for_batch, reduce_batch_in_processes)
 from sans.common.enums import (OutputMode, FindDirectionEnum, DetectorType)
 from sans.algorithm_detail.centre_finder_new import centre_finder_new, centre_finder_mass
 
@@ -17,7 +18,7 @@ class SANSBatchReduction(object):
         super(SANSBatchReduction, self).__init__()
 
     def __call__(self, states, use_optimizations=True, output_mode=OutputMode.PUBLISH_TO_ADS, plot_results = False,
-                 output_graph='', save_can=False):
+                 output_graph='', save_can=False, use_processes=False, max_workers=None):
         """
         This is the start of any reduction.
 
@@ -27,9 +28,14 @@ class SANSBatchReduction(object):
                             1. PublishToADS
                             2. SaveToFile
                             3. Both
+        :param use_processes: if True then the states are reduced independently in a pool of worker processes. The
+                              reduced data is only saved to file, so the output mode has to be SaveToFile.
+        :param max_workers: the maximum number of worker processes. Defaults to the number of processors.
         """
-        self.validate_inputs(states, use_optimizations, output_mode, plot_results, output_graph)
+        self.validate_inputs(states, use_optimizations, output_mode, plot_results, output_graph, use_processes)
 
+        if use_processes:
+            return self._execute_in_processes(states, use_optimizations, save_can=save_can, max_workers=max_workers)
         return self._execute(states, use_optimizations, output_mode, plot_results, output_graph, save_can=save_can)
 
     @staticmethod
@@ -45,11 +51,25 @@ class SANSBatchReduction(object):
             out_scale_factors_list.append(out_scale_factors)
         return out_scale_factors_list, out_shift_factors_list
 
-    def validate_inputs(self, states, use_optimizations, output_mode, plot_results, output_graph):
+    @staticmethod
+    def _execute_in_processes(states, use_optimizations, save_can=False, max_workers=None):
+        # Reduce the states in worker processes and report each row as soon as its output is saved
+        logger = Logger("SANS")
+        out_scale_factors_list = [None] * len(states)
+        out_shift_factors_list = [None] * len(states)
+        for result in reduce_batch_in_processes(states, use_optimizations, save_can=save_can, max_workers=max_workers):
+            logger.notice("Reduced row {0} of {1} in {2:.2f} s, saved: {3}".format(
+                result.index + 1, len(states), result.wall_time, ", ".join(result.saved_names)))
+            out_scale_factors_list[result.index] = result.out_scale_factors
+            out_shift_factors_list[result.index] = result.out_shift_factors
+        return out_scale_factors_list, out_shift_factors_list
+
+    def validate_inputs(self, states, use_optimizations, output_mode, plot_results, output_graph, use_processes=False):
         # We are strict about the types here.
         # 1. states has to be a list of sans state objects
         # 2. use_optimizations has to be bool
         # 3. output_mode has to be an OutputMode enum
+        # 4. reductions in worker processes can only save to file and not plot
         if not isinstance(states, list):
             raise RuntimeError("The provided states are not in a list. They have to be in a list.")
 
@@ -75,6 +95,13 @@ class SANSBatchReduction(object):
             raise RuntimeError("The output mode has to be an enum of type OutputMode. The provided type is"
                                " {0}".format(type(output_mode)))
 
+        if use_processes and output_mode is not OutputMode.SAVE_TO_FILE:
+            raise RuntimeError("Reductions in worker processes can only save to file. The provided output mode is"
+                               " {0}".format(output_mode))
+
+        if use_processes and plot_results:
+            raise RuntimeError("The results cannot be plotted for reductions in worker processes.")
+
         errors = self._validate_inputs(states)
         if errors:
             raise RuntimeError("The provided states are not valid: {}".format(errors))
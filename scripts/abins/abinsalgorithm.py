@@ -861,15 +861,10 @@ class AbinsAlgorithm:
     @staticmethod
     def _check_threads(message_end=None):
         """
-        Checks number of threads
+        Checks number of processes used for parallel calculation of S. Values larger than the number of
+        available CPUs are permitted; the number of worker processes is limited at run time.
         :param message_end: closing part of the error message.
         """
-        try:
-            import pathos.multiprocessing as mp
-
-            threads = abins.parameters.performance['threads']
-            if not (isinstance(threads, int) and 1 <= threads <= mp.cpu_count()):
-                raise RuntimeError("Invalid number of threads for parallelisation over atoms" + message_end)
-
-        except ImportError:
-            pass
+        threads = abins.parameters.performance['threads']
+        if not (isinstance(threads, int) and threads >= 1):
+            raise RuntimeError("Invalid number of threads for parallelisation over atoms" + message_end)
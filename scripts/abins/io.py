@@ -29,12 +29,12 @@ class IO(object):
         if isinstance(input_filename, str):
 
             self._input_filename = input_filename
+            self._hash_input_filename = None  # full hash is only calculated when required
+            self._cache_key_input_filename = None
             try:
-                self._hash_input_filename = self.calculate_ab_initio_file_hash()
+                self._cache_key_input_filename = self.calculate_ab_initio_file_cache_key()
             except IOError as err:
                 logger.error(str(err))
-            except ValueError as err:
-                logger.error(str(err))
 
             # extract name of file from the full path in the platform independent way
             filename = os.path.basename(self._input_filename)
@@ -67,13 +67,47 @@ class IO(object):
 
         # Fields which have a form of empty dictionaries have to be set by an inheriting class.
 
+    # Full hashes of input files which have already been calculated, indexed by (filename, cache key)
+    _known_hashes = {}
+
     def _valid_hash(self):
         """
         Checks if input ab initio file and content of HDF file are consistent.
+
+        The cache key (size, modification time and sampled digest of the input file) is checked first. Only if
+        it is missing or different is the full hash of the input file calculated and compared; if the full hash
+        matches, the stored cache key is updated so that the next check is cheap.
+
         :returns: True if consistent, otherwise False.
         """
+        try:
+            saved_cache_key = self.load(list_of_attributes=["cache_key"])["attributes"]["cache_key"]
+        except ValueError:
+            saved_cache_key = None  # HDF file created before cache keys were introduced
+
+        if self._cache_key_input_filename is not None and saved_cache_key == self._cache_key_input_filename:
+            return True
+
         saved_hash = self.load(list_of_attributes=["hash"])
-        return self._hash_input_filename == saved_hash["attributes"]["hash"]
+        if self.get_ab_initio_file_hash() != saved_hash["attributes"]["hash"]:
+            return False
+
+        self._update_cache_key()
+        return True
+
+    def _update_cache_key(self):
+        """
+        Stores the cache key of the current input file in the HDF file. Failure to write (e.g. a read-only
+        file) is not an error: the full hash will be checked again next time.
+        """
+        if self._cache_key_input_filename is None:
+            return
+
+        try:
+            with h5py.File(self._hdf_filename, 'a') as hdf_file:
+                hdf_file[self._group_name].attrs["cache_key"] = self._cache_key_input_filename
+        except (IOError, KeyError) as err:
+            logger.debug("Could not update cache key in {}: {}".format(self._hdf_filename, err))
 
     def _valid_setting(self):
         """
@@ -163,9 +197,11 @@ class IO(object):
 
     def add_file_attributes(self):
         """
-        Add attributes for input data filename, hash of file, advanced parameters to data for HDF5 file
+        Add attributes for input data filename, hash and cache key of file, advanced parameters to data for HDF5 file
         """
-        self.add_attribute("hash", self._hash_input_filename)
+        self.add_attribute("hash", self.get_ab_initio_file_hash())
+        if self._cache_key_input_filename is not None:
+            self.add_attribute("cache_key", self._cache_key_input_filename)
         self.add_attribute("setting", self._setting)
         self.add_attribute("filename", self._input_filename)
         self.add_attribute("advanced_parameters",
@@ -464,9 +500,40 @@ class IO(object):
 
         return hash_calculator.hexdigest()
 
+    @staticmethod
+    def _calculate_cache_key(filename=None):
+        """
+        Calculates a cheap identifier of a file, used to check the HDF cache without reading the whole file.
+
+        The key is built from the size and modification time of the file and a sha512 digest of a sample of its
+        binary content (the first, middle and last BUF bytes).
+
+        :param filename: name of a file to calculate cache key
+        :type filename: str
+
+        :returns: string representation of cache key
+        """
+        file_stat = os.stat(filename)
+        size = file_stat.st_size
+        hash_calculator = hashlib.sha512()
+
+        with io.open(file=filename, mode="rb") as f:
+            for offset in sorted({0, max(0, size // 2 - BUF // 2), max(0, size - BUF)}):
+                f.seek(offset)
+                hash_calculator.update(f.read(BUF))
+
+        return "{size}:{mtime}:{digest}".format(size=size, mtime=file_stat.st_mtime_ns,
+                                                digest=hash_calculator.hexdigest())
+
     def get_input_filename(self):
         return self._input_filename
 
+    def get_hdf_filename(self):
+        return self._hdf_filename
+
+    def get_group_name(self):
+        return self._group_name
+
     def calculate_ab_initio_file_hash(self):
         """
         This method calculates hash of the file with vibrational or phonon data according to SHA-2 algorithm from
@@ -475,3 +542,33 @@ class IO(object):
         """
 
         return self._calculate_hash(filename=self._input_filename)
+
+    def calculate_ab_initio_file_cache_key(self):
+        """
+        This method calculates the cache key of the file with vibrational or phonon data.
+        :returns: string with size, modification time and sampled digest of the file
+        """
+        return self._calculate_cache_key(filename=self._input_filename)
+
+    def get_ab_initio_file_hash(self):
+        """
+        Full hash of the file with vibrational or phonon data. This is calculated on first use and shared between
+        IO objects for the same (unchanged) file.
+        :returns: string representation of hash, or None if the hash could not be calculated
+        """
+        if self._hash_input_filename is None:
+            known_hash_key = (self._input_filename, self._cache_key_input_filename)
+            if self._cache_key_input_filename is not None and known_hash_key in self._known_hashes:
+                self._hash_input_filename = self._known_hashes[known_hash_key]
+            else:
+                try:
+                    self._hash_input_filename = self.calculate_ab_initio_file_hash()
+                except IOError as err:
+                    logger.error(str(err))
+                except ValueError as err:
+                    logger.error(str(err))
+
+                if self._cache_key_input_filename is not None and self._hash_input_filename is not None:
+                    self._known_hashes[known_hash_key] = self._hash_input_filename
+
+        return self._hash_input_filename
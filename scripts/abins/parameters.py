@@ -75,7 +75,7 @@ sampling = {
 # Parameters related to performance optimisation that do NOT impact calculation results
 performance = {
     'optimal_size': 5000000,  # this is used to create optimal size of chunk energies for which S is calculated
-    'threads': 4  # number of threads used in parallel calculations
+    'threads': 1  # number of worker processes used to calculate S in parallel (1: serial calculation)
     }
 
 all_parameters = {'instruments': instruments,
@@ -4,9 +4,11 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
-import gc
+from concurrent.futures import ProcessPoolExecutor
+import os
+import h5py
 import numpy as np
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 import abins
 from abins.constants import (ANGLE_MESSAGE_INDENTATION,
@@ -20,6 +22,19 @@ from abins.instruments import Instrument
 from abins.sdata import SData, SDataByAngle
 from mantid.api import Progress
 
+# Calculator instance used by worker processes in parallel S calculations; set by _init_worker
+_worker_calculator = None
+
+
+def _init_worker(calculator: 'SPowderSemiEmpiricalCalculator') -> None:
+    global _worker_calculator
+    _worker_calculator = calculator
+
+
+def _calculate_s_powder_task(task: Tuple[int, Sequence[int]]) -> SDataByAngle:
+    q_index, atoms = task
+    return _worker_calculator._calculate_s_powder_over_atoms_block(q_index=q_index, atoms=atoms)
+
 
 # noinspection PyMethodMayBeStatic
 class SPowderSemiEmpiricalCalculator:
@@ -103,6 +118,29 @@ class SPowderSemiEmpiricalCalculator:
         self._b_traces = None
         self._fundamentals_freq = None
 
+        self._powder_file = None
+        self._powder_data = None
+        self._weights = None
+
+    def __getstate__(self):
+        # Copies sent to worker processes do not need the ab initio data (only
+        # powder data is used per q-point); Progress objects and open HDF5 files cannot be pickled.
+        state = self.__dict__.copy()
+        for key in ('_abins_data', '_progress_reporter', '_calculate_order', '_powder_file', '_powder_data'):
+            del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._abins_data = None
+        self._progress_reporter = None
+        self._powder_file = None
+        self._powder_data = None
+        self._calculate_order = {QUANTUM_ORDER_ONE: self._calculate_order_one,
+                                 QUANTUM_ORDER_TWO: self._calculate_order_two,
+                                 QUANTUM_ORDER_THREE: self._calculate_order_three,
+                                 QUANTUM_ORDER_FOUR: self._calculate_order_four}
+
     def _calculate_s(self):
 
         # calculate powder data
@@ -161,10 +199,13 @@ class SPowderSemiEmpiricalCalculator:
 
         return freq, coeff
 
-    def _get_empty_data(self):
+    def _get_empty_data(self, atom_keys: Optional[Sequence[str]] = None):
+        if atom_keys is None:
+            atom_keys = list(self._abins_data.get_atoms_data().extract().keys())
+
         return SDataByAngle.get_empty(angles=self._instrument.get_angles(),
                                       frequencies=self._frequencies,
-                                      atom_keys=list(self._abins_data.get_atoms_data().extract().keys()),
+                                      atom_keys=atom_keys,
                                       order_keys=[f'order_{n}' for n in range(1, self._quantum_order_num + 1)],
                                       temperature=self._temperature, sample_form=self._sample_form)
 
@@ -178,11 +219,80 @@ class SPowderSemiEmpiricalCalculator:
         """
         angle_resolved_data = existing_data if existing_data else self._get_empty_data()
 
-        for q_index in range(self._num_k):
-            _ = self._calculate_s_powder_over_atoms(q_indx=q_index,
-                                                    existing_data=angle_resolved_data)
+        n_processes = self._get_n_processes()
+        if n_processes > 1:
+            # Worker processes open the powder data file themselves
+            self._close_powder_data()
+            self._calculate_s_powder_parallel(n_processes=n_processes, existing_data=angle_resolved_data)
+        else:
+            try:
+                for q_index in range(self._num_k):
+                    _ = self._calculate_s_powder_over_atoms(q_indx=q_index,
+                                                            existing_data=angle_resolved_data)
+            finally:
+                self._close_powder_data()
         return angle_resolved_data
 
+    def _get_n_processes(self) -> int:
+        """
+        Number of worker processes used to calculate S, set by abins.parameters.performance['threads'] and
+        limited by the number of available CPUs. A value of 1 selects the serial calculation.
+        """
+        return max(1, min(abins.parameters.performance['threads'], os.cpu_count() or 1))
+
+    def _get_parallel_tasks(self, n_processes: int) -> List[Tuple[int, List[int]]]:
+        """
+        Divide the calculation into (q-point index, atom indices) tasks. If there are fewer q-points than
+        processes the atoms of each q-point are split into blocks so that all processes are kept busy.
+
+        :param n_processes: number of worker processes
+        :returns: list of tasks ordered by q-point
+        """
+        n_blocks = min(self._num_atoms, max(1, int(np.ceil(n_processes / self._num_k))))
+        atom_blocks = [block.tolist() for block in np.array_split(np.arange(self._num_atoms), n_blocks)]
+
+        return [(q_index, atoms) for q_index in range(self._num_k) for atoms in atom_blocks]
+
+    def _calculate_s_powder_parallel(self, *, n_processes: int, existing_data: SDataByAngle) -> None:
+        """
+        Evaluates S for all q-points and atoms with a pool of worker processes.
+
+        Partial results are summed into existing_data in q-point order, so that the result does not depend on
+        the number of processes.
+
+        :param n_processes: number of worker processes
+        :param existing_data: object to which S for all q-points and atoms is added
+        """
+        tasks = self._get_parallel_tasks(n_processes)
+        self._report_progress(msg=f"Calculating S for {len(tasks)} blocks of q-points/atoms "
+                                  f"with {n_processes} processes.", notice=True)
+
+        with ProcessPoolExecutor(max_workers=n_processes, initializer=_init_worker, initargs=(self,)) as executor:
+            for (q_index, atoms), block_data in zip(tasks, executor.map(_calculate_s_powder_task, tasks)):
+                for angle_index in range(len(existing_data)):
+                    existing_data.set_angle_data(angle_index, block_data[angle_index], add_to_existing=True)
+
+                for atom_index in atoms:
+                    self._report_progress(msg=f"S for atom {atom_index} has been calculated at qpt {q_index}.",
+                                          reporter=self.progress_reporter)
+
+    def _calculate_s_powder_over_atoms_block(self, *, q_index: int, atoms: Sequence[int]) -> SDataByAngle:
+        """
+        Evaluates S for a subset of atoms at the given q-point. This is the unit of work for parallel calculations.
+
+        :param q_index: Index of q-point from calculated phonon data
+        :param atoms: indices of atoms to be calculated
+
+        :returns: SDataByAngle containing only the requested atoms
+        """
+        self._prepare_data(k_point=q_index)
+
+        block_data = self._get_empty_data(atom_keys=[f'atom_{atom}' for atom in atoms])
+        for atom_index in atoms:
+            self._calculate_s_powder_one_atom(atom=atom_index, q_index=q_index, existing_data=block_data)
+
+        return block_data
+
     def _calculate_s_powder_over_atoms(self, *, q_indx: int,
                                        existing_data: Optional[SDataByAngle] = None
                                        ) -> SDataByAngle:
@@ -205,32 +315,50 @@ class SPowderSemiEmpiricalCalculator:
 
         return s_by_atom
 
+    def _open_powder_data(self) -> None:
+        """
+        Opens the HDF file with powder data and loads k-point weights.
+
+        The file is kept open so that _prepare_data can read the tensors for a single k-point without
+        re-reading the whole powder data group each time.
+        """
+        powder_clerk = abins.IO(input_filename=self._input_filename,
+                                group_name=abins.parameters.hdf_groups['powder_data'])
+        self._powder_file = h5py.File(powder_clerk.get_hdf_filename(), 'r')
+        self._powder_data = self._powder_file[powder_clerk.get_group_name()]["powder_data"]
+
+        # load dft data to get k-point weighting
+        clerk = abins.IO(input_filename=self._input_filename,
+                         group_name=abins.parameters.hdf_groups['ab_initio_data'])
+        self._weights = clerk.load(list_of_datasets=["weights"])["datasets"]["weights"]
+
+    def _close_powder_data(self) -> None:
+        """Closes the HDF file opened by _open_powder_data (if any)."""
+        if self._powder_file is not None:
+            self._powder_file.close()
+        self._powder_file = None
+        self._powder_data = None
+
     def _prepare_data(self, k_point=None):
         """
-        Sets all necessary fields for 1D calculations. Sorts atom indices to improve parallelism.
-        :returns: number of atoms, sorted atom indices
+        Sets all necessary fields for 1D calculations at the given k-point.
+
+        :param k_point: Index of k-point from calculated phonon data
         """
+        if self._powder_data is None:
+            self._open_powder_data()
+
         # load powder data for one k
-        clerk = abins.IO(input_filename=self._input_filename,
-                         group_name=abins.parameters.hdf_groups['powder_data'])
-        powder_data = abins.PowderData.from_extracted(clerk.load(list_of_datasets=["powder_data"]
-                                                                 )["datasets"]["powder_data"])
-        self._a_tensors = powder_data.get_a_tensors()[k_point]
-        self._b_tensors = powder_data.get_b_tensors()[k_point]
+        k_key = str(k_point)
+        self._a_tensors = self._powder_data["a_tensors"][k_key][()]
+        self._b_tensors = self._powder_data["b_tensors"][k_key][()]
 
         self._a_traces = np.trace(a=self._a_tensors, axis1=1, axis2=2)
         self._b_traces = np.trace(a=self._b_tensors, axis1=2, axis2=3)
 
-        self._fundamentals_freq = powder_data.get_frequencies()[k_point]
-
-        # load dft data to get k-point weighting
-        clerk = abins.IO(input_filename=self._input_filename,
-                         group_name=abins.parameters.hdf_groups['ab_initio_data'])
-        dft_data = clerk.load(list_of_datasets=["frequencies", "weights"])
-        self._weight = dft_data["datasets"]["weights"][k_point]
+        self._fundamentals_freq = self._powder_data["frequencies"][k_key][()]
 
-        # free memory
-        gc.collect()
+        self._weight = self._weights[k_point]
 
     @property
     def progress_reporter(self) -> Union[None, Progress]:
@@ -5,10 +5,9 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 
-from copy import deepcopy
 import numpy as np
 import re
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from corelli.calibration.utils import InputTable, WorkspaceGroupTypes, WorkspaceTypes  # custom type aliases
 # imports from Mantid
 from mantid import AnalysisDataService, mtd
@@ -17,8 +16,10 @@ from mantid.dataobjects import TableWorkspace, Workspace2D
 from mantid.simpleapi import (CloneWorkspace, CreateEmptyTableWorkspace, CreateWorkspace,
                               DeleteTableRows, DeleteWorkspaces, GroupWorkspaces, MaskBTP, RenameWorkspace)
 from Calibration import tube
+from Calibration.tube_calib import fit_tubes_concurrently
 from Calibration.tube_spec import TubeSpec
 from Calibration.tube_calib_fit_params import TubeCalibFitParams
+from corelli.calibration.database import save_calibration_set
 from corelli.calibration.utils import (bank_numbers, PIXELS_PER_TUBE, calculate_peak_y_table, trim_calibration_table,
                                        TUBES_IN_BANK, wire_positions)
 
@@ -41,7 +42,72 @@ def sufficient_intensity(input_workspace: WorkspaceTypes, bank_name: str, minimu
     for tube_index in range(tube_set.getNumTubes()):
         workspace_indexes_in_tube, skipped = tube_set.getTube(tube_index)
         workspace_indexes.extend(list(workspace_indexes_in_tube))
-    return bool(np.mean(workspace.extractY()[workspace_indexes].flatten()) > minimum_intensity)
+    # read only the spectra of the bank, instead of extracting the counts for the whole instrument
+    return bool(np.mean([workspace.readY(index) for index in workspace_indexes]) > minimum_intensity)
+
+
+def _wire_fit_parameters(shadow_height: float = 1000, shadow_width: float = 4,
+                         fit_domain: float = 7) -> Tuple[TubeCalibFitParams, List[int]]:
+    r"""
+    Fit parameters and functional forms for the wire shadows of a CORELLI tube
+
+    :param shadow_height: initial guess for the decrease in neutron counts caused by the calibrating wire
+    :param shadow_width: initial guess for the number of pixels shadowed by the calibrating wire
+    :param fit_domain: number of pixels over which a calibrating wire may have any significant influence
+
+    :raises AssertionError: the input `shadow_height` is a non-positive value
+    """
+    assert shadow_height > 0, 'shadow height must be positive'
+    peak_height, peak_width = -shadow_height, shadow_width
+    # Fit only the inner 14 dips because the extrema wires are too close to the tube tips.
+    # The dead zone in the tube tips interferes with the shadow cast by the extrema  wires
+    # preventing a good fitting
+    wire_positions_pixels = wire_positions(units='pixels')[1: -1]
+    wire_count = len(wire_positions_pixels)
+    peaks_form = [1] * wire_count  # signals we'll be fitting dips (peaks with negative heights)
+
+    fit_par = TubeCalibFitParams(wire_positions_pixels, height=peak_height, width=peak_width, margin=fit_domain)
+    fit_par.setAutomatic(True)
+    return fit_par, peaks_form
+
+
+def fit_banks_peaks(workspace: WorkspaceTypes, bank_names: List[str], shadow_height: float = 1000,
+                    shadow_width: float = 4, fit_domain: float = 7, parallel: str = 'threads',
+                    max_workers: Optional[int] = None) -> Dict[str, Dict[int, List[float]]]:
+    r"""
+    Find the position of the wire shadows on each tube of several banks, fitting all tubes concurrently
+
+    The fits run as child algorithms, so no workspace is stored in the AnalysisDataService. The positions
+    can be passed on to `fit_bank` with argument `peaks`.
+
+    :param workspace: input Workspace2D containing total neutron counts per pixel
+    :param bank_names: list of strings of the form 'bankI' where 'I' is a bank number
+    :param shadow_height: initial guess for the decrease in neutron counts caused by the calibrating wire
+    :param shadow_width: initial guess for the number of pixels shadowed by the calibrating wire
+    :param fit_domain: number of pixels over which a calibrating wire may have any significant influence
+    :param parallel: 'threads' to fit the tubes in a pool of threads, 'processes' for a pool of processes
+    :param max_workers: maximum number of threads or processes. Default None lets the pool decide
+
+    :return: dictionary with bank names as keys. Each value is a dictionary of tube index in the bank and
+        positions of the wire shadows in the tube, in units of pixel positions
+    """
+    workspace = mtd[str(workspace)]
+    fit_par, peaks_form = _wire_fit_parameters(shadow_height, shadow_width, fit_domain)
+    tube_counts = dict()  # neutron counts of each tube, keyed by (bank name, tube index in the bank)
+    for bank_name in bank_names:
+        assert re.match(r'^bank\d+$', bank_name), 'The bank name must be of the form "bankI" where "I" in an integer'
+        tube_set = TubeSpec(workspace)
+        tube_set.setTubeSpecByString(bank_name)
+        for tube_index in range(tube_set.getNumTubes()):
+            workspace_indexes, skipped = tube_set.getTube(tube_index)
+            if len(workspace_indexes) > 0:
+                tube_counts[(bank_name, tube_index)] = np.array([workspace.readY(index)[0]
+                                                                 for index in workspace_indexes])
+    fitted = fit_tubes_concurrently(tube_counts, peaks_form, fit_par, parallel=parallel, max_workers=max_workers)
+    peaks = {bank_name: dict() for bank_name in bank_names}
+    for (bank_name, tube_index), (positions, fit_time) in fitted.items():
+        peaks[bank_name][tube_index] = positions
+    return peaks
 
 
 def fit_bank(workspace: WorkspaceTypes, bank_name: str, shadow_height: float = 1000, shadow_width: float = 4,
@@ -49,7 +115,8 @@ def fit_bank(workspace: WorkspaceTypes, bank_name: str, shadow_height: float = 1
              calibration_table: str = 'CalibTable',
              peak_pixel_positions_table: str = 'PeakTable',
              peak_vertical_positions_table: str = 'PeakYTable',
-             parameters_table_group: str = 'ParametersTable') -> None:
+             parameters_table_group: str = 'ParametersTable',
+             peaks: Optional[Dict[int, List[float]]] = None) -> None:
     r"""
     Find the position of the wire shadow on each tube in the bank, in units of pixel positions
 
@@ -74,6 +141,9 @@ def fit_bank(workspace: WorkspaceTypes, bank_name: str, shadow_height: float = 1
         holds the goodness-of-fit, chi-square value. The name of each individual TableWorkspace is the string
         `parameters_table_group` plus the suffix `_I`, where `I` is the tube index in the bank, startin at zero.
         If set to `None`, no group workspace is generated.
+    :param peaks: positions of the wire shadows for some or all of the tubes in the bank, in units of pixel
+        positions, as returned by `fit_banks_peaks`. The keys are tube indexes in the bank, starting at zero.
+        These tubes are not fitted again. If `None`, all tubes are fitted.
 
     :raises AssertionError: the input workspace is of incorrect type or cannot be found
     :raises AssertionError: the input `shadow_height` is a non-positive value
@@ -86,23 +156,15 @@ def fit_bank(workspace: WorkspaceTypes, bank_name: str, shadow_height: float = 1
     assert isinstance(workspace, (str, Workspace2D)), message
     workspace_name = str(workspace)
     assert AnalysisDataService.doesExist(workspace_name), f'Input workspace {workspace_name} does not exists'
-    assert shadow_height > 0, 'shadow height must be positive'
-    peak_height, peak_width = -shadow_height, shadow_width
+    fit_par, peaks_form = _wire_fit_parameters(shadow_height, shadow_width, fit_domain)
     assert re.match(r'^bank\d+$', bank_name), 'The bank name must be of the form "bankI" where "I" in an integer'
     message = f'Insufficient counts per pixel in workspace {workspace_name} for a confident calibration'
     assert sufficient_intensity(workspace, bank_name, minimum_intensity=minimum_intensity), message
-    # Fit only the inner 14 dips because the extrema wires are too close to the tube tips.
-    # The dead zone in the tube tips interferes with the shadow cast by the extrema  wires
-    # preventing a good fitting
-    wire_positions_pixels = wire_positions(units='pixels')[1: -1]
-    wire_count = len(wire_positions_pixels)
-    peaks_form = [1] * wire_count  # signals we'll be fitting dips (peaks with negative heights)
-
-    fit_par = TubeCalibFitParams(wire_positions_pixels, height=peak_height, width=peak_width, margin=fit_domain)
-    fit_par.setAutomatic(True)
 
+    # tubes with known wire shadow positions are not fitted again
     tube.calibrate(workspace_name, bank_name, wire_positions(units='meters')[1: -1],
-                   peaks_form, fitPar=fit_par, outputPeak=True, parameters_table_group=parameters_table_group)
+                   peaks_form, fitPar=fit_par, outputPeak=True, parameters_table_group=parameters_table_group,
+                   overridePeaks=dict() if peaks is None else peaks)
     if calibration_table != 'CalibTable':
         RenameWorkspace(InputWorkspace='CalibTable', OutputWorkspace=calibration_table)
     trim_calibration_table(calibration_table)  # discard X and Z coordinates
@@ -165,23 +227,20 @@ def collect_bank_fit_results(output_workspace: str,
         workspace = mtd[str(parameters_table_group)]
         # collect the names of the polynomial coefficients using the first table
         first_table = mtd[workspace.getNames()[0]]  # handle to the first table in the list
-        for coefficient_name in first_table.column(0)[:-1]:  # exclude the last item, which is the chi-square value
+        coefficient_names = first_table.column(0)[:-1]  # exclude the last item, which is the chi-square value
+        # values and errors of the fit results as arrays of shape (tube_count, coefficient_count). Every table
+        # lists the coefficients in the same order, with the chi-square value in the last row
+        values = np.array([parameters_table.column('Value')[:-1] for parameters_table in workspace])
+        errors = np.array([parameters_table.column('Error')[:-1] for parameters_table in workspace])
+        for coefficient_index, coefficient_name in enumerate(coefficient_names):
             fit_result_names.append(coefficient_name)
-            fit_results_values[coefficient_name], fit_results_errors[coefficient_name] = [], []
-        # collect values and errors of the fit results
-        for parameters_table in workspace:  # iterate over the parameter tables, one table for each tube
-            for table_row in parameters_table:
-                # table_row is a dictionary, e.g. {'Name': 'A0', 'Value':-0.521, 'Error':0.003}
-                coefficient_name = table_row['Name']  # polynomial fit coefficient
-                if coefficient_name == 'Cost function value':  # don't store the Chi-square value
-                    continue
-                fit_results_values[coefficient_name].append(table_row['Value'])
-                fit_results_errors[coefficient_name].append(table_row['Error'])
+            fit_results_values[coefficient_name] = values[:, coefficient_index]
+            fit_results_errors[coefficient_name] = errors[:, coefficient_index]
 
     # Create a workspace with the fit results, where each (key, values, errors) pair becomes one spectrum
     x_values = list(range(1, 1 + TUBES_IN_BANK))
-    y_values = [y for fit_result_values in fit_results_values.values() for y in fit_result_values]
-    e_values = [e for fit_result_errors in fit_results_errors.values() for e in fit_result_errors]
+    y_values = np.concatenate([fit_results_values[name] for name in fit_result_names])
+    e_values = np.concatenate([fit_results_errors[name] for name in fit_result_names])
     CreateWorkspace(DataX=x_values, DataY=y_values, DataE=e_values, NSpec=len(fit_result_names),
                     OutputWorkspace=output_workspace, WorkspaceTitle='Fitting Results', EnableLogging=False)
     # label each spectrum of the workspace
@@ -192,66 +251,52 @@ def collect_bank_fit_results(output_workspace: str,
     return workspace
 
 
-def criterion_peak_vertical_position(peak_table: InputTable,
-                                     summary: Optional[str] = None,
-                                     zscore_threshold: float = 2.5,
-                                     deviation_threshold: float = 0.0035) -> np.ndarray:
+def _criterion_peak_deviation(peak_table: InputTable,
+                              summary: Optional[str] = None,
+                              zscore_threshold: float = 2.5,
+                              deviation_threshold: float = 3) -> np.ndarray:
     r"""
-    Flag tubes whose wire shadows vertical positions (Y-coordinate) deviate considerably from the
-    vertical positions when averaged for all tubes in the bank.
-
+    Flag tubes whose peak positions deviate considerably from the peak positions averaged for all tubes
+    in the bank. Shared implementation of `criterion_peak_vertical_position` and `criterion_peak_pixel_position`.
 
-    .. math::
-
-      <p_i> = \frac{1}{n_t} \Sum_{j=1}^{n_t} p_{ij}
-      \delta_j^2 = \frac{1}{n_w} \Sum (p_{ij} - <p_i>)^2
-      assert d_j < threshold
-
-    :param peak_table: vertical positions of the wire shadows for each tube, in meters
+    :param peak_table: positions of the peaks for each tube
     :param summary: name of output Workspace2D containing deviations and Z-score for each tube.
-    :param zscore_threshold: maximum Z-score for the vertical positions of a tube.
-    :param deviation_threshold: maximum deviation (in meters) for the vertical positions of the wire shadows.
-        Default value (0.00035m) approximately corresponds to the height of three CORELLI pixels.
+    :param zscore_threshold: maximum Z-score for the peak positions of a tube.
+    :param deviation_threshold: maximum deviation for the peak positions of a tube.
     :return: array of booleans, one per tube. `True` is the tube passes the acceptance criterion, `False` otherwise.
     """
     table = mtd[str(peak_table)]  # handle to the peak table
-    peak_count = table.columnCount() - 1  # the first column contains the names of the tubes
-    # `positions_average` stores the vertical position for each wire shadow, averaged for all tubes
-    positions_average = [np.mean(table.column(column_number)) for column_number in range(1, 1 + peak_count)]
-
-    deviations: List[float] = list()  # a measure of how much the vertical positions deviate from the mean positions
-    tube_count = table.rowCount()  # number of tubes in the bank
-    for tube_index in range(tube_count):
-        positions = np.array(list(table.row(tube_index).values())[1:])  # peak positions for the current tube
-        deviations.append(np.sqrt(np.mean(np.square(positions - positions_average))))
+    # peak positions as an array of shape (tube_count, peak_count). The first column contains the names of the tubes
+    positions = np.array([table.column(column_number) for column_number in range(1, table.columnCount())]).transpose()
+    # `positions_average` stores the position for each peak, averaged for all tubes
+    positions_average = np.mean(positions, axis=0)
+    # a measure of how much the peak positions in a tube deviate from the mean positions
+    deviations = np.sqrt(np.mean(np.square(positions - positions_average), axis=1))
 
     # find tubes with a large Z-score
-    outlier_values = list()
-    values = deepcopy(deviations)
+    tube_count = len(deviations)  # number of tubes in the bank
+    criterion_pass = np.tile(True, tube_count)  # initialize as all tubes passing the criterion
+    candidates = np.arange(tube_count)  # indexes of the tubes not yet found to be outliers
     z_score = 1000
     outlier_value = 1000
-    while z_score > zscore_threshold and outlier_value > deviation_threshold and len(values) > 0:
+    while z_score > zscore_threshold and outlier_value > deviation_threshold and len(candidates) > 0:
         # find the tube with the highest Z-score, possibly signaling a large deviation from the mean
+        values = deviations[candidates]
         mean, std = np.mean(values), np.std(values)
-        outlier_index = np.argmax(np.abs((values - mean) / std))
-        outlier_value = values[outlier_index]
+        outlier_index = candidates[np.argmax(np.abs((values - mean) / std))]
+        outlier_value = deviations[outlier_index]
         # recalculate the Z-score of the tube, but removing it from the pool of values. This removes
         # any skewing effects from including the aberrant tube in the calculation of its Z-score
-        del values[outlier_index]
+        candidates = candidates[candidates != outlier_index]
+        values = deviations[candidates]
         mean, std = np.mean(values), np.std(values)
         z_score = np.abs((outlier_value - mean) / std)
         if z_score > zscore_threshold and outlier_value > deviation_threshold:
-            outlier_values.append(outlier_value)
-
-    # flag the outlier tubes as failing the criterion
-    criterion_pass = np.tile(True, tube_count)  # initialize as all tubes passing the criterion
-    if len(outlier_values) > 0:
-        failure_indexes = [deviations.index(value) for value in outlier_values]
-        criterion_pass[failure_indexes] = False
+            criterion_pass[outlier_index] = False  # flag the outlier tube as failing the criterion
 
     # create an analysis summary if so requested
     if isinstance(summary, str) and len(summary) > 0:
-        success = [1 if criterion else 0 for criterion in criterion_pass]
+        success = criterion_pass.astype(int)
         x_values = list(range(1, 1 + TUBES_IN_BANK))
         mean, std = np.mean(deviations), np.std(deviations)
         z_scores = np.abs((deviations - mean) / std)
@@ -267,6 +312,31 @@ def criterion_peak_vertical_position(peak_table: InputTable,
     return criterion_pass
 
 
+def criterion_peak_vertical_position(peak_table: InputTable,
+                                     summary: Optional[str] = None,
+                                     zscore_threshold: float = 2.5,
+                                     deviation_threshold: float = 0.0035) -> np.ndarray:
+    r"""
+    Flag tubes whose wire shadows vertical positions (Y-coordinate) deviate considerably from the
+    vertical positions when averaged for all tubes in the bank.
+
+
+    .. math::
+
+      <p_i> = \frac{1}{n_t} \Sum_{j=1}^{n_t} p_{ij}
+      \delta_j^2 = \frac{1}{n_w} \Sum (p_{ij} - <p_i>)^2
+      assert d_j < threshold
+
+    :param peak_table: vertical positions of the wire shadows for each tube, in meters
+    :param summary: name of output Workspace2D containing deviations and Z-score for each tube.
+    :param zscore_threshold: maximum Z-score for the vertical positions of a tube.
+    :param deviation_threshold: maximum deviation (in meters) for the vertical positions of the wire shadows.
+        Default value (0.00035m) approximately corresponds to the height of three CORELLI pixels.
+    :return: array of booleans, one per tube. `True` is the tube passes the acceptance criterion, `False` otherwise.
+    """
+    return _criterion_peak_deviation(peak_table, summary, zscore_threshold, deviation_threshold)
+
+
 def criterion_peak_pixel_position(peak_table: InputTable,
                                   summary: Optional[str] = None,
                                   zscore_threshold: float = 2.5,
@@ -288,57 +358,7 @@ def criterion_peak_pixel_position(peak_table: InputTable,
         default value (3) corresponds to the height of three pixels.
     :return: array of booleans, one per tube. `True` is the tube passes the acceptance criterion, `False` otherwise.
     """
-    table = mtd[str(peak_table)]  # handle to the peak table
-    peak_count = table.columnCount() - 1  # the first column contains the names of the tubes
-    # `positions_average` stores the pixel position for each peak, averaged for all tubes
-    positions_average = [np.mean(table.column(column_number)) for column_number in range(1, 1 + peak_count)]
-
-    deviations = list()  # a measure of how much the peak positions in a tube deviate from the mean positions
-    tube_count = table.rowCount()  # number of tubes in the bank
-    for tube_index in range(tube_count):
-        positions = np.array(list(table.row(tube_index).values())[1:])  # peak positions for the current tube
-        deviations.append(np.sqrt(np.mean(np.square(positions - positions_average))))
-
-    # find tubes with a large Z-score
-    outlier_values = list()
-    values = deepcopy(deviations)
-    z_score = 1000
-    outlier_value = 1000
-    while z_score > zscore_threshold and outlier_value > deviation_threshold and len(values) > 0:
-        # find the tube with the highest Z-score, possibly signaling a large deviation from the mean
-        mean, std = np.mean(values), np.std(values)
-        outlier_index = np.argmax(np.abs((values - mean) / std))
-        outlier_value = values[outlier_index]
-        # recalculate the Z-score of the tube, but removing it from the pool of values. This removes
-        # any skewing effects from including the aberrant tube in the calculation of its Z-score
-        del values[outlier_index]
-        mean, std = np.mean(values), np.std(values)
-        z_score = np.abs((outlier_value - mean) / std)
-        if z_score > zscore_threshold and outlier_value > deviation_threshold:
-            outlier_values.append(outlier_value)
-
-    # flag the outlier tubes as failing the criterion
-    criterion_pass = np.tile(True, tube_count)  # initialize as all tubes passing the criterion
-    if len(outlier_values) > 0:
-        failure_indexes = [deviations.index(value) for value in outlier_values]
-        criterion_pass[failure_indexes] = False
-
-    # create an analysis summary if so requested
-    if isinstance(summary, str) and len(summary) > 0:
-        success = [1 if criterion else 0 for criterion in criterion_pass]
-        x_values = list(range(1, 1 + TUBES_IN_BANK))
-        mean, std = np.mean(deviations), np.std(deviations)
-        z_scores = np.abs((deviations - mean) / std)
-        y_values = np.array([success, deviations, z_scores]).flatten()
-        workspace = CreateWorkspace(x_values, y_values, NSpec=3, OutputWorkspace=summary,
-                                    WorkspaceTitle='Tube deviations from averages taken over the bank',
-                                    YUnitLabel='Pixel Units', EnableLogging=False)
-        labels = ('success', 'deviation', 'Z-score')
-        axis = TextAxis.create(len(labels))
-        [axis.setLabel(index, label) for index, label in enumerate(labels)]
-        workspace.replaceAxis(1, axis)
-
-    return criterion_pass
+    return _criterion_peak_deviation(peak_table, summary, zscore_threshold, deviation_threshold)
 
 
 def purge_table(workspace: WorkspaceTypes, calibration_table: TableWorkspace,
@@ -421,7 +441,8 @@ def calibrate_bank(workspace: WorkspaceTypes,
                    shadow_height: float = 1000,
                    shadow_width: float = 4,
                    fit_domain: float = 7,
-                   minimum_intensity: float = 1000) -> Tuple[TableWorkspace, Optional[TableWorkspace]]:
+                   minimum_intensity: float = 1000,
+                   peaks: Optional[Dict[int, List[float]]] = None) -> Tuple[TableWorkspace, Optional[TableWorkspace]]:
     r"""
     Calibrate the tubes in a bank and assess their goodness-of-fit with an acceptance function. Creates a
     table of calibrated detector IDs and a table of non-calibrated detector IDs
@@ -448,6 +469,8 @@ def calibrate_bank(workspace: WorkspaceTypes,
     :param fit_domain: number of pixels over which a calibrating wire may have any significant influence
     :param minimum_intensity: mininum number of neutron counts per pixel to warrant a significant fit session.
         This number is compared against the neutron counts per pixel, averaged over all pixels in the bank
+    :param peaks: positions of the wire shadows for some or all of the tubes in the bank, in units of pixel
+        positions, as returned by `fit_banks_peaks`. These tubes are not fitted again.
 
     :return: Workspace2D handles for the calibration and mask tables
     """
@@ -457,7 +480,7 @@ def calibrate_bank(workspace: WorkspaceTypes,
     peak_y_table_temp = 'PeakYTable' if peak_y_table is None else peak_y_table
     fit_bank(workspace, bank_name, shadow_height, shadow_width, fit_domain, minimum_intensity,
              calibration_table=calibration_table, peak_pixel_positions_table=peak_table_temp,
-             peak_vertical_positions_table=peak_y_table_temp, parameters_table_group='parameters_table')
+             peak_vertical_positions_table=peak_y_table_temp, parameters_table_group='parameters_table', peaks=peaks)
     # Run the acceptance criterion to determine the failing tubes
     tubes_fit_success = criterion_peak_vertical_position(peak_y_table_temp, summary='acceptance')
     # collect acceptances and polynomial coefficients
@@ -480,6 +503,9 @@ def calibrate_banks(workspace: WorkspaceTypes, bank_selection: str,
                     calibration_group: str = 'calibrations',
                     mask_group: str = 'masks',
                     fit_group: str = 'fits',
+                    parallel: Union[bool, str] = False,
+                    max_workers: Optional[int] = None,
+                    database_path: Optional[str] = None,
                     **kwargs) -> Tuple[WorkspaceGroup, Optional[WorkspaceGroup]]:
     r"""
     Calibrate the tubes in a selection of banks, and assess their goodness-of-fit with an acceptance function.
@@ -502,17 +528,33 @@ def calibrate_banks(workspace: WorkspaceTypes, bank_selection: str,
     :param fit_group: name of the output WorkspaceGroup gathering the Workspace2D objects that hold the tube
         success criterion results, as well as the optimized polynomial coefficients of the quadratic function
         fitting the shadow locations in the tube to the known Y-coordinate for the wires.
+    :param parallel: find the wire shadows in the tubes of all the selected banks concurrently, before
+        calibrating the banks. `True` or 'threads' uses a pool of threads, 'processes' a pool of processes.
+        The output workspaces are the same as when the banks are fitted one after the other.
+    :param max_workers: maximum number of threads or processes when `parallel` is set. Default None lets
+        the pool decide.
+    :param database_path: if given, save the calibration, mask, and fit workspaces of all banks to the
+        calibration database in this directory, in one batch (see `database.save_calibration_set`)
     :param kwargs: optional parameters to be passed on to `calibrate_bank`
 
     :return: handles to the calibrations and masks WorkspaceGroup objects
     """
     # create a list of banks names
+    bank_names = ['bank' + n for n in bank_numbers(bank_selection)]
+
+    # Find the wire shadows of all banks at once
+    bank_peaks = {bank_name: None for bank_name in bank_names}
+    if parallel:
+        fit_options = {name: kwargs[name] for name in ('shadow_height', 'shadow_width', 'fit_domain') if name in kwargs}
+        bank_peaks = fit_banks_peaks(workspace, bank_names, parallel='threads' if parallel is True else parallel,
+                                     max_workers=max_workers, **fit_options)
 
     # Calibrate each bank
     calibrations, masks, fits = list(), list(), list()
-    for n in bank_numbers(bank_selection):
-        calibration, mask = calibrate_bank(workspace, 'bank' + n, 'calib' + n, 'mask' + n,
-                                           fit_results='fit' + n, **kwargs)
+    for bank_name in bank_names:
+        n = bank_name[4:]  # drop 'bank' from bank_name
+        calibration, mask = calibrate_bank(workspace, bank_name, 'calib' + n, 'mask' + n,
+                                           fit_results='fit' + n, peaks=bank_peaks[bank_name], **kwargs)
         fits.append(mtd['fit' + n])
         calibrations.append(calibration)
         if mask is not None:
@@ -523,4 +565,8 @@ def calibrate_banks(workspace: WorkspaceTypes, bank_selection: str,
     if len(masks) > 0:
         GroupWorkspaces(InputWorkspaces=masks, OutputWorkspace=mask_group)
 
+    if database_path is not None:
+        save_calibration_set(workspace, database_path, calibration_group,
+                             masks=mask_group if len(masks) > 0 else None, fits=fit_group)
+
     return mtd[calibration_group], None if len(masks) == 0 else mtd[mask_group]
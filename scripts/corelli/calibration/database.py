@@ -9,8 +9,10 @@
 
 from datetime import datetime
 import enum
+import os
 import pathlib
 import re
+import tempfile
 from typing import List, Optional, Tuple, Union
 
 from mantid.dataobjects import EventWorkspace, MaskWorkspace, TableWorkspace,  Workspace2D
@@ -149,6 +151,34 @@ def save_bank_table(data: Workspace, bank_id: int, database_path: str, date: str
     SaveNexusProcessed(data, filename)
 
 
+def save_bank_tables(tables: List[Tuple[Workspace, int, str]], database_path: str, date: str) -> List[str]:
+    """
+    Function that saves several bank tables in one batch, using corelli format:
+    database_path/bank0ID/type_corelli_bank0ID_YYYYMMDD.nxs.h5
+
+    The tables are first saved into a staging directory within database_path, and moved into the database only
+    after all of them have been saved. Thus, the database never contains only part of the batch.
+    :param tables: list of (data, bank_id, table_type) triads, with table_type one of 'calibration', 'mask', 'fit'
+    :param database_path location of the corelli database (absolute or relative)
+    :param date format YYYYMMDD
+    :return list of absolute paths for the saved files, in the order of `tables`
+    """
+    verify_date_format('save_bank_tables', date)
+    [TableType.assert_valid_type(table_type) for _, _, table_type in tables]
+    pathlib.Path(database_path).mkdir(parents=True, exist_ok=True)
+    # the staging directory is not of the form bankXXX, so it is ignored when reading the database
+    with tempfile.TemporaryDirectory(prefix='.staging_', dir=database_path) as staging_path:
+        staged_filenames = list()
+        for data, bank_id, table_type in tables:
+            staged_filenames.append(filename_bank_table(bank_id, staging_path, date, table_type))
+            SaveNexusProcessed(data, staged_filenames[-1])
+        filenames = list()
+        for staged_filename, (_, bank_id, table_type) in zip(staged_filenames, tables):
+            filenames.append(filename_bank_table(bank_id, database_path, date, table_type))
+            os.replace(staged_filename, filenames[-1])
+    return filenames
+
+
 def save_calibration_set(input_workspace: InputWorkspaceTypes,
                          database_path: str,
                          calibrations: CalibrationInputSetTypes,
@@ -158,6 +188,7 @@ def save_calibration_set(input_workspace: InputWorkspaceTypes,
     Save one or more calibration workspaces to the database.
 
     The calibration date is picked up from the run start time stored in the metadata of the input workspace.
+    All tables are saved in one batch (see `save_bank_tables`).
     The input 'calibrations', 'masks' and 'fits' will typically results from invoking `bank.calibrate_banks`
     on a wire-scan run.
 
@@ -215,11 +246,14 @@ def save_calibration_set(input_workspace: InputWorkspaceTypes,
         # the input set contains only one workspace
         return [(str(input_set), extract_bank_number(str(input_set))), ]
 
+    # gather the tables of all types before saving them in one batch
+    tables = list()
     for input_set, table_type in [(calibrations, 'calibration'), (masks, 'mask'), (fits, 'fit')]:
         if input_set is None:  # case of no 'masks' or no 'fits'
             continue
         for workspace, bank_number in set_to_list(input_set):
-            save_bank_table(workspace, bank_number, database_path, date, table_type=table_type)
+            tables.append((workspace, bank_number, table_type))
+    save_bank_tables(tables, database_path, date)
 
 
 def load_bank_table(bank_id: int, database_path: str, date: str, table_type: str = 'calibration') -> TableWorkspace:
@@ -75,6 +75,28 @@ class SCalculatorFactoryPowderTest(unittest.TestCase):
     def test_good_case(self):
         self._good_case(name=self._si2)
 
+    def test_good_case_parallel(self):
+        abins.parameters.performance['threads'] = 2
+        self._good_case(name=self._si2)
+
+    def test_parallel_tasks(self):
+        good_data = self._get_good_data(filename=self._si2)
+        calculator = abins.SCalculatorFactory.init(
+            filename=abins.test_helpers.find_file(filename=self._si2 + ".phonon"), temperature=self._temperature,
+            sample_form=self._sample_form, abins_data=good_data["DFT"], instrument=self._instrument,
+            quantum_order_num=self._order_event)
+
+        num_k = len(good_data["DFT"].get_kpoints_data())
+        num_atoms = len(good_data["DFT"].get_atoms_data())
+
+        # Every atom must be calculated exactly once at every q-point, in q-point order
+        for n_processes in (1, 2, 8):
+            tasks = calculator._get_parallel_tasks(n_processes)
+            self.assertEqual([q_index for q_index, _ in tasks], sorted(q_index for q_index, _ in tasks))
+            for q_index in range(num_k):
+                atoms = sum((task_atoms for task_q, task_atoms in tasks if task_q == q_index), [])
+                self.assertEqual(list(range(num_atoms)), atoms)
+
     # helper functions
     def _good_case(self, name=None):
         # calculation of powder data
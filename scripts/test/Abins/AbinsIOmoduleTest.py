@@ -4,6 +4,8 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -117,5 +119,52 @@ class IOTest(unittest.TestCase):
         self._loading_structured_datasets()
 
 
+class IOCacheKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._input_filename = os.path.join(self._tmp_dir.name, "AbinsCacheKeyTest.phonon")
+        self._write_input("frequencies 1.0 2.0 3.0\n", mtime=1000)
+
+        saver = IO(input_filename=self._input_filename, group_name="CacheKeyGroup")
+        saver.add_file_attributes()
+        saver.save()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+        test_helpers.remove_output_files(list_of_names=["AbinsCacheKeyTest"])
+
+    def _write_input(self, content, mtime):
+        with open(self._input_filename, 'w') as f:
+            f.write(content)
+        os.utime(self._input_filename, (mtime, mtime))
+
+    def _saved_cache_key(self):
+        clerk = IO(input_filename=self._input_filename, group_name="CacheKeyGroup")
+        return clerk.load(list_of_attributes=["cache_key"])["attributes"]["cache_key"]
+
+    def test_cache_key_is_saved(self):
+        clerk = IO(input_filename=self._input_filename, group_name="CacheKeyGroup")
+        self.assertEqual(clerk.calculate_ab_initio_file_cache_key(), self._saved_cache_key())
+        clerk.check_previous_data()
+
+    def test_modified_file_invalidates_cache(self):
+        self._write_input("frequencies 1.0 2.0 4.0\n", mtime=2000)
+
+        clerk = IO(input_filename=self._input_filename, group_name="CacheKeyGroup")
+        self.assertRaises(ValueError, clerk.check_previous_data)
+
+    def test_touched_file_is_checked_by_hash(self):
+        original_cache_key = self._saved_cache_key()
+        self._write_input("frequencies 1.0 2.0 3.0\n", mtime=2000)
+
+        clerk = IO(input_filename=self._input_filename, group_name="CacheKeyGroup")
+        clerk.check_previous_data()
+
+        # Content is unchanged, so the cache key is updated to match the new modification time
+        self.assertNotEqual(original_cache_key, self._saved_cache_key())
+        self.assertEqual(clerk.calculate_ab_initio_file_cache_key(), self._saved_cache_key())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -48,7 +48,7 @@ class TestTube(unittest.TestCase):
                        }
 
     @classmethod
-    def tearDown(cls) -> None:
+    def tearDownClass(cls) -> None:
         r"""Delete the workspaces associated to the test cases"""
         if len(cls.workspaces_temporary) > 0:
             DeleteWorkspaces(cls.workspaces_temporary)
@@ -73,6 +73,25 @@ class TestTube(unittest.TestCase):
                     self.assertAlmostEqual(expected[row['Name']], row['Value'], delta=1.e-6)
         DeleteWorkspaces(['CalibTable', 'parameters_table_group', 'PeakTable'])
 
+    def test_calibrate_parallel(self):
+        data = self.corelli
+        peaks, positions = dict(), dict()
+        for parallel in (False, 'threads'):
+            calib_table, peak_table = calibrate(data['workspace'], data['bank_name'], data['wire_positions'],
+                                                data['peaks_form'], fitPar=data['fit_parameters'], outputPeak=True,
+                                                parallel=parallel, max_workers=4)
+            peaks[parallel] = [row for row in peak_table]
+            positions[parallel] = [position.Y() for position in calib_table.column('Detector Position')]
+            DeleteWorkspaces(['CalibTable', 'PeakTable'])
+        # the tables are filled in the same order, with the same values, in both modes
+        self.assertEqual([row['TubeId'] for row in peaks[False]], [row['TubeId'] for row in peaks['threads']])
+        for serial_row, parallel_row in zip(peaks[False], peaks['threads']):
+            for name in serial_row:
+                if name != 'TubeId':
+                    self.assertAlmostEqual(serial_row[name], parallel_row[name], delta=1.e-6)
+        for serial_y, parallel_y in zip(positions[False], positions['threads']):
+            self.assertAlmostEqual(serial_y, parallel_y, delta=1.e-6)
+
 
 if __name__ == '__main__':
     unittest.main()
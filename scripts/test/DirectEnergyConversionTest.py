@@ -4,6 +4,9 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import os
+import shutil
+import tempfile
 import unittest
 
 import Direct.dgreduce as dgreduce
@@ -126,6 +129,32 @@ class DirectEnergyConversionTest(unittest.TestCase):
         white_ws = tReducer.do_white(wb_ws, None, None)
         self.assertTrue(white_ws)
 
+    def test_wb_integrals_cached_on_disk(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            tReducer = DirectEnergyConversion("MAR")
+            tReducer.prop_man.wb_integrals_cache_dir = cache_dir
+
+            white_ws = tReducer.do_white(11001, None, None)
+            integrals = white_ws.extractY()
+            cache_files = os.listdir(cache_dir)
+            self.assertEqual(len(cache_files), 1)
+            self.assertTrue(cache_files[0].startswith('MAR11001_wb_integrals_'))
+
+            # a new session does not find the integrals in the ADS
+            api.AnalysisDataService.clear()
+            white_ws = tReducer.do_white(11001, None, None)
+            self.assertTrue((white_ws.extractY() == integrals).all())
+            self.assertEqual(os.listdir(cache_dir), cache_files)
+
+            # different integration range needs different integrals
+            api.AnalysisDataService.clear()
+            tReducer.prop_man.wb_integr_range = [30, 100]
+            tReducer.do_white(11001, None, None)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+        finally:
+            shutil.rmtree(cache_dir)
+
     def test_get_set_attributes(self):
         tReducer = self.reducer
 
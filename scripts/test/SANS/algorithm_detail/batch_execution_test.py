@@ -6,14 +6,18 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import unittest
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 from mantid.api import WorkspaceGroup, AnalysisDataService
 from mantid.simpleapi import CreateSampleWorkspace, GroupWorkspaces
 from sans.algorithm_detail.batch_execution import (get_all_names_to_save, get_transmission_names_to_save,
                                                    ReductionPackage, select_reduction_alg, save_workspace_to_file,
-                                                   delete_reduced_workspaces)
-from sans.common.enums import SaveType
+                                                   delete_reduced_workspaces, reduce_batch_in_processes)
+from sans.common.enums import SaveType, OutputMode, SANSFacility, SANSInstrument
+from sans.state.StateObjects.StateData import get_data_builder
+from sans.test_helper.file_information_mock import SANSFileInformationMock
+from sans.test_helper.test_director import TestDirector
 
 
 class ADSMock(object):
@@ -353,5 +357,47 @@ class DeleteMethodsTest(unittest.TestCase):
             self.assertFalse(i)
 
 
+class ReduceBatchInProcessesTest(unittest.TestCase):
+    @staticmethod
+    def _single_reduction(state, use_optimizations, output_mode, plot_results, output_graph, save_can=False):
+        return [state["scale"]], [state["shift"]], [state["name"]]
+
+    # The rows are run in threads, since mocks cannot be sent to worker processes
+    @mock.patch("sans.algorithm_detail.batch_execution.create_worker_pool", ThreadPoolExecutor)
+    @mock.patch("sans.algorithm_detail.batch_execution.Serializer")
+    @mock.patch("sans.algorithm_detail.batch_execution._single_reduction_for_batch")
+    def test_that_each_row_is_reduced_and_saved_to_file(self, single_reduction_mock, serializer_mock):
+        serializer_mock.to_json.side_effect = lambda state: state
+        serializer_mock.from_json.side_effect = lambda state: state
+        single_reduction_mock.side_effect = self._single_reduction
+        states = [{"scale": 1.0 + i, "shift": 0.1 * i, "name": "row_{}".format(i)} for i in range(5)]
+
+        results = sorted(reduce_batch_in_processes(states, use_optimizations=True, max_workers=2))
+
+        self.assertEqual([result.index for result in results], list(range(5)))
+        for result, state in zip(results, states):
+            self.assertEqual(result.out_scale_factors, [state["scale"]])
+            self.assertEqual(result.out_shift_factors, [state["shift"]])
+            self.assertEqual(result.saved_names, [state["name"]])
+            self.assertGreaterEqual(result.wall_time, 0.)
+        for call in single_reduction_mock.call_args_list:
+            self.assertEqual(call[0][2], OutputMode.SAVE_TO_FILE)
+
+    def test_that_a_failed_row_is_reported_from_the_worker_process(self):
+        # The state is valid, but its sample run can not be found by the worker process
+        file_information = SANSFileInformationMock(run_number=22024, instrument=SANSInstrument.SANS2D)
+        data_builder = get_data_builder(SANSFacility.ISIS, file_information)
+        data_builder.set_sample_scatter("SANS2D_NotARun")
+        test_director = TestDirector()
+        test_director.set_states(data_state=data_builder.build())
+        state = test_director.construct()
+
+        with self.assertRaises(Exception) as context:
+            list(reduce_batch_in_processes([state], use_optimizations=False, max_workers=1))
+
+        # The traceback of the worker process is attached to the error raised in this process
+        self.assertIn("single_reduction_for_batch_in_process", str(context.exception.__cause__))
+
+
 if __name__ == '__main__':
     unittest.main()
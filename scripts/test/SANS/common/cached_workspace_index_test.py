@@ -0,0 +1,80 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2021 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+
+from mantid.api import AlgorithmManager, AnalysisDataService, FrameworkManager
+from mantid.simpleapi import RenameWorkspace
+from sans.common.cached_workspace_index import CachedWorkspaceIndex
+from sans.common.constants import SANS_FILE_TAG
+from sans.common.log_tagger import set_tag
+
+
+class CachedWorkspaceIndexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        FrameworkManager.Instance()
+
+    def setUp(self):
+        self.index = CachedWorkspaceIndex()
+
+    def tearDown(self):
+        self.index.unsubscribe()
+        AnalysisDataService.clear()
+
+    @staticmethod
+    def _add_tagged_workspace(name, file_tag=None):
+        alg = AlgorithmManager.createUnmanaged("CreateSampleWorkspace")
+        alg.setChild(True)
+        alg.initialize()
+        alg.setProperty("OutputWorkspace", "dummy")
+        alg.execute()
+        workspace = alg.getProperty("OutputWorkspace").value
+        if file_tag is not None:
+            set_tag(SANS_FILE_TAG, file_tag, workspace)
+        AnalysisDataService.addOrReplace(name, workspace)
+        return workspace
+
+    def _names_for(self, file_tags):
+        return [workspace.name() for workspace in self.index.get_workspaces(file_tags)]
+
+    def test_that_finds_workspaces_by_file_tag(self):
+        self._add_tagged_workspace("ws2", "22024_sans_nxs")
+        self._add_tagged_workspace("ws1", "22024_sans_nxs")
+        self._add_tagged_workspace("other", "22025_sans_nxs")
+        self._add_tagged_workspace("untagged")
+
+        self.assertEqual(self._names_for(["22024_sans_nxs"]), ["ws1", "ws2"])
+        self.assertEqual(self._names_for(["22024_sans_nxs", "22025_sans_nxs"]), ["other", "ws1", "ws2"])
+        self.assertEqual(self._names_for(["22026_sans_nxs"]), [])
+
+    def test_that_indexes_workspaces_already_on_the_ads(self):
+        self.index.unsubscribe()
+        self._add_tagged_workspace("ws1", "22024_sans_nxs")
+        self.index = CachedWorkspaceIndex()
+
+        self.assertEqual(self._names_for(["22024_sans_nxs"]), ["ws1"])
+
+    def test_that_index_follows_renamed_replaced_and_deleted_workspaces(self):
+        self._add_tagged_workspace("ws1", "22024_sans_nxs")
+        RenameWorkspace(InputWorkspace="ws1", OutputWorkspace="ws_renamed")
+        self.assertEqual(self._names_for(["22024_sans_nxs"]), ["ws_renamed"])
+
+        self._add_tagged_workspace("ws_renamed", "22025_sans_nxs")
+        self.assertEqual(self._names_for(["22024_sans_nxs"]), [])
+        self.assertEqual(self._names_for(["22025_sans_nxs"]), ["ws_renamed"])
+
+        AnalysisDataService.remove("ws_renamed")
+        self.assertEqual(self._names_for(["22025_sans_nxs"]), [])
+
+        self._add_tagged_workspace("ws1", "22024_sans_nxs")
+        AnalysisDataService.clear()
+        self.assertEqual(self._names_for(["22024_sans_nxs"]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,7 +16,7 @@ from mantid.simpleapi import DeleteWorkspaces, LoadNexusProcessed
 
 from corelli.calibration.bank import (calibrate_bank, calibrate_banks, collect_bank_fit_results,
                                       criterion_peak_pixel_position, criterion_peak_vertical_position, fit_bank,
-                                      mask_bank, purge_table, sufficient_intensity)
+                                      fit_banks_peaks, mask_bank, purge_table, sufficient_intensity)
 from corelli.calibration.utils import TUBES_IN_BANK
 
 
@@ -347,6 +347,27 @@ class TestBank(unittest.TestCase):
         self.assertAlmostEqual(max(mtd['fit15'].readE(4)), 0.0221, delta=0.0001)
         DeleteWorkspaces(['calibrations', 'masks', 'fits'])
 
+    def test_calibrate_banks_parallel(self):
+        # fitting the banks concurrently produces the same output as fitting them one after the other
+        results = dict()
+        for parallel in (False, True):
+            calibrations, masks = calibrate_banks(self.cases['124023_banks_10_15'], '10,15', parallel=parallel,
+                                                  max_workers=4)
+            assert list(calibrations.getNames()) == ['calib10', 'calib15']
+            assert list(masks.getNames()) == ['mask15']
+            results[parallel] = {name: mtd[name].column(1) for name in ('calib10', 'calib15')}
+            results[parallel].update({name: mtd[name].extractY() for name in ('fit10', 'fit15')})
+            DeleteWorkspaces(['calibrations', 'masks', 'fits'])
+        for name, expected in results[False].items():
+            assert_allclose(results[True][name], expected, atol=1.e-6)
+
+    def test_fit_banks_peaks(self):
+        peaks = fit_banks_peaks(self.cases['124023_banks_10_15'], ['bank10', 'bank15'], max_workers=4)
+        assert sorted(peaks.keys()) == ['bank10', 'bank15']
+        for bank_peaks in peaks.values():
+            assert sorted(bank_peaks.keys()) == list(range(TUBES_IN_BANK))
+            assert all(len(positions) == 14 for positions in bank_peaks.values())  # 14 wire shadows per tube
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -25,8 +25,9 @@ from mantid.simpleapi import (CreateEmptyTableWorkspace, CreateSampleWorkspace,
 
 from corelli.calibration.database import (combine_spatial_banks, combine_temporal_banks, day_stamp, filename_bank_table,
                                           has_valid_columns, init_corelli_table, load_bank_table, load_calibration_set,
-                                          new_corelli_calibration, save_bank_table, save_calibration_set,
-                                          save_manifest_file, _table_to_workspace, verify_date_format)
+                                          new_corelli_calibration, save_bank_table, save_bank_tables,
+                                          save_calibration_set, save_manifest_file, _table_to_workspace,
+                                          verify_date_format)
 from corelli.calibration.bank import calibrate_banks
 
 
@@ -234,6 +235,24 @@ class TestCorelliDatabase(unittest.TestCase):
             assert path.exists(path.join(database.name, 'bank014', f'{ct}_corelli_bank014_20200109.nxs.h5'))
         database.cleanup()
 
+    def test_save_bank_tables(self) -> None:
+        database = tempfile.TemporaryDirectory()
+        calibration, mask = init_corelli_table(), init_corelli_table(table_type='mask')
+        calibration.addRow([28672, -1.2497636826045173])
+        mask.addRow([28673])
+        filenames = save_bank_tables([(calibration, 10, 'calibration'), (mask, 10, 'mask')], database.name, '20200109')
+        assert filenames == [filename_bank_table(10, database.name, '20200109', table_type)
+                             for table_type in ('calibration', 'mask')]
+        assert all(path.exists(filename) for filename in filenames)
+        # the staging directory is removed once the tables are moved into the database
+        assert [p.name for p in pathlib.Path(database.name).iterdir()] == ['bank010']
+        # a table failing to save leaves the database untouched
+        with self.assertRaises(Exception):
+            save_bank_tables([(calibration, 20, 'calibration'), ('non_existent_table', 20, 'mask')],
+                             database.name, '20200109')
+        assert [p.name for p in pathlib.Path(database.name).iterdir()] == ['bank010']
+        database.cleanup()
+
     def test_verify_date_format(self) -> None:
 
         # success